@@ -0,0 +1,351 @@
+# benchmarks/memory.py
+# Measures the memory used to read and generate synthetic schemas of growing
+# size and fails when a stage exceeds its budget, so memory regressions show
+# up before a release is OOM-killed in a capped container.
+#
+#   python benchmarks/memory.py run --scales 100,1000,5000
+#   python benchmarks/memory.py record --db-type postgresql --database app --output app.json
+#   python benchmarks/memory.py run --fixture app.json
+#
+# Every scale runs in its own process so peak RSS is measured per scale;
+# tracemalloc measures each stage within it. Recorded fixtures replay the
+# catalog rows of a real database through its reader without a server.
+import argparse
+import json
+import logging
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ef_reverse_poco_generator'))
+
+from cli import add_connection_arguments, connection_params, reader_options
+from code_generator import FRAMEWORKS, CodeGenerator
+from db_connector import connect
+from output_writer import OUTPUT_LAYOUTS, write_output
+from schema_reader import MySQLSchemaReader, PostgreSQLSchemaReader, SQLServerSchemaReader, SQLiteSchemaReader, read_schema
+
+READERS = {
+    'mysql': MySQLSchemaReader,
+    'postgresql': PostgreSQLSchemaReader,
+    'sqlserver': SQLServerSchemaReader,
+    'sqlite': SQLiteSchemaReader,
+}
+STAGES = ['read_schema', 'replay', 'generate', 'write']
+# Peak traced bytes a stage may use per table plus per column, about twice
+# what was measured with 4 to 60 columns per table.
+DEFAULT_BUDGETS = {
+    'read_schema': {'per_table': 4000, 'per_column': 800},
+    'replay': {'per_table': 4000, 'per_column': 600},
+    'generate': {'per_table': 6000, 'per_column': 1300},
+    'write': {'per_table': 2000, 'per_column': 300},
+}
+DEFAULT_MAX_RSS_MB = 1024
+
+
+class ReplayCursor:
+    # Serves the result sets recorded for each statement, in statement order.
+    def __init__(self, connection):
+        self.connection = connection
+        self.result_sets = []
+        self.rows = []
+        self.position = 0
+
+    def execute(self, query, params=None):
+        self.result_sets = list(self.connection.next_statement())
+        self.nextset()
+
+    def nextset(self):
+        if not self.result_sets:
+            return False
+        self.rows = self.result_sets.pop(0)
+        self.position = 0
+        return True
+
+    def fetchmany(self, size=1):
+        rows = self.rows[self.position:self.position + size]
+        self.position += len(rows)
+        return [tuple(row) for row in rows]
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchall(self):
+        return self.fetchmany(len(self.rows) - self.position)
+
+    def close(self):
+        pass
+
+
+class ReplayConnection:
+    autocommit = False
+    timeout = 0
+
+    def __init__(self, results):
+        self.results = results
+        self.position = 0
+
+    def next_statement(self):
+        if self.position >= len(self.results):
+            raise RuntimeError("The reader ran more statements than the fixture recorded")
+        self.position += 1
+        return self.results[self.position - 1]
+
+    def cursor(self, *args, **kwargs):
+        return ReplayCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        # Progress handlers, interrupts and cancels are no-ops on a replay.
+        return lambda *args, **kwargs: None
+
+
+class RecordingCursor(ReplayCursor):
+    # Runs every statement on the real cursor, keeps all of its result sets
+    # and serves them the way a replay will.
+    def __init__(self, cursor, results):
+        super().__init__(None)
+        self.cursor = cursor
+        self.results = results
+
+    def execute(self, query, params=None):
+        if params:
+            self.cursor.execute(query, params)
+        else:
+            self.cursor.execute(query)
+        result_sets = [self.fetch_result_set()]
+        while self.next_result_set():
+            result_sets.append(self.fetch_result_set())
+        self.results.append(result_sets)
+        self.result_sets = list(result_sets)
+        self.nextset()
+
+    def fetch_result_set(self):
+        if self.cursor.description is None:
+            return []
+        return [list(row) for row in self.cursor.fetchall()]
+
+    def next_result_set(self):
+        # Only SQL Server batches return several result sets; other drivers
+        # lack nextset or raise from it.
+        try:
+            return bool(self.cursor.nextset())
+        except Exception:
+            return False
+
+    def close(self):
+        self.cursor.close()
+
+
+class RecordingConnection:
+    def __init__(self, db):
+        self.db = db
+        self.results = []
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self.db.cursor(*args, **kwargs), self.results)
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+
+def record_fixture(db, db_type, options):
+    recording = RecordingConnection(db)
+    schema = READERS[db_type](recording, 'original', **options).read_schema()
+    return {'db_type': db_type, 'options': options, 'tables': len(schema['tables']), 'results': recording.results}
+
+
+def replay_fixture(fixture):
+    connection = ReplayConnection(fixture['results'])
+    return READERS[fixture['db_type']](connection, 'original', **fixture['options']).read_schema()
+
+
+def create_database(path, table_count, column_count):
+    db = sqlite3.connect(path)
+    for i in range(table_count):
+        columns = ', '.join(f"col_{j} varchar(50){' NOT NULL' if j % 3 == 0 else ''}" for j in range(column_count))
+        reference = f", parent_id integer REFERENCES bench_{i - 1} (id)" if i else ''
+        db.execute(f"CREATE TABLE bench_{i} (id integer PRIMARY KEY, {columns}{reference})")
+    db.commit()
+    return db
+
+
+def measure(work):
+    # Peak traced bytes above what was allocated before the stage started.
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = work()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    return result, {'peak_bytes': peak, 'seconds': elapsed}
+
+
+def peak_rss_bytes():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def count_columns(schema):
+    return sum(len(table_info['columns']) for table_info in schema['tables'].values())
+
+
+def run_scale(args):
+    # Runs in a child process: prints the measurements of one scale as JSON.
+    logging.getLogger().setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        if args.fixture:
+            with open(args.fixture, 'r') as f:
+                fixture = json.load(f)
+            schema = None
+        else:
+            db = create_database(os.path.join(directory, 'bench.db'), args.scale, args.columns)
+            fixture = record_fixture(db, 'sqlite', {})
+
+        tracemalloc.start()
+        stages = {}
+        if not args.fixture:
+            schema, stages['read_schema'] = measure(lambda: read_schema(db))
+            db.close()
+        replayed, stages['replay'] = measure(lambda: replay_fixture(fixture))
+        schema = schema or replayed
+        del replayed
+        code_generator = CodeGenerator(schema, 'Benchmark.Models', 'BenchmarkContext', 'camelcase', args.configuration_style, args.framework)
+        generated_code, stages['generate'] = measure(code_generator.generate)
+        _, stages['write'] = measure(lambda: write_output(generated_code, os.path.join(directory, 'out'), 'BenchmarkContext', args.layout,
+                                                          groups=code_generator.entity_groups()))
+        tracemalloc.stop()
+
+    print(json.dumps({
+        'tables': len(schema['tables']),
+        'columns': count_columns(schema),
+        'stages': stages,
+        'peak_rss_bytes': peak_rss_bytes(),
+    }))
+    return 0
+
+
+def spawn_scale(args, scale=None, fixture=None):
+    command = [sys.executable, os.path.abspath(__file__), 'scale', '--columns', str(args.columns), '--framework', args.framework,
+               '--configuration-style', args.configuration_style, '--layout', args.layout]
+    command += ['--fixture', fixture] if fixture else ['--scale', str(scale)]
+    completed = subprocess.run(command, stdout=subprocess.PIPE, check=True, text=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def load_budgets(args):
+    budgets = dict(DEFAULT_BUDGETS)
+    if args.budgets:
+        with open(args.budgets, 'r') as f:
+            budgets.update(json.load(f))
+    for override in args.budget or []:
+        stage, _, value = override.partition('=')
+        per_table, _, per_column = value.partition(',')
+        if stage not in STAGES or not per_table.isdigit() or not per_column.isdigit():
+            raise SystemExit(f"Invalid --budget {override}, expected STAGE=PER_TABLE,PER_COLUMN")
+        budgets[stage] = {'per_table': int(per_table), 'per_column': int(per_column)}
+    return budgets
+
+
+def report(label, measurement, budgets, max_rss_bytes):
+    failures = []
+    tables = max(measurement['tables'], 1)
+    columns = max(measurement['columns'], 1)
+    print(f"{label}: {measurement['tables']} tables, {measurement['columns']} columns")
+    print(f"    {'stage':<12} {'peak MB':>10} {'bytes/table':>12} {'bytes/column':>13} {'budget MB':>10} {'seconds':>8}")
+    for stage in STAGES:
+        stage_measurement = measurement['stages'].get(stage)
+        if stage_measurement is None:
+            continue
+        peak = stage_measurement['peak_bytes']
+        budget = budgets[stage]['per_table'] * measurement['tables'] + budgets[stage]['per_column'] * measurement['columns']
+        exceeded = peak > budget
+        print(f"    {stage:<12} {peak / 2 ** 20:>10.1f} {peak / tables:>12.0f} {peak / columns:>13.0f} {budget / 2 ** 20:>10.1f} "
+              f"{stage_measurement['seconds']:>8.2f}{'  OVER BUDGET' if exceeded else ''}")
+        if exceeded:
+            failures.append(f"{label} {stage}: peak {peak / 2 ** 20:.1f} MB exceeds {budget / 2 ** 20:.1f} MB")
+    rss_exceeded = measurement['peak_rss_bytes'] > max_rss_bytes
+    print(f"    peak RSS {measurement['peak_rss_bytes'] / 2 ** 20:.1f} MB{'  OVER BUDGET' if rss_exceeded else ''}")
+    if rss_exceeded:
+        failures.append(f"{label}: peak RSS {measurement['peak_rss_bytes'] / 2 ** 20:.1f} MB exceeds {max_rss_bytes / 2 ** 20:.0f} MB")
+    return failures
+
+
+def run(args):
+    budgets = load_budgets(args)
+    max_rss_bytes = args.max_rss_mb * 2 ** 20
+    failures = []
+    for scale in [int(scale) for scale in args.scales.split(',') if scale]:
+        failures += report(f"synthetic {scale}", spawn_scale(args, scale=scale), budgets, max_rss_bytes)
+    for fixture in args.fixture or []:
+        failures += report(os.path.basename(fixture), spawn_scale(args, fixture=fixture), budgets, max_rss_bytes)
+    for failure in failures:
+        print(f"Budget exceeded: {failure}")
+    return 1 if failures else 0
+
+
+def record(args):
+    options = {key: value for key, value in reader_options(args).items() if key != 'timeout'}
+    if args.db_type == 'sqlite':
+        # Parallel workers open connections of their own, which are not recorded.
+        options['workers'] = 1
+    db = connect(connection_params(args))
+    try:
+        fixture = record_fixture(db, args.db_type, options)
+    finally:
+        db.close()
+    with open(args.output, 'w') as f:
+        json.dump(fixture, f, default=str)
+    print(f"Recorded {len(fixture['results'])} statements for {fixture['tables']} tables to {args.output}")
+    return 0
+
+
+def add_generation_arguments(parser):
+    parser.add_argument('--columns', type=int, default=20, help="Columns per synthetic table")
+    parser.add_argument('--framework', default='efcore', choices=FRAMEWORKS)
+    parser.add_argument('--configuration-style', default='fluent_api', choices=['data_annotations', 'fluent_api'])
+    parser.add_argument('--layout', default='per_file', choices=OUTPUT_LAYOUTS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory budgets for schema reading and code generation')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Measure synthetic scales and recorded fixtures against the budgets")
+    run_parser.add_argument('--scales', default='100,1000,5000', help="Comma separated table counts of the synthetic schemas")
+    run_parser.add_argument('--fixture', action='append', help="Fixture recorded with 'record' to replay (can be repeated)")
+    run_parser.add_argument('--budgets', help="JSON file mapping stages to {\"per_table\": bytes, \"per_column\": bytes}")
+    run_parser.add_argument('--budget', action='append', metavar='STAGE=PER_TABLE,PER_COLUMN', help="Override the budget of one stage")
+    run_parser.add_argument('--max-rss-mb', type=int, default=DEFAULT_MAX_RSS_MB, help="Peak RSS budget of every run")
+    add_generation_arguments(run_parser)
+    run_parser.set_defaults(func=run)
+
+    scale_parser = subparsers.add_parser('scale', help=argparse.SUPPRESS)
+    scale_parser.add_argument('--scale', type=int)
+    scale_parser.add_argument('--fixture')
+    add_generation_arguments(scale_parser)
+    scale_parser.set_defaults(func=run_scale)
+
+    record_parser = subparsers.add_parser('record', help="Record the catalog rows of a database as a replayable fixture")
+    add_connection_arguments(record_parser)
+    record_parser.add_argument('--output', required=True)
+    record_parser.set_defaults(func=record)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
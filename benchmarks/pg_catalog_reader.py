@@ -0,0 +1,193 @@
+# benchmarks/pg_catalog_reader.py
+# Compares the pg_catalog based PostgreSQL reader with the previous
+# information_schema queries on a synthetic catalog and checks that both
+# readers return the same schema.
+import argparse
+import os
+import sys
+import time
+
+import psycopg2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ef_reverse_poco_generator'))
+
+from schema_reader.postgresql import PostgreSQLSchemaReader
+
+class InformationSchemaReader(PostgreSQLSchemaReader):
+    def read_tables(self):
+        cursor = self.db.cursor()
+        cursor.execute("""
+            SELECT 
+                table_name,
+                obj_description(('"' || table_schema || '"."' || table_name || '"')::regclass, 'pg_class') as table_description
+            FROM 
+                information_schema.tables
+            WHERE 
+                table_schema = 'public'
+        """)
+        tables = {row[0]: {'description': row[1] or ''} for row in self.iter_rows(cursor)}
+        cursor.close()
+        return tables
+
+    def read_columns(self):
+        # A named cursor keeps the result set on the server and streams it in batches.
+        cursor = self.db.cursor(name='ef_poco_columns', withhold=self.db.autocommit)
+        cursor.itersize = self.fetch_batch_size
+        cursor.execute("""
+            SELECT 
+                table_name,
+                column_name,
+                data_type,
+                is_nullable,
+                column_default,
+                col_description(('"' || table_schema || '"."' || table_name || '"')::regclass, ordinal_position) as column_description
+            FROM 
+                information_schema.columns
+            WHERE 
+                table_schema = 'public'
+        """)
+        columns = {}
+        for row in self.iter_rows(cursor):
+            if row[0] not in columns:
+                columns[row[0]] = []
+            columns[row[0]].append({
+                'name': row[1],
+                'type': row[2],
+                'nullable': row[3] == 'YES',
+                'default': row[4],
+                'description': row[5] or ''
+            })
+        cursor.close()
+        return columns
+
+    def read_primary_keys(self):
+        cursor = self.db.cursor()
+        cursor.execute("""
+            SELECT 
+                tc.table_name, 
+                kcu.column_name,
+                kcu.ordinal_position
+            FROM 
+                information_schema.table_constraints tc
+            JOIN 
+                information_schema.key_column_usage kcu
+            ON 
+                tc.constraint_name = kcu.constraint_name
+            WHERE 
+                tc.constraint_type = 'PRIMARY KEY'
+                AND tc.table_schema = 'public'
+            ORDER BY 
+                tc.table_name, kcu.ordinal_position
+        """)
+        primary_keys = {}
+        for row in self.iter_rows(cursor):
+            if row[0] not in primary_keys:
+                primary_keys[row[0]] = []
+            primary_keys[row[0]].append(row[1])
+        cursor.close()
+        return primary_keys
+    
+    def read_foreign_keys(self):
+        cursor = self.db.cursor()
+        cursor.execute("""
+            SELECT
+                tc.table_name, 
+                kcu.column_name, 
+                ccu.table_name AS foreign_table_name,
+                ccu.column_name AS foreign_column_name,
+                tc.constraint_name
+            FROM 
+                information_schema.table_constraints AS tc 
+            JOIN 
+                information_schema.key_column_usage AS kcu
+            ON 
+                tc.constraint_name = kcu.constraint_name
+            JOIN 
+                information_schema.constraint_column_usage AS ccu
+            ON 
+                ccu.constraint_name = tc.constraint_name
+            WHERE 
+                tc.constraint_type = 'FOREIGN KEY'
+                AND tc.table_schema = 'public'
+        """)
+        foreign_keys = {}
+        for row in self.iter_rows(cursor):
+            if row[0] not in foreign_keys:
+                foreign_keys[row[0]] = []
+            foreign_keys[row[0]].append({
+                'column': row[1],
+                'referenced_table': row[2],
+                'referenced_column': row[3],
+                'constraint_name': row[4],
+                'description': f"Foreign key constraint {row[4]} referencing {row[2]}.{row[3]}"
+            })
+        cursor.close()
+        return foreign_keys
+
+def create_catalog(db, table_count, column_count):
+    cursor = db.cursor()
+    for i in range(table_count):
+        columns = ', '.join(f"col_{j} varchar(50)" for j in range(column_count))
+        reference = f", parent_id integer REFERENCES bench_{i - 1} (id)" if i else ''
+        cursor.execute(f"CREATE TABLE bench_{i} (id integer PRIMARY KEY, {columns}{reference})")
+        cursor.execute(f"COMMENT ON TABLE bench_{i} IS 'Benchmark table {i}'")
+    db.commit()
+    cursor.close()
+
+def drop_catalog(db, table_count):
+    cursor = db.cursor()
+    for i in reversed(range(table_count)):
+        cursor.execute(f"DROP TABLE IF EXISTS bench_{i}")
+    db.commit()
+    cursor.close()
+
+def normalize(schema):
+    # The information_schema queries have no ORDER BY, so only content is compared.
+    return {
+        table_name: (
+            sorted(repr(sorted(column.items())) for column in table_info['columns']),
+            sorted(repr(sorted(fk.items())) for fk in table_info['foreign_keys']),
+            sorted(table_info.get('primary_key', [])),
+            table_info['description'],
+        )
+        for table_name, table_info in schema['tables'].items()
+    }
+
+def time_reader(reader_class, db, repeat):
+    best = None
+    schema = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        schema = reader_class(db).read_schema()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, schema
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PostgreSQL catalog reader')
+    parser.add_argument('dsn', help='DSN of a scratch database, e.g. "dbname=scratch user=postgres"')
+    parser.add_argument('--tables', type=int, default=1000)
+    parser.add_argument('--columns', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--keep', action='store_true', help='Keep the synthetic tables after the run')
+    args = parser.parse_args()
+
+    db = psycopg2.connect(args.dsn)
+    try:
+        create_catalog(db, args.tables, args.columns)
+        legacy_time, legacy_schema = time_reader(InformationSchemaReader, db, args.repeat)
+        catalog_time, catalog_schema = time_reader(PostgreSQLSchemaReader, db, args.repeat)
+        print(f"information_schema: {legacy_time:.3f}s")
+        print(f"pg_catalog:         {catalog_time:.3f}s ({legacy_time / catalog_time:.1f}x)")
+        if normalize(catalog_schema) != normalize(legacy_schema):
+            print("Schemas differ between the two readers")
+            return 1
+        print("Schemas match")
+        return 0
+    finally:
+        if not args.keep:
+            drop_catalog(db, args.tables)
+        db.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# benchmarks/renderers.py
+# Times the Jinja templates against fast_renderer on a synthetic schema and
+# checks that both renderers produce identical output for every naming
+# convention, configuration style and framework, including the EF Core
+# compiled model.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ef_reverse_poco_generator'))
+
+from code_generator import FRAMEWORKS, CodeGenerator
+from table_families import collapse_families
+from view_model import SchemaViewModel
+
+NAMING_CONVENTIONS = ['original', 'camelcase']
+CONFIGURATION_STYLES = ['data_annotations', 'fluent_api']
+COLUMN_TYPES = ['int', 'bigint', 'varchar', 'nvarchar', 'datetime', 'decimal', 'bit', 'uniqueidentifier', 'varbinary', 'float']
+
+def build_schema(table_count, column_count):
+    # Covers the template branches: descriptions with line breaks, single,
+    # composite and missing primary keys, required and optional references,
+    # named and unnamed constraints and procedures with and without parameters
+    # and result sets.
+    schema = {'tables': {}, 'procedures': {}}
+    for index in range(table_count):
+        table_name = f"order_item_{index}"
+        columns = [
+            {
+                'name': f"column_{position}" if position else 'id',
+                'type': COLUMN_TYPES[(index + position) % len(COLUMN_TYPES)],
+                'nullable': position % 3 == 2,
+                'description': f"Column {position}\n  of {table_name}" if position % 4 == 1 else '',
+            }
+            for position in range(column_count)
+        ]
+        table = {'columns': columns, 'foreign_keys': [], 'description': f"Table {index}\r\nwith details" if index % 2 else ''}
+        if index % 5 == 3:
+            table['primary_key'] = ['id', 'column_1']
+        elif index % 7 != 6:
+            table['primary_key'] = ['id']
+        if index:
+            # Composite keys are referenced through a two column constraint.
+            referenced_columns = ['id', 'column_1'] if (index - 1) % 5 == 3 else ['id']
+            for position, referenced_column in enumerate(referenced_columns):
+                table['foreign_keys'].append({
+                    'constraint_name': f"fk_{table_name}_parent" if index % 2 or len(referenced_columns) > 1 else None,
+                    'column': f"column_{position + 2}",
+                    'referenced_table': f"order_item_{index - 1}",
+                    'referenced_column': referenced_column,
+                    'description': f"Parent of {table_name}" if index % 3 == 1 else '',
+                })
+        schema['tables'][table_name] = table
+    for index in range(max(1, table_count // 10)):
+        # Monthly shards of one log table, collapsed with --families.
+        schema['tables'][f"audit_log_{2024 + index // 12}_{index % 12 + 1:02d}"] = {
+            'columns': [
+                {'name': 'id', 'type': 'bigint', 'nullable': False, 'description': ''},
+                {'name': 'order_item_id', 'type': 'int', 'nullable': True, 'description': ''},
+                {'name': 'logged_at', 'type': 'datetime', 'nullable': False, 'description': f"Shard {index}"},
+            ],
+            'foreign_keys': [{'constraint_name': f"fk_audit_log_{index}_order_item", 'column': 'order_item_id',
+                              'referenced_table': 'order_item_0', 'referenced_column': 'id', 'description': ''}],
+            'primary_key': ['id'],
+            'description': 'Audit log',
+        }
+    for index in range(max(1, table_count // 10)):
+        schema['procedures'][f"usp_process_{index}"] = {
+            'definition': '',
+            'description': f"Procedure {index}" if index % 2 else '',
+            'parameters': [{'name': f"param_{position}", 'type': 'int', 'mode': 'IN'} for position in range(index % 4)],
+        }
+        if index % 3 == 1:
+            schema['procedures'][f"usp_process_{index}"]['result_columns'] = [
+                {'name': 'OrderId', 'type': 'int', 'nullable': False},
+                {'name': 'Total', 'type': 'decimal', 'nullable': True},
+            ]
+    return schema
+
+def render_all(schema, renderer):
+    outputs = {}
+    for naming_convention in NAMING_CONVENTIONS:
+        view_model = SchemaViewModel(schema, naming_convention).prepare()
+        for configuration_style in CONFIGURATION_STYLES:
+            for framework in FRAMEWORKS:
+                code_generator = CodeGenerator(schema, 'Benchmark.Models', 'BenchmarkContext', naming_convention, configuration_style,
+                                               framework, view_model=view_model, renderer=renderer,
+                                               compiled_model=framework == 'efcore')
+                outputs[(naming_convention, configuration_style, framework)] = code_generator.generate()
+    return outputs
+
+def time_renderer(schema, renderer, repeat):
+    best = None
+    outputs = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = render_all(schema, renderer)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+def compare(reference, candidate):
+    differences = []
+    for combination, generated in reference.items():
+        other = candidate[combination]
+        for name, content in generated['entities'].items():
+            if other['entities'].get(name) != content:
+                differences.append(f"{'/'.join(combination)}: entity {name}")
+        for file_name, content in generated.get('compiled_model', {}).items():
+            if other['compiled_model'].get(file_name) != content:
+                differences.append(f"{'/'.join(combination)}: compiled model {file_name}")
+        for section in ('dbcontext', 'stored_procedures'):
+            if other[section] != generated[section]:
+                differences.append(f"{'/'.join(combination)}: {section}")
+    return differences
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the fast renderer against the Jinja templates')
+    parser.add_argument('--tables', type=int, default=500)
+    parser.add_argument('--columns', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--families', action='store_true', help='Collapse the sharded tables of the synthetic schema')
+    parser.add_argument('--verify', action='store_true', help='Only check that both renderers produce the same output')
+    args = parser.parse_args()
+
+    schema = build_schema(args.tables, args.columns)
+    if args.families:
+        schema = collapse_families(schema)
+    if args.verify:
+        differences = compare(render_all(schema, 'jinja'), render_all(schema, 'fast'))
+    else:
+        jinja_time, jinja_outputs = time_renderer(schema, 'jinja', args.repeat)
+        fast_time, fast_outputs = time_renderer(schema, 'fast', args.repeat)
+        print(f"jinja: {jinja_time:.3f}s")
+        print(f"fast:  {fast_time:.3f}s ({jinja_time / fast_time:.1f}x)")
+        differences = compare(jinja_outputs, fast_outputs)
+    for difference in differences[:20]:
+        print(f"Output differs: {difference}")
+    if differences:
+        return 1
+    print("Outputs match")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# cancellation.py
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class OperationCancelledError(Exception):
+    pass
+
+class CancellationToken:
+    # Shared between the caller and a running schema read or generation. Code
+    # doing the work polls raise_if_cancelled between steps; blocking driver
+    # calls are interrupted through the registered callbacks.
+    def __init__(self):
+        self.event = threading.Event()
+        self.callbacks = []
+        self.lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def cancel(self):
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.event.set()
+            callbacks = list(self.callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancellation callback failed: {str(e)}")
+
+    def register(self, callback):
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def unregister(self, callback):
+        with self.lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        if self.event.is_set():
+            raise OperationCancelledError("Operation cancelled")
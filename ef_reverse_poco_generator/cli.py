@@ -0,0 +1,230 @@
+# cli.py
+import argparse
+import json
+import logging
+import os
+import signal
+import threading
+
+from cancellation import CancellationToken, OperationCancelledError
+from db_connector import connect
+from schema_reader import read_schema
+from code_generator import CodeGenerator, FRAMEWORKS
+from multi_target import generate_targets
+from fleet import generate_fleet
+from output_writer import OUTPUT_LAYOUTS, DEFAULT_MAX_BUNDLE_BYTES, write_output
+from schema_watcher import SchemaWatcher, Regenerator
+from server import DEFAULT_PORT, serve
+from table_families import DEFAULT_FAMILY_PATTERN, collapse_families
+
+logger = logging.getLogger(__name__)
+
+
+def add_connection_arguments(parser):
+    parser.add_argument('--db-type', required=True, choices=['mysql', 'postgresql', 'sqlserver', 'sqlite'])
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--user')
+    parser.add_argument('--password', default=os.environ.get('EF_POCO_PASSWORD'),
+                        help="Database password (defaults to the EF_POCO_PASSWORD environment variable)")
+    parser.add_argument('--database', required=True)
+    parser.add_argument('--timeout', type=float,
+                        help="Seconds a catalog query may run before it is aborted (the whole catalog read on SQLite)")
+    sqlite_group = parser.add_argument_group('SQLite options')
+    sqlite_group.add_argument('--read-only', action='store_true', help="Open the file read-only so introspection never blocks writers")
+    sqlite_group.add_argument('--immutable', action='store_true', help="Open the file as immutable (implies --read-only); only for files nobody writes to")
+    sqlite_group.add_argument('--mmap-size', type=int, help="Bytes of the file to memory-map while reading the catalog")
+    sqlite_group.add_argument('--workers', type=int, default=1, help="Read-only connections used to read table details in parallel")
+    sqlite_group.add_argument('--infer-types', action='store_true',
+                              help="Resolve declared types by affinity and sample untyped or NUMERIC columns for their stored types")
+    sqlite_group.add_argument('--sample-rows', type=int, default=1000, help="Rows per table sampled by --infer-types")
+    postgresql_group = parser.add_argument_group('PostgreSQL options')
+    postgresql_group.add_argument('--include-partitions', action='store_true',
+                                  help="Read child partitions as tables of their own instead of only their partitioned parent")
+    sqlserver_group = parser.add_argument_group('SQL Server options')
+    sqlserver_group.add_argument('--single-batch', action='store_true', help="Read the whole catalog in one batch (one round trip)")
+
+
+def add_generation_arguments(parser):
+    parser.add_argument('--namespace', required=True)
+    parser.add_argument('--dbcontext-name', required=True)
+    parser.add_argument('--naming-convention', default='camelcase', choices=['camelcase', 'original'])
+    parser.add_argument('--configuration-style', default='data_annotations', choices=['data_annotations', 'fluent_api'])
+    parser.add_argument('--framework', default='ef6', choices=FRAMEWORKS)
+    parser.add_argument('--output', help="Output directory, or archive path for the zip layout")
+    parser.add_argument('--layout', default='per_file', choices=OUTPUT_LAYOUTS)
+    parser.add_argument('--template-dir', action='append', dest='template_paths',
+                        help="Directory with custom templates overriding the built-in ones (can be repeated)")
+    parser.add_argument('--max-bundle-bytes', type=int, default=DEFAULT_MAX_BUNDLE_BYTES)
+
+
+def connection_params(args):
+    conn_params = {'db_type': args.db_type, 'database': args.database}
+    for field in ['host', 'port', 'user', 'password']:
+        value = getattr(args, field)
+        if value is not None:
+            conn_params[field] = value
+    if args.db_type == 'sqlite':
+        conn_params.update(read_only=args.read_only, immutable=args.immutable, mmap_size=args.mmap_size)
+    return conn_params
+
+
+def reader_options(args):
+    options = {'timeout': args.timeout}
+    if args.db_type == 'sqlite':
+        options.update(workers=args.workers, immutable=args.immutable, mmap_size=args.mmap_size, infer_types=args.infer_types,
+                       sample_rows=args.sample_rows)
+    if args.db_type == 'mysql':
+        options.update(connect=lambda: connect(connection_params(args)))
+    if args.db_type == 'postgresql':
+        options.update(include_partitions=args.include_partitions)
+    if args.db_type == 'sqlserver':
+        options.update(single_batch=args.single_batch)
+    return options
+
+
+def run_cancellable(work, cancellation):
+    # The work runs on a separate thread so Ctrl+C is handled even while a
+    # driver call blocks; the first one cancels, a second one aborts.
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = work()
+        except BaseException as e:
+            outcome['error'] = e
+
+    def on_interrupt(signum, frame):
+        if cancellation.cancelled:
+            raise KeyboardInterrupt
+        logger.warning("Cancelling, press Ctrl+C again to abort")
+        cancellation.cancel()
+
+    thread = threading.Thread(target=target, daemon=True)
+    previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+    try:
+        thread.start()
+        while thread.is_alive():
+            thread.join(0.2)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('result')
+
+
+def run_generate(args):
+    if not args.output and not args.targets:
+        raise SystemExit("Either --output or --targets is required")
+    if args.compiled_model and args.framework != 'efcore':
+        raise SystemExit("--compiled-model requires --framework efcore")
+    cancellation = CancellationToken()
+    try:
+        run_cancellable(lambda: generate_code(args, cancellation), cancellation)
+    except OperationCancelledError:
+        logger.warning("Generation cancelled, nothing was written")
+        raise SystemExit(130)
+
+
+def generate_code(args, cancellation):
+    db = connect(connection_params(args))
+    schema = read_schema(db, args.naming_convention, cancellation=cancellation, **reader_options(args))
+    cancellation.raise_if_cancelled()
+    if args.collapse_families:
+        schema = collapse_families(schema, args.family_pattern)
+    if args.targets:
+        with open(args.targets, 'r') as f:
+            targets = json.load(f)
+        generate_targets(schema, args.namespace, args.dbcontext_name, targets, args.target_workers, args.template_paths)
+        logger.info(f"Code generated successfully for {len(targets)} targets")
+        return
+    code_generator = CodeGenerator(schema, args.namespace, args.dbcontext_name, args.naming_convention, args.configuration_style, args.framework,
+                                   template_paths=args.template_paths, cancellation=cancellation, compiled_model=args.compiled_model)
+    generated_code = code_generator.generate()
+    write_output(generated_code, args.output, args.dbcontext_name, args.layout, args.max_bundle_bytes, code_generator.entity_groups())
+    logger.info(f"Code generated successfully and saved to {args.output}")
+
+
+def run_watch(args):
+    if not args.output:
+        raise SystemExit("--output is required")
+    db = connect(connection_params(args))
+    regenerator = Regenerator(args.output, args.namespace, args.dbcontext_name, args.naming_convention, args.configuration_style, args.layout, args.framework,
+                              args.template_paths, args.max_bundle_bytes)
+    options = reader_options(args)
+    if args.db_type == 'mysql':
+        options.update(checksum_interval=args.checksum_interval)
+    watcher = SchemaWatcher(db, regenerator, args.naming_convention, args.interval, args.debounce, args.max_backoff,
+                            reader_options=options)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Watch mode stopped")
+
+
+def run_fleet(args):
+    if not args.output:
+        raise SystemExit("--output is required")
+    with open(args.tenants, 'r') as f:
+        tenants = json.load(f)
+    report = generate_fleet(tenants, args.output, args.namespace, args.dbcontext_name, args.naming_convention, args.configuration_style,
+                            args.framework, args.layout, args.workers, 'copy' if args.copy else 'symlink', args.template_paths,
+                            args.max_bundle_bytes)
+    for variant in report['variants']:
+        print(f"Schema {variant['fingerprint'][:12]} ({variant['tables']} tables): {len(variant['tenants'])} tenant(s)")
+        for tenant_name in variant['tenants']:
+            print(f"    {tenant_name}")
+    for tenant_name, error in report['failed'].items():
+        print(f"Failed {tenant_name}: {error}")
+
+
+def run_serve(args):
+    try:
+        serve(args.host, args.port, args.socket)
+    except KeyboardInterrupt:
+        logger.info("Generation server stopped")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='ef-reverse-poco', description="Generate Entity Framework POCO classes from an existing database. Run without a command to open the GUI.")
+    subparsers = parser.add_subparsers(dest='command')
+
+    generate_parser = subparsers.add_parser('generate', help="Generate code once")
+    add_connection_arguments(generate_parser)
+    add_generation_arguments(generate_parser)
+    generate_parser.add_argument('--targets', help="JSON file with a list of target profiles to render from a single schema read")
+    generate_parser.add_argument('--target-workers', type=int, help="Targets rendered in parallel")
+    generate_parser.add_argument('--collapse-families', action='store_true',
+                                 help="Generate one entity for tables with the same columns and name stem, e.g. monthly partitions or shards")
+    generate_parser.add_argument('--family-pattern', help=f"Regular expression matching the part of a table name that differs within a family "
+                                                          f"(default {DEFAULT_FAMILY_PATTERN})")
+    generate_parser.add_argument('--compiled-model', action='store_true',
+                                 help="With --framework efcore, also generate a compiled model and pooled context registration")
+    generate_parser.set_defaults(func=run_generate)
+
+    watch_parser = subparsers.add_parser('watch', help="Regenerate code whenever the database schema changes")
+    add_connection_arguments(watch_parser)
+    add_generation_arguments(watch_parser)
+    watch_parser.add_argument('--interval', type=float, default=2.0, help="Seconds between catalog fingerprint polls")
+    watch_parser.add_argument('--debounce', type=float, default=1.0, help="Seconds the schema must stay unchanged before regenerating")
+    watch_parser.add_argument('--max-backoff', type=float, default=60.0, help="Upper bound for the retry delay after failed polls")
+    watch_parser.add_argument('--checksum-interval', type=float, default=60.0,
+                              help="MySQL: seconds between the column and key checksums that catch in-place ALTER TABLE "
+                                   "(they read every table's metadata; 0 checksums on every poll)")
+    watch_parser.set_defaults(func=run_watch)
+
+    fleet_parser = subparsers.add_parser('fleet', help="Generate code for many tenant databases, once per distinct schema")
+    fleet_parser.add_argument('--tenants', required=True,
+                              help="JSON file with a list of tenants, each {\"name\": ..., \"connection\": {\"db_type\": ..., ...}}")
+    fleet_parser.add_argument('--workers', type=int, default=8, help="Catalogs read concurrently")
+    fleet_parser.add_argument('--copy', action='store_true', help="Copy the shared output into each tenant directory instead of symlinking it")
+    add_generation_arguments(fleet_parser)
+    fleet_parser.set_defaults(func=run_fleet)
+
+    serve_parser = subparsers.add_parser('serve', help="Run a local generation server that keeps connections, templates and schemas warm")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on; keep it on localhost, requests carry credentials")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--socket', help="Listen on this Unix socket path instead of TCP")
+    serve_parser.set_defaults(func=run_serve)
+
+    return parser
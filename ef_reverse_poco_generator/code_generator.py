@@ -1,252 +1,191 @@
-import re
-from jinja2 import Template
+import logging
+import fast_renderer
+import runtime_model
+from fragment_cache import FragmentCache
+from template_loader import get_environment
+from view_model import SchemaViewModel
+
+logger = logging.getLogger(__name__)
+
+FRAMEWORKS = ['ef6', 'efcore']
+# 'fast' renders the built-in templates without Jinja and is picked whenever no
+# custom template directories are configured; 'jinja' is the reference output.
+RENDERERS = ['fast', 'jinja']
 
 class CodeGenerator:
-    def __init__(self, schema, namespace, dbcontext_name, naming_convention, configuration_style):
+    def __init__(self, schema, namespace, dbcontext_name, naming_convention, configuration_style, framework='ef6', view_model=None,
+                 template_paths=None, auto_reload=False, fragment_cache=None, cancellation=None, renderer=None, compiled_model=False):
         self.schema = schema
         self.namespace = namespace
         self.dbcontext_name = dbcontext_name
         self.naming_convention = naming_convention
         self.configuration_style = configuration_style
-
-    def generate(self):
-        entities = self.generate_entities()
+        self.framework = framework
+        self.view_model = view_model or SchemaViewModel(schema, naming_convention)
+        self.relationships = self.view_model.relationships
+        self.environment = get_environment(template_paths, auto_reload)
+        self.fragment_cache = fragment_cache if fragment_cache is not None else FragmentCache()
+        self.cancellation = cancellation
+        self.renderer = renderer or ('jinja' if template_paths else 'fast')
+        self.compiled_model = compiled_model
+        if compiled_model and framework != 'efcore':
+            logger.warning("Compiled models are only generated for EF Core, ignoring the option")
+            self.compiled_model = False
+
+    def check_cancelled(self):
+        if self.cancellation is not None:
+            self.cancellation.raise_if_cancelled()
+
+    def generate(self, table_names=None):
+        # Nothing is returned from a cancelled run, so callers never write partial output.
+        entities = self.generate_entities(table_names)
+        self.check_cancelled()
         dbcontext = self.generate_dbcontext()
+        self.check_cancelled()
         stored_procedures = self.generate_stored_procedures()
-        return {
+        generated_code = {
             'entities': entities,
             'dbcontext': dbcontext,
             'stored_procedures': stored_procedures
         }
-
-    def generate_entities(self):
-        entity_template = Template("""
-using System;
-using System.Collections.Generic;
-{% if configuration_style == 'data_annotations' %}
-using System.ComponentModel.DataAnnotations;
-using System.ComponentModel.DataAnnotations.Schema;
-{% endif %}
-
-namespace {{ namespace }}
-{
-    {% if table_description %}
-    /// <summary>
-    /// {{ table_description | format_comment }}
-    /// </summary>
-    {% endif %}
-    {% if configuration_style == 'data_annotations' %}[Table("{{ table_name }}")]{% endif %}
-    public class {{ class_name }}
-    {
-        {% for column in columns %}
-        {% if column.description %}
-        /// <summary>
-        /// {{ column.description | format_comment }}
-        /// </summary>
-        {% endif %}
-        {% if configuration_style == 'data_annotations' %}
-        {% if column.primary_key %}[Key]{% endif %}
-        {% if column.primary_key and column.key_order is not none %}[Column(Order = {{ column.key_order }})]{% endif %}
-        {% if not column.nullable %}[Required]{% endif %}
-        [Column("{{ column.name }}")]
-        {% endif %}
-        public {{ column.csharp_type }} {{ column.property_name }} { get; set; }
-
-        {% endfor %}
-        {% for fk in foreign_keys %}
-        {% if fk.description %}
-        /// <summary>
-        /// {{ fk.description | format_comment }}
-        /// </summary>
-        {% endif %}
-        public virtual {{ fk.referenced_table }} {{ fk.property_name }} { get; set; }
-
-        {% endfor %}
-    }
-}
-""")
-
-        def format_comment(comment):
-            return re.sub(r'\s+', ' ', comment).strip()
-
-        entity_template.environment.filters['format_comment'] = format_comment
+        if self.compiled_model:
+            # The model always covers every table, even when only some entities are rendered.
+            generated_code['compiled_model'] = self.generate_compiled_model()
+        return generated_code
+
+    def generate_entities(self, table_names=None):
+        if self.renderer == 'fast':
+            render_entity = fast_renderer.render_entity
+            render_property = lambda column: self.render_property(
+                'fast', column, lambda: fast_renderer.render_property(column, self.configuration_style))
+        else:
+            render_entity = self.environment.get_template('entity.cs.j2').render
+            property_template = self.environment.get_template('entity_property.cs.j2')
+            render_property = lambda column: self.render_property(
+                property_template, column, lambda: property_template.render(column=column, configuration_style=self.configuration_style))
 
         entities = {}
         for table_name, table_info in self.schema['tables'].items():
-            class_name = self.format_name(table_name)
-            columns = []
-            primary_key_columns = table_info.get('primary_key', [])
-            for column in table_info['columns']:
-                column_info = {
-                    'name': column['name'],
-                    'property_name': self.format_name(column['name']),
-                    'csharp_type': self.sql_to_csharp_type(column['type']),
-                    'nullable': column['nullable'],
-                    'primary_key': column['name'] in primary_key_columns,
-                    'description': column.get('description', '')
-                }
-                if column_info['primary_key']:
-                    column_info['key_order'] = primary_key_columns.index(column['name']) + 1 if len(primary_key_columns) > 1 else None
-                columns.append(column_info)
-            
-            foreign_keys = []
-            for fk in table_info.get('foreign_keys', []):
-                foreign_keys.append({
-                    'referenced_table': self.format_name(fk['referenced_table']),
-                    'property_name': self.format_name(fk['referenced_table']),
-                    'description': fk.get('description', '')
-                })
-
-            entities[class_name] = entity_template.render(
+            if table_names is not None and table_name not in table_names:
+                continue
+            self.check_cancelled()
+            table_view = self.view_model.table(table_name)
+            class_name = table_view['class_name']
+            entities[class_name] = render_entity(
                 namespace=self.namespace,
                 table_name=table_name,
                 class_name=class_name,
-                columns=columns,
-                foreign_keys=foreign_keys,
+                columns=table_view['columns'],
+                column_members=[render_property(column) for column in table_view['columns']],
+                foreign_keys=self.relationships.outgoing[table_name],
+                inverse_navigations=self.relationships.incoming[table_name],
                 table_description=table_info.get('description', ''),
+                family_tables=table_info.get('family_tables'),
                 configuration_style=self.configuration_style
             )
 
+        logger.debug(f"Property fragment cache: {self.fragment_cache.stats()}")
         return entities
 
-    def generate_dbcontext(self):
-        dbcontext_template = Template("""
-using System;
-using System.Data.Entity;
-
-namespace {{ namespace }}
-{
-    public class {{ dbcontext_name }} : DbContext
-    {
-        public {{ dbcontext_name }}(string nameOrConnectionString)
-            : base(nameOrConnectionString)
-        {
-        }
+    def render_property(self, renderer, column, render):
+        # The renderer is the property template, or 'fast' for fast_renderer, so
+        # fragments of different renderers never mix in a shared cache.
+        key = (
+            renderer,
+            self.configuration_style,
+            column['name'],
+            column['property_name'],
+            column['csharp_type'],
+            column['nullable'],
+            column['primary_key'],
+            column.get('key_order'),
+            column['description'],
+        )
+        return self.fragment_cache.get_or_render(key, render)
 
-        {% for table in tables %}
-        public virtual DbSet<{{ table }}> {{ table }}s { get; set; }
-        {% endfor %}
-
-        protected override void OnModelCreating(DbModelBuilder modelBuilder)
-        {
-            {% if configuration_style == 'fluent_api' %}
-            // Configure your model here using Fluent API
-            {% for table_name, table_info in schema['tables'].items() %}
-            modelBuilder.Entity<{{ format_name(table_name) }}>()
-                .ToTable("{{ table_name }}");
-            
-            {% for column in table_info['columns'] %}
-            modelBuilder.Entity<{{ format_name(table_name) }}>()
-                .Property(e => e.{{ format_name(column['name']) }})
-                .HasColumnName("{{ column['name'] }}")
-                {% if column['name'] in table_info.get('primary_key', []) %}
-                .HasDatabaseGeneratedOption(DatabaseGeneratedOption.Identity)
-                .IsRequired();
-                {% elif not column['nullable'] %}
-                .IsRequired();
-                {% endif %}
-            
-            {% endfor %}
-            {% for fk in table_info.get('foreign_keys', []) %}
-            modelBuilder.Entity<{{ format_name(table_name) }}>()
-                .HasRequired(e => e.{{ format_name(fk['referenced_table']) }})
-                .WithMany()
-                .HasForeignKey(e => e.{{ format_name(fk['column']) }});
-            
-            {% endfor %}
-            {% endfor %}
-            {% endif %}
-        }
-    }
-}
-""")
+    def generate_dbcontext(self):
+        if self.renderer == 'fast':
+            render = fast_renderer.render_dbcontext_efcore if self.framework == 'efcore' else fast_renderer.render_dbcontext
+        else:
+            template_name = 'dbcontext_efcore.cs.j2' if self.framework == 'efcore' else 'dbcontext.cs.j2'
+            render = self.environment.get_template(template_name).render
 
         tables = [self.format_name(table) for table in self.schema['tables'].keys()]
-        return dbcontext_template.render(
+        return render(
             namespace=self.namespace,
             dbcontext_name=self.dbcontext_name,
             tables=tables,
             schema=self.schema,
+            relationships=self.relationships,
+            view_model=self.view_model,
             format_name=self.format_name,
-            configuration_style=self.configuration_style
+            configuration_style=self.configuration_style,
+            families=self.families()
         )
 
     def generate_stored_procedures(self):
-        stored_procedure_template = Template("""
-using System;
-using System.Data.Entity;
-using System.Data.SqlClient;
-using System.Threading.Tasks;
-
-namespace {{ namespace }}
-{
-    public partial class {{ dbcontext_name }}
-    {
-        {% for proc_name, proc_info in procedures.items() %}
-        {% if proc_info.description %}
-        /// <summary>
-        /// {{ proc_info.description | format_comment }}
-        /// </summary>
-        {% endif %}
-        public virtual async Task<int> {{ format_name(proc_name) }}Async({% for param in proc_info.parameters %}{{ param.csharp_type }} {{ param.name }}{% if not loop.last %}, {% endif %}{% endfor %})
-        {
-            var parameters = new []
-            {
-                {% for param in proc_info.parameters %}
-                new SqlParameter("{{ param.name }}", {{ param.name }}){% if not loop.last %},{% endif %}
-                {% endfor %}
-            };
-
-            return await Database.ExecuteSqlCommandAsync("EXEC {{ proc_name }} {% for param in proc_info.parameters %}@{{ param.name }}{% if not loop.last %}, {% endif %}{% endfor %}", parameters);
-        }
-
-        {% endfor %}
-    }
-}
-""")
-
-        def format_comment(comment):
-            return re.sub(r'\s+', ' ', comment).strip()
+        if self.renderer == 'fast':
+            return fast_renderer.render_stored_procedures(
+                namespace=self.namespace,
+                dbcontext_name=self.dbcontext_name,
+                procedures=self.schema['procedures'],
+                format_name=self.format_name,
+                csharp_type=self.sql_to_csharp_type,
+                result_properties=self.view_model.result_properties,
+                framework=self.framework
+            )
 
-        stored_procedure_template.environment.filters['format_comment'] = format_comment
+        template_name = 'stored_procedures_efcore.cs.j2' if self.framework == 'efcore' else 'stored_procedures.cs.j2'
+        stored_procedure_template = self.environment.get_template(template_name)
 
         return stored_procedure_template.render(
             namespace=self.namespace,
             dbcontext_name=self.dbcontext_name,
             procedures=self.schema['procedures'],
-            format_name=self.format_name
+            format_name=self.format_name,
+            csharp_type=self.sql_to_csharp_type,
+            result_properties=self.view_model.result_properties
         )
 
-    def format_name(self, name):
-        if self.naming_convention == 'camelcase':
-            return ''.join(word.capitalize() for word in name.split('_'))
+    def generate_compiled_model(self):
+        # File name -> source of the EF Core compiled model (dotnet ef dbcontext
+        # optimize output) and the pooled registration that uses it.
+        if self.renderer == 'fast':
+            render_model = fast_renderer.render_compiled_model
+            render_entity_type = fast_renderer.render_compiled_entity_type
+            render_pool = fast_renderer.render_dbcontext_pool
         else:
-            return name
+            render_model = self.environment.get_template('compiled_model.cs.j2').render
+            render_entity_type = self.environment.get_template('compiled_entity_type.cs.j2').render
+            render_pool = self.environment.get_template('dbcontext_pool.cs.j2').render
+
+        entity_types = runtime_model.entity_types(self.schema, self.view_model, self.relationships)
+        files = {f"{self.dbcontext_name}Model.cs": render_model(namespace=self.namespace, dbcontext_name=self.dbcontext_name,
+                                                                entity_types=entity_types)}
+        for entity_type in entity_types:
+            self.check_cancelled()
+            files[f"{entity_type['class_name']}EntityType.cs"] = render_entity_type(namespace=self.namespace, entity_type=entity_type)
+        files[f"{self.dbcontext_name}ServiceCollectionExtensions.cs"] = render_pool(namespace=self.namespace, dbcontext_name=self.dbcontext_name)
+        return files
+
+    def families(self):
+        # Entity class -> tables it maps, for tables collapsed by table_families.
+        return {
+            self.format_name(table_name): table_info['family_tables']
+            for table_name, table_info in self.schema['tables'].items()
+            if table_info.get('family_tables')
+        }
 
-    def sql_to_csharp_type(self, sql_type):
-        type_mapping = {
-            'int': 'int',
-            'bigint': 'long',
-            'varchar': 'string',
-            'char': 'string',
-            'text': 'string',
-            'datetime': 'DateTime',
-            'date': 'DateTime',
-            'time': 'TimeSpan',
-            'bit': 'bool',
-            'decimal': 'decimal',
-            'float': 'float',
-            'double': 'double',
-            'tinyint': 'byte',
-            'smallint': 'short',
-            'nvarchar': 'string',
-            'varbinary': 'byte[]',
-            'binary': 'byte[]',
-            'image': 'byte[]',
-            'money': 'decimal',
-            'real': 'float',
-            'smalldatetime': 'DateTime',
-            'timestamp': 'byte[]',
-            'uniqueidentifier': 'Guid'
+    def entity_groups(self):
+        # Maps each entity class to the database schema its table lives in,
+        # falling back to the namespace for dialects without schemas.
+        return {
+            self.format_name(table_name): table_info.get('schema') or self.namespace
+            for table_name, table_info in self.schema['tables'].items()
         }
-        return type_mapping.get(sql_type.lower(), 'object')
\ No newline at end of file
+
+    def format_name(self, name):
+        return self.view_model.format_name(name)
+
+    def sql_to_csharp_type(self, sql_type):
+        return self.view_model.csharp_type(sql_type)
@@ -1,40 +1,127 @@
 # connection_history.py
+import hashlib
 import json
 import os
+import sqlite3
+import time
 import logging
 
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_HISTORY_DIR = os.path.join(os.path.expanduser('~'), '.ef_reverse_poco_generator')
+KEYRING_SERVICE = 'ef-reverse-poco-generator'
+
 class ConnectionHistory:
-    def __init__(self, filename='connection_history.json'):
+    fields = ['db_type', 'host', 'port', 'user', 'database']
+
+    def __init__(self, filename=None, max_entries=200, legacy_filename='connection_history.json'):
+        if filename is None:
+            os.makedirs(DEFAULT_HISTORY_DIR, exist_ok=True)
+            filename = os.path.join(DEFAULT_HISTORY_DIR, 'connection_history.db')
         self.filename = filename
-        self.history = self.load_history()
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(self.filename)
+        self.create_tables()
+        self.migrate_legacy_history(legacy_filename)
 
-    def load_history(self):
-        if os.path.exists(self.filename):
-            with open(self.filename, 'r') as f:
-                return json.load(f)
-        return []
+    def create_tables(self):
+        with self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS connections (
+                    fingerprint TEXT NOT NULL,
+                    db_type TEXT,
+                    host TEXT,
+                    port TEXT,
+                    user TEXT,
+                    database TEXT,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self.db.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_connections_fingerprint ON connections (fingerprint)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS ix_connections_last_used ON connections (last_used)")
 
-    def save_history(self):
-        with open(self.filename, 'w') as f:
-            json.dump(self.history, f)
+    def migrate_legacy_history(self, legacy_filename):
+        # Older versions kept the history, passwords included, in a JSON file in
+        # the working directory. Import it once and keep a copy without secrets.
+        if not legacy_filename or not os.path.exists(legacy_filename):
+            return
+        with open(legacy_filename, 'r') as f:
+            entries = json.load(f)
+        for entry in entries:
+            self.add_connection(dict(entry))
+        with open(f"{legacy_filename}.migrated", 'w') as f:
+            json.dump([{k: v for k, v in entry.items() if k != 'password'} for entry in entries], f)
+        os.remove(legacy_filename)
+        logger.info(f"Migrated {len(entries)} connections from {legacy_filename}")
+
+    def fingerprint(self, connection_info):
+        key = [str(connection_info.get(field, '')) for field in self.fields]
+        return hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
 
     def add_connection(self, connection_info):
-        required_fields = ['db_type', 'host', 'port', 'user', 'password', 'database']
+        required_fields = ['db_type', 'host', 'port', 'user', 'database']
         for field in required_fields:
             if field not in connection_info:
                 logger.warning(f"Missing field '{field}' in connection info. Using default value.")
                 connection_info[field] = 'Unknown'
-        
-        if connection_info not in self.history:
-            self.history.append(connection_info)
-            self.save_history()
+
+        fingerprint = self.fingerprint(connection_info)
+        with self.db:
+            self.db.execute("""
+                INSERT INTO connections (fingerprint, db_type, host, port, user, database, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (fingerprint) DO UPDATE SET last_used = excluded.last_used
+            """, [fingerprint] + [str(connection_info[field]) for field in self.fields] + [time.time()])
+            evicted = [row[0] for row in self.db.execute(
+                "SELECT fingerprint FROM connections ORDER BY last_used DESC LIMIT -1 OFFSET ?", (self.max_entries,))]
+            self.db.executemany("DELETE FROM connections WHERE fingerprint = ?", [(f,) for f in evicted])
+
+        if connection_info.get('password'):
+            self.store_password(fingerprint, connection_info['password'])
+        for f in evicted:
+            self.delete_password(f)
         logger.info("Connection added to history successfully.")
 
+    def store_password(self, fingerprint, password):
+        if keyring is None:
+            logger.warning("keyring is not installed, the password is not stored in the connection history.")
+            return
+        try:
+            keyring.set_password(KEYRING_SERVICE, fingerprint, password)
+        except Exception as e:
+            logger.warning(f"Failed to store password in the OS keyring: {str(e)}")
+
+    def delete_password(self, fingerprint):
+        if keyring is None:
+            return
+        try:
+            keyring.delete_password(KEYRING_SERVICE, fingerprint)
+        except Exception:
+            pass
+
+    def get_password(self, connection_info):
+        if keyring is None:
+            return ''
+        try:
+            return keyring.get_password(KEYRING_SERVICE, self.fingerprint(connection_info)) or ''
+        except Exception as e:
+            logger.warning(f"Failed to read password from the OS keyring: {str(e)}")
+            return ''
+
     def get_history(self):
-        return self.history
+        # Most recently used first; passwords are fetched separately with get_password.
+        rows = self.db.execute(
+            "SELECT db_type, host, port, user, database FROM connections ORDER BY last_used DESC LIMIT ?", (self.max_entries,))
+        return [dict(zip(self.fields, row)) for row in rows]
 
     def clear_history(self):
-        self.history = []
-        self.save_history()
\ No newline at end of file
+        fingerprints = [row[0] for row in self.db.execute("SELECT fingerprint FROM connections")]
+        with self.db:
+            self.db.execute("DELETE FROM connections")
+        for fingerprint in fingerprints:
+            self.delete_password(fingerprint)
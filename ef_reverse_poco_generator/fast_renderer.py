@@ -0,0 +1,340 @@
+# fast_renderer.py
+# Pure Python rendering of the built-in templates. Every function mirrors one
+# template in templates/ and must produce exactly the same text, whitespace
+# included; benchmarks/renderers.py --verify compares both renderers.
+from template_loader import format_comment
+
+
+def key_expression(variable, properties):
+    if len(properties) > 1:
+        return 'new { ' + ', '.join(f"{variable}.{property}" for property in properties) + ' }'
+    return f"{variable}.{properties[0]}"
+
+
+def render_property(column, configuration_style):
+    parts = ['\n        ']
+    if column['description']:
+        parts.append(f"\n        /// <summary>\n        /// {format_comment(column['description'])}\n        /// </summary>\n        ")
+    parts.append('\n        ')
+    if configuration_style == 'data_annotations':
+        parts.append('\n        ')
+        if column['primary_key']:
+            parts.append('[Key]')
+        parts.append('\n        ')
+        if column['primary_key'] and column.get('key_order') is not None:
+            parts.append(f"[Column(Order = {column['key_order']})]")
+        parts.append('\n        ')
+        if not column['nullable']:
+            parts.append('[Required]')
+        parts.append(f'\n        [Column("{column["name"]}")]\n        ')
+    parts.append(f"\n        public {column['csharp_type']} {column['property_name']} {{ get; set; }}\n\n        ")
+    return ''.join(parts)
+
+
+def render_entity(namespace, table_name, class_name, columns, column_members, foreign_keys, inverse_navigations, table_description,
+                  configuration_style, family_tables=None):
+    data_annotations = configuration_style == 'data_annotations'
+    parts = ['\nusing System;\nusing System.Collections.Generic;\n']
+    if data_annotations:
+        parts.append('\nusing System.ComponentModel.DataAnnotations;\nusing System.ComponentModel.DataAnnotations.Schema;\n')
+    parts.append(f"\n\nnamespace {namespace}\n{{\n    ")
+    if table_description:
+        parts.append(f"\n    /// <summary>\n    /// {format_comment(table_description)}\n    /// </summary>\n    ")
+    parts.append('\n    ')
+    if data_annotations:
+        parts.append(f'[Table("{family_tables[0] if family_tables else table_name}")]')
+    parts.append(f"\n    public class {class_name}\n    {{\n        ")
+    if family_tables:
+        members = ', '.join(f'"{member}"' for member in family_tables)
+        parts.append(f"public static readonly string[] FamilyTables = {{ {members} }};\n\n        ")
+    parts.extend(column_members)
+    parts.append('\n        ')
+    for fk in foreign_keys:
+        parts.append('\n        ')
+        if fk['description']:
+            parts.append(f"\n        /// <summary>\n        /// {format_comment(fk['description'])}\n        /// </summary>\n        ")
+        parts.append('\n        ')
+        if data_annotations:
+            parts.append(f'\n        [ForeignKey("{",".join(fk["column_properties"])}")]\n        ')
+            if fk['inverse_navigation']:
+                parts.append(f'[InverseProperty("{fk["inverse_navigation"]}")]')
+            parts.append('\n        ')
+        parts.append(f"\n        public virtual {fk['referenced_class']} {fk['navigation']} {{ get; set; }}\n\n        ")
+    parts.append('\n        ')
+    for fk in inverse_navigations:
+        parts.append('\n        ')
+        if data_annotations:
+            parts.append(f'[InverseProperty("{fk["navigation"]}")]')
+        parts.append(f"\n        public virtual ICollection<{fk['class_name']}> {fk['inverse_navigation']} {{ get; set; }}"
+                     f" = new HashSet<{fk['class_name']}>();\n\n        ")
+    parts.append('\n    }\n}')
+    return ''.join(parts)
+
+
+def render_dbsets(parts, tables):
+    for table in tables:
+        parts.append(f"\n        public virtual DbSet<{table}> {table}s {{ get; set; }}\n        ")
+
+
+def render_dbcontext(namespace, dbcontext_name, tables, schema, relationships, view_model, format_name, configuration_style, families=None):
+    parts = [
+        f"\nusing System;\nusing System.Data.Entity;\n\nnamespace {namespace}\n{{\n    public class {dbcontext_name} : DbContext\n    {{\n"
+        f"        public {dbcontext_name}(string nameOrConnectionString)\n            : base(nameOrConnectionString)\n        {{\n        }}\n\n        "
+    ]
+    render_dbsets(parts, tables)
+    parts.append('\n\n        protected override void OnModelCreating(DbModelBuilder modelBuilder)\n        {\n            ')
+    if configuration_style == 'fluent_api':
+        parts.append('\n            // Configure your model here using Fluent API\n            ')
+        for table_name, table_info in schema['tables'].items():
+            class_name = format_name(table_name)
+            primary_key = table_info.get('primary_key', [])
+            mapped_table = table_info['family_tables'][0] if table_info.get('family_tables') else table_name
+            parts.append(f'\n            modelBuilder.Entity<{class_name}>()\n                .ToTable("{mapped_table}");\n            \n            ')
+            for column in table_info['columns']:
+                parts.append(f"\n            modelBuilder.Entity<{class_name}>()\n                .Property(e => e.{format_name(column['name'])})\n"
+                             f'                .HasColumnName("{column["name"]}")\n                ')
+                if column['name'] in primary_key:
+                    parts.append('\n                .HasDatabaseGeneratedOption(DatabaseGeneratedOption.Identity)\n                .IsRequired();\n                ')
+                elif not column['nullable']:
+                    parts.append('\n                .IsRequired();\n                ')
+                parts.append('\n            \n            ')
+            parts.append('\n            ')
+            for fk in relationships.outgoing[table_name]:
+                inverse = f"p => p.{fk['inverse_navigation']}" if fk['inverse_navigation'] else ''
+                parts.append(f"\n            modelBuilder.Entity<{class_name}>()\n"
+                             f"                .{'HasRequired' if fk['required'] else 'HasOptional'}(e => e.{fk['navigation']})\n"
+                             f"                .WithMany({inverse})\n"
+                             f"                .HasForeignKey(e => {key_expression('e', fk['column_properties'])});\n            \n            ")
+            parts.append('\n            ')
+        parts.append('\n            ')
+    parts.append('\n        }\n    }\n}')
+    return ''.join(parts)
+
+
+def render_dbcontext_efcore(namespace, dbcontext_name, tables, schema, relationships, view_model, format_name, configuration_style,
+                            families=None):
+    fluent_api = configuration_style == 'fluent_api'
+    parts = [
+        f"\nusing System;\nusing Microsoft.EntityFrameworkCore;\n\nnamespace {namespace}\n{{\n    public partial class {dbcontext_name} : DbContext\n    {{\n"
+        f"        public {dbcontext_name}(DbContextOptions<{dbcontext_name}> options)\n            : base(options)\n        {{\n        }}\n\n        "
+    ]
+    families = families or {}
+    for table in tables:
+        if table in families:
+            for member in families[table]:
+                parts.append(f'\n        public virtual DbSet<{table}> {format_name(member)} => Set<{table}>("{member}");')
+        else:
+            parts.append(f"\n        public virtual DbSet<{table}> {table}s {{ get; set; }}")
+        parts.append('\n        ')
+    parts.append('\n\n        protected override void OnModelCreating(ModelBuilder modelBuilder)\n        {\n            ')
+    for table_name, table_info in schema['tables'].items():
+        primary_key = view_model.table(table_name)['primary_key']
+        family_tables = table_info.get('family_tables')
+        parts.append('\n            ')
+        for mapped_table in family_tables or [table_name]:
+            parts.append('\n            ')
+            if fluent_api or len(primary_key) != 1 or family_tables:
+                if family_tables:
+                    parts.append(f'\n            modelBuilder.SharedTypeEntity<{format_name(table_name)}>("{mapped_table}", entity =>\n            {{\n                ')
+                else:
+                    parts.append(f"\n            modelBuilder.Entity<{format_name(table_name)}>(entity =>\n            {{\n                ")
+                if len(primary_key) > 1:
+                    parts.append(f"\n                entity.HasKey(e => {key_expression('e', primary_key)});\n                ")
+                elif not primary_key:
+                    parts.append('\n                entity.HasNoKey();\n                ')
+                elif fluent_api:
+                    parts.append(f"\n                entity.HasKey(e => e.{primary_key[0]});\n                ")
+                if family_tables and not fluent_api:
+                    parts.append(f'\n                entity.ToTable("{mapped_table}");')
+                parts.append('\n                ')
+                if fluent_api:
+                    parts.append(f'\n                entity.ToTable("{mapped_table}");\n                ')
+                    for column in table_info['columns']:
+                        parts.append(f"\n\n                entity.Property(e => e.{format_name(column['name'])})\n"
+                                     f'                    .HasColumnName("{column["name"]}")')
+                        if not column['nullable']:
+                            parts.append('\n                    .IsRequired()')
+                        parts.append(';\n                ')
+                    parts.append('\n                ')
+                    for fk in relationships.outgoing[table_name]:
+                        inverse = f"p => p.{fk['inverse_navigation']}" if fk['inverse_navigation'] else ''
+                        parts.append(f"\n\n                entity.HasOne(d => d.{fk['navigation']})\n"
+                                     f"                    .WithMany({inverse})\n"
+                                     f"                    .HasForeignKey(d => {key_expression('d', fk['column_properties'])})")
+                        if fk['name']:
+                            parts.append(f'\n                    .HasConstraintName("{fk["name"]}")')
+                        if not fk['required']:
+                            parts.append('\n                    .IsRequired(false)')
+                        parts.append(';\n                ')
+                    parts.append('\n                ')
+                parts.append('\n            });\n\n            ')
+        parts.append('\n            ')
+    parts.append('\n        }\n    }\n}')
+    return ''.join(parts)
+
+
+def render_stored_procedures(namespace, dbcontext_name, procedures, format_name, csharp_type, result_properties, framework='ef6'):
+    if framework == 'efcore':
+        usings = 'using System.Threading.Tasks;\nusing Microsoft.Data.SqlClient;\nusing Microsoft.EntityFrameworkCore;\n'
+        execute, query = 'ExecuteSqlRawAsync', 'SqlQueryRaw'
+        result_comment = '    // Rows are mapped by column name, given by [Column] when it is not a valid property name.\n'
+    else:
+        usings = 'using System.Data.Entity;\nusing System.Data.SqlClient;\nusing System.Threading.Tasks;\n'
+        execute, query = 'ExecuteSqlCommandAsync', 'SqlQuery'
+        result_comment = ('    // Rows are mapped by property name; EF6 ignores [Column], so properties renamed from\n'
+                          '    // a column that is not a valid property name are left empty (alias the column in the procedure).\n')
+    if any(proc_info.get('result_columns') for proc_info in procedures.values()):
+        usings = 'using System.Collections.Generic;\nusing System.ComponentModel.DataAnnotations.Schema;\n' + usings
+    parts = [f"\nusing System;\n{usings}\nnamespace {namespace}\n{{\n    public partial class {dbcontext_name}\n    {{\n        "]
+    for proc_name, proc_info in procedures.items():
+        parameters = proc_info['parameters']
+        result_class = f"{format_name(proc_name)}Result"
+        parts.append('\n        ')
+        if proc_info.get('description'):
+            parts.append(f"\n        /// <summary>\n        /// {format_comment(proc_info['description'])}\n        /// </summary>\n        ")
+        arguments = ', '.join(f"{csharp_type(param['type'])} {param['name']}" for param in parameters)
+        return_type = f"List<{result_class}>" if proc_info.get('result_columns') else 'int'
+        parts.append(f"\n        public virtual async Task<{return_type}> {format_name(proc_name)}Async({arguments})\n        {{\n"
+                     f"            var parameters = new []\n            {{\n                ")
+        for index, param in enumerate(parameters):
+            separator = ',' if index < len(parameters) - 1 else ''
+            parts.append(f'\n                new SqlParameter("{param["name"]}", {param["name"]}){separator}\n                ')
+        placeholders = ', '.join(f"@{param['name']}" for param in parameters)
+        command = f'"EXEC {proc_name} {placeholders}", parameters'
+        if proc_info.get('result_columns'):
+            call = f"{query}<{result_class}>({command}).ToListAsync()"
+        else:
+            call = f"{execute}({command})"
+        parts.append(f'\n            }};\n\n            return await Database.{call};\n        }}\n\n        ')
+    parts.append('\n    }')
+    for proc_name, proc_info in procedures.items():
+        if proc_info.get('result_columns'):
+            result_class = f"{format_name(proc_name)}Result"
+            parts.append(f"\n\n{result_comment}    public class {result_class}\n    {{\n")
+            for property in result_properties(result_class, proc_info['result_columns']):
+                if property['mapped_column'] is not None:
+                    parts.append(f'        [Column("{property["mapped_column"]}")]\n')
+                parts.append(f"        public {property['csharp_type']} {property['property_name']} {{ get; set; }}\n")
+            parts.append('    }')
+    parts.append('\n}')
+    return ''.join(parts)
+
+
+def render_compiled_model(namespace, dbcontext_name, entity_types):
+    model = f"{dbcontext_name}Model"
+    parts = [
+        f"// <auto-generated />\nusing Microsoft.EntityFrameworkCore.Infrastructure;\nusing Microsoft.EntityFrameworkCore.Metadata;\n\n"
+        f"namespace {namespace}\n{{\n    [DbContext(typeof({dbcontext_name}))]\n    public partial class {model} : RuntimeModel\n    {{\n"
+        f"        static {model}()\n        {{\n            var model = new {model}();\n            model.Initialize();\n"
+        f"            model.Customize();\n            _instance = model;\n        }}\n\n        private static {model} _instance;\n"
+        f"        public static IModel Instance => _instance;\n\n        private void Initialize()\n        {{\n"
+    ]
+    for entity_type in entity_types:
+        for instance in entity_type['instances']:
+            table_argument = f', "{instance["table_name"]}"' if entity_type['family_tables'] else ''
+            parts.append(f"            var {instance['variable']} = {entity_type['class_name']}EntityType.Create(this{table_argument});\n")
+    parts.append('\n')
+    for entity_type in entity_types:
+        for instance in entity_type['instances']:
+            for fk in entity_type['foreign_keys']:
+                parts.append(f"            {entity_type['class_name']}EntityType.CreateForeignKey{fk['number']}"
+                             f"({instance['variable']}, {fk['principal_variable']});\n")
+    parts.append('\n')
+    for entity_type in entity_types:
+        for instance in entity_type['instances']:
+            table_argument = f', "{instance["table_name"]}"' if entity_type['family_tables'] else ''
+            parts.append(f"            {entity_type['class_name']}EntityType.CreateAnnotations({instance['variable']}{table_argument});\n")
+    parts.append('        }\n\n        partial void Customize();\n    }\n}')
+    return ''.join(parts)
+
+
+def find_properties(variable, properties):
+    return ', '.join(f'{variable}.FindProperty("{property}")' for property in properties)
+
+
+def member_info(class_name, member):
+    flags = 'BindingFlags.Instance | BindingFlags.DeclaredOnly'
+    return (f'propertyInfo: typeof({class_name}).GetProperty("{member}", BindingFlags.Public | {flags}),\n'
+            f'                fieldInfo: typeof({class_name}).GetField("<{member}>k__BackingField", BindingFlags.NonPublic | {flags})')
+
+
+def render_compiled_entity_type(namespace, entity_type):
+    class_name = entity_type['class_name']
+    family = bool(entity_type['family_tables'])
+    entity_name = 'name' if family else f'"{namespace}.{class_name}"'
+    shared_type = ',\n                sharedClrType: true' if family else ''
+    parts = [
+        f"// <auto-generated />\nusing System;\nusing System.Collections.Generic;\nusing System.Reflection;\n"
+        f"using Microsoft.EntityFrameworkCore;\nusing Microsoft.EntityFrameworkCore.Metadata;\n\n"
+        f"namespace {namespace}\n{{\n    internal partial class {class_name}EntityType\n    {{\n"
+        f"        public static RuntimeEntityType Create(RuntimeModel model{', string name' if family else ''})\n        {{\n"
+        f"            var runtimeEntityType = model.AddEntityType(\n                {entity_name},\n"
+        f"                typeof({class_name}){shared_type});\n"
+    ]
+    for property in entity_type['properties']:
+        parts.append(f"\n            runtimeEntityType.AddProperty(\n                \"{property['property_name']}\",\n"
+                     f"                typeof({property['csharp_type']}),\n                {member_info(class_name, property['property_name'])}")
+        if property['nullable']:
+            parts.append(',\n                nullable: true')
+        if property['value_generated']:
+            parts.append(',\n                valueGenerated: ValueGenerated.OnAdd')
+        if property['primary_key']:
+            parts.append(',\n                afterSaveBehavior: PropertySaveBehavior.Throw')
+        parts.append(f")\n                .AddAnnotation(\"Relational:ColumnName\", \"{property['column_name']}\");\n")
+    if entity_type['primary_key']:
+        parts.append(f"\n            var key = runtimeEntityType.AddKey(\n"
+                     f"                new[] {{ {find_properties('runtimeEntityType', entity_type['primary_key'])} }});\n"
+                     f"            runtimeEntityType.SetPrimaryKey(key);\n")
+    parts.append('\n            return runtimeEntityType;\n        }\n')
+    for fk in entity_type['foreign_keys']:
+        parts.append(f"\n        public static RuntimeForeignKey CreateForeignKey{fk['number']}(RuntimeEntityType declaringEntityType, "
+                     f"RuntimeEntityType principalEntityType)\n        {{\n"
+                     f"            // Keys referenced by a unique constraint rather than the primary key become alternate keys.\n"
+                     f"            var principalProperties = new[] {{ {find_properties('principalEntityType', fk['referenced_properties'])} }};\n"
+                     f"            var runtimeForeignKey = declaringEntityType.AddForeignKey(\n"
+                     f"                new[] {{ {find_properties('declaringEntityType', fk['column_properties'])} }},\n"
+                     f"                principalEntityType.FindKey(principalProperties) ?? principalEntityType.AddKey(principalProperties),\n"
+                     f"                principalEntityType,\n                deleteBehavior: ")
+        if fk['required']:
+            parts.append('DeleteBehavior.Cascade,\n                required: true);')
+        else:
+            parts.append('DeleteBehavior.ClientSetNull);')
+        if fk['name']:
+            parts.append(f"\n            runtimeForeignKey.AddAnnotation(\"Relational:Name\", \"{fk['name']}\");")
+        parts.append(f"\n\n            declaringEntityType.AddNavigation(\n                \"{fk['navigation']}\",\n                runtimeForeignKey,\n"
+                     f"                onDependent: true,\n                typeof({fk['referenced_class']}),\n"
+                     f"                {member_info(class_name, fk['navigation'])});\n")
+        if fk['inverse_navigation']:
+            parts.append(f"\n            principalEntityType.AddNavigation(\n                \"{fk['inverse_navigation']}\",\n                runtimeForeignKey,\n"
+                         f"                onDependent: false,\n                typeof(ICollection<{class_name}>),\n"
+                         f"                {member_info(fk['referenced_class'], fk['inverse_navigation'])});\n")
+        parts.append('\n            return runtimeForeignKey;\n        }\n')
+    table_name = 'tableName' if family else f'"{entity_type["table_name"]}"'
+    parts.append(
+        f"\n        public static void CreateAnnotations(RuntimeEntityType runtimeEntityType{', string tableName' if family else ''})\n        {{\n"
+        f"            runtimeEntityType.AddAnnotation(\"Relational:FunctionName\", null);\n"
+        f"            runtimeEntityType.AddAnnotation(\"Relational:Schema\", null);\n"
+        f"            runtimeEntityType.AddAnnotation(\"Relational:SqlQuery\", null);\n"
+        f"            runtimeEntityType.AddAnnotation(\"Relational:TableName\", {table_name});\n"
+        f"            runtimeEntityType.AddAnnotation(\"Relational:ViewName\", null);\n"
+        f"            runtimeEntityType.AddAnnotation(\"Relational:ViewSchema\", null);\n\n"
+        f"            Customize(runtimeEntityType);\n        }}\n\n"
+        f"        static partial void Customize(RuntimeEntityType runtimeEntityType);\n    }}\n}}"
+    )
+    return ''.join(parts)
+
+
+def render_dbcontext_pool(namespace, dbcontext_name):
+    registrations = []
+    for method, extension in (('Pool', 'AddDbContextPool'), ('PooledFactory', 'AddPooledDbContextFactory')):
+        registrations.append(
+            f"        public static IServiceCollection Add{dbcontext_name}{method}(this IServiceCollection services, "
+            f"Action<DbContextOptionsBuilder> configure, int poolSize = 1024)\n        {{\n"
+            f"            return services.{extension}<{dbcontext_name}>(options =>\n            {{\n                configure(options);\n"
+            f"                options.UseModel({dbcontext_name}Model.Instance);\n            }}, poolSize);\n        }}\n"
+        )
+    return (f"using System;\nusing Microsoft.EntityFrameworkCore;\nusing Microsoft.Extensions.DependencyInjection;\n\n"
+            f"namespace {namespace}\n{{\n    public static class {dbcontext_name}ServiceCollectionExtensions\n    {{\n"
+            f"        // Pooled contexts are reset and reused instead of being created per scope,\n"
+            f"        // and the compiled model replaces OnModelCreating at startup.\n"
+            + '\n'.join(registrations) + '    }\n}')
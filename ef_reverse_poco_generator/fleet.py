@@ -0,0 +1,87 @@
+# fleet.py
+import hashlib
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from db_connector import connect
+from schema_reader import read_schema
+from code_generator import CodeGenerator
+from output_writer import DEFAULT_MAX_BUNDLE_BYTES, write_output
+
+logger = logging.getLogger(__name__)
+
+def schema_fingerprint(schema):
+    return hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def read_tenant_schema(tenant, naming_convention):
+    db = connect(dict(tenant['connection']))
+    try:
+        return read_schema(db, naming_convention, **tenant.get('reader_options', {}))
+    finally:
+        db.close()
+
+def link_output(source, destination, link_mode='symlink'):
+    if os.path.islink(destination) or os.path.isfile(destination):
+        os.remove(destination)
+    elif os.path.isdir(destination):
+        shutil.rmtree(destination)
+    if link_mode == 'symlink':
+        try:
+            os.symlink(os.path.relpath(source, os.path.dirname(destination)), destination, target_is_directory=os.path.isdir(source))
+            return
+        except OSError as e:
+            logger.warning(f"Symlink to {source} failed ({str(e)}), copying instead")
+    if os.path.isdir(source):
+        shutil.copytree(source, destination)
+    else:
+        shutil.copy2(source, destination)
+
+def generate_fleet(tenants, output_root, namespace, dbcontext_name, naming_convention='camelcase', configuration_style='data_annotations',
+                   framework='ef6', layout='per_file', max_workers=8, link_mode='symlink', template_paths=None,
+                   max_bundle_bytes=DEFAULT_MAX_BUNDLE_BYTES):
+    # Each tenant is a dict with a 'name' and the 'connection' parameters accepted
+    # by db_connector.connect. Catalogs are read concurrently, code is rendered
+    # once per distinct schema and tenants with the same schema share the output.
+    def read(tenant):
+        try:
+            return tenant, read_tenant_schema(tenant, naming_convention), None
+        except Exception as e:
+            logger.error(f"Failed to read schema for tenant {tenant['name']}: {str(e)}")
+            return tenant, None, str(e)
+
+    variants = {}
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for tenant, schema, error in executor.map(read, tenants):
+            if error is not None:
+                failed[tenant['name']] = error
+                continue
+            fingerprint = schema_fingerprint(schema)
+            variant = variants.setdefault(fingerprint, {'schema': schema, 'tenants': []})
+            variant['tenants'].append(tenant['name'])
+    logger.info(f"{len(tenants) - len(failed)} tenants read, {len(variants)} distinct schemas")
+
+    extension = '.zip' if layout == 'zip' else ''
+    os.makedirs(output_root, exist_ok=True)
+    report = {'variants': [], 'failed': failed}
+    for fingerprint, variant in variants.items():
+        variant_output = os.path.join(output_root, '_variants', fingerprint[:12] + extension)
+        code_generator = CodeGenerator(variant['schema'], namespace, dbcontext_name, naming_convention, configuration_style, framework,
+                                       template_paths=template_paths)
+        write_output(code_generator.generate(), variant_output, dbcontext_name, layout, max_bundle_bytes, code_generator.entity_groups())
+        for tenant_name in variant['tenants']:
+            link_output(variant_output, os.path.join(output_root, tenant_name + extension), link_mode)
+        report['variants'].append({
+            'fingerprint': fingerprint,
+            'output': variant_output,
+            'tables': len(variant['schema']['tables']),
+            'tenants': variant['tenants'],
+        })
+
+    report['variants'].sort(key=lambda variant: len(variant['tenants']), reverse=True)
+    with open(os.path.join(output_root, 'fleet_report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
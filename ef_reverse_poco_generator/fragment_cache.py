@@ -0,0 +1,44 @@
+# fragment_cache.py
+import threading
+from collections import OrderedDict
+
+class FragmentCache:
+    # LRU cache of rendered template fragments. Keys must capture every input of
+    # the fragment (including the template object itself, so a reloaded template
+    # never serves stale text), which keeps cached output identical to rendering.
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.fragments = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self.lock:
+            fragment = self.fragments.get(key)
+            if fragment is not None:
+                self.fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+        fragment = render()
+        with self.lock:
+            self.fragments[key] = fragment
+            if len(self.fragments) > self.max_size:
+                self.fragments.popitem(last=False)
+        return fragment
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.fragments),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self.lock:
+            self.fragments.clear()
+            self.hits = 0
+            self.misses = 0
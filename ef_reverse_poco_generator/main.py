@@ -1,10 +1,17 @@
+import sys
 import tkinter as tk
 from reverse_poco_generator_gui import ReversePocoGeneratorGUI
+from cli import build_parser
+
+def main(argv=None):
+    args = build_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command:
+        args.func(args)
+        return
 
-def main():
     root = tk.Tk()
     app = ReversePocoGeneratorGUI(root)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,44 @@
+# multi_target.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from code_generator import CodeGenerator
+from output_writer import write_output
+from view_model import SchemaViewModel
+
+logger = logging.getLogger(__name__)
+
+def generate_targets(schema, namespace, dbcontext_name, targets, max_workers=None, template_paths=None):
+    # Renders one schema read into several target profiles. Each target is a dict
+    # with 'output_directory' and optionally 'configuration_style',
+    # 'naming_convention', 'framework', 'layout', 'namespace', 'dbcontext_name',
+    # 'template_paths' and 'compiled_model'.
+    view_models = {}
+    for target in targets:
+        naming_convention = target.get('naming_convention', 'camelcase')
+        if naming_convention not in view_models:
+            view_models[naming_convention] = SchemaViewModel(schema, naming_convention).prepare()
+
+    def render(target):
+        target_dbcontext_name = target.get('dbcontext_name', dbcontext_name)
+        naming_convention = target.get('naming_convention', 'camelcase')
+        code_generator = CodeGenerator(
+            schema,
+            target.get('namespace', namespace),
+            target_dbcontext_name,
+            naming_convention,
+            target.get('configuration_style', 'data_annotations'),
+            target.get('framework', 'ef6'),
+            view_model=view_models[naming_convention],
+            template_paths=target.get('template_paths', template_paths),
+            compiled_model=target.get('compiled_model', False)
+        )
+        generated_code = code_generator.generate()
+        written = write_output(generated_code, target['output_directory'], target_dbcontext_name,
+                               target.get('layout', 'per_file'), groups=code_generator.entity_groups())
+        logger.info(f"Target {target['output_directory']} generated ({len(written)} files)")
+        return written
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(render, targets))
+    return {target['output_directory']: written for target, written in zip(targets, results)}
@@ -0,0 +1,114 @@
+# output_writer.py
+import os
+import re
+import zipfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_LAYOUTS = ['per_file', 'bundle', 'per_schema', 'zip']
+DEFAULT_MAX_BUNDLE_BYTES = 1024 * 1024
+
+_USING_RE = re.compile(r'^using\s+[\w.]+\s*;$')
+
+
+def split_compilation_unit(source):
+    # Splits a generated file into its leading using directives and the rest,
+    # so several entities can share one file without repeating the usings.
+    lines = source.split('\n')
+    usings = []
+    index = 0
+    while index < len(lines):
+        line = lines[index].strip()
+        if line and not _USING_RE.match(line):
+            break
+        if line:
+            usings.append(line)
+        index += 1
+    return usings, '\n'.join(lines[index:])
+
+
+def merge_compilation_units(sources):
+    usings = []
+    bodies = []
+    for source in sources:
+        unit_usings, body = split_compilation_unit(source)
+        for using in unit_usings:
+            if using not in usings:
+                usings.append(using)
+        bodies.append(body)
+    return '\n'.join(usings) + '\n\n' + '\n\n'.join(bodies) + '\n'
+
+
+def plan_bundles(entities, max_bundle_bytes=DEFAULT_MAX_BUNDLE_BYTES):
+    bundles = []
+    current = []
+    current_size = 0
+    for class_name, code in entities.items():
+        size = len(code.encode('utf-8'))
+        if current and current_size + size > max_bundle_bytes:
+            bundles.append(current)
+            current = []
+            current_size = 0
+        current.append(class_name)
+        current_size += size
+    if current:
+        bundles.append(current)
+    return bundles
+
+
+def plan_files(generated_code, dbcontext_name, layout='per_file', max_bundle_bytes=DEFAULT_MAX_BUNDLE_BYTES, groups=None):
+    # Returns (file name, content) pairs for the requested layout.
+    entities = generated_code['entities']
+    if layout in ('per_file', 'zip'):
+        for class_name, code in entities.items():
+            yield f"{class_name}.cs", code
+    elif layout == 'bundle':
+        for number, bundle in enumerate(plan_bundles(entities, max_bundle_bytes), start=1):
+            yield f"{dbcontext_name}Entities{number}.cs", merge_compilation_units(entities[name] for name in bundle)
+    elif layout == 'per_schema':
+        grouped = {}
+        # A group must not take the DbContext or stored procedure file name.
+        reserved = {dbcontext_name, f"{dbcontext_name}StoredProcedures"}
+        for class_name, code in entities.items():
+            group = (groups or {}).get(class_name) or f"{dbcontext_name}Entities"
+            if group in reserved:
+                group = f"{group}Entities"
+            grouped.setdefault(group, []).append(code)
+        for group, sources in grouped.items():
+            yield f"{group}.cs", merge_compilation_units(sources)
+    else:
+        raise ValueError(f"Unsupported output layout: {layout}")
+
+    yield f"{dbcontext_name}.cs", generated_code['dbcontext']
+    yield f"{dbcontext_name}StoredProcedures.cs", generated_code['stored_procedures']
+    # Compiled model sources are keyed by file name and never bundled.
+    yield from generated_code.get('compiled_model', {}).items()
+
+
+def write_output(generated_code, destination, dbcontext_name, layout='per_file', max_bundle_bytes=DEFAULT_MAX_BUNDLE_BYTES, groups=None):
+    # Returns the names of the written files relative to the destination, which
+    # are the entry names for the zip layout.
+    files = plan_files(generated_code, dbcontext_name, layout, max_bundle_bytes, groups)
+
+    if layout == 'zip':
+        # Entries are streamed straight into the archive, no temp files involved.
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+        written = []
+        with zipfile.ZipFile(destination, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for file_name, code in files:
+                with archive.open(file_name, 'w') as entry:
+                    entry.write(code.encode('utf-8'))
+                written.append(file_name)
+        logger.info(f"{len(written)} files written to archive {destination}")
+        return written
+
+    os.makedirs(destination, exist_ok=True)
+    written = []
+    for file_name, code in files:
+        file_path = os.path.join(destination, file_name)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(code)
+        logger.info(f"{file_name} saved to {file_path}")
+        written.append(file_name)
+    return written
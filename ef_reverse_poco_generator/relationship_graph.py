@@ -0,0 +1,104 @@
+# relationship_graph.py
+import re
+
+
+def strip_key_suffix(name):
+    return re.sub(r'_?(id|Id|ID)$', '', name)
+
+
+def unique_name(candidate, taken):
+    # Same rule EF uses when scaffolding: a navigation that collides with another
+    # member of the class gets a "Navigation" suffix, then a number.
+    name = candidate
+    if name in taken:
+        name = f"{candidate}Navigation"
+    number = 1
+    while name in taken:
+        number += 1
+        name = f"{candidate}Navigation{number}"
+    taken.add(name)
+    return name
+
+
+class RelationshipGraph:
+    # Built once per schema: outgoing and incoming foreign keys keyed by table,
+    # with composite keys grouped per constraint and navigation names resolved,
+    # so templates can emit both directions without rescanning other tables.
+    def __init__(self, schema, format_name):
+        self.format_name = format_name
+        tables = schema['tables']
+        self.outgoing = {table_name: [] for table_name in tables}
+        self.incoming = {table_name: [] for table_name in tables}
+
+        for table_name, table_info in tables.items():
+            nullable = {column['name']: column['nullable'] for column in table_info['columns']}
+            constraints = {}
+            for index, fk in enumerate(table_info.get('foreign_keys', [])):
+                key = fk.get('constraint_name') or index
+                relationship = constraints.get(key)
+                if relationship is None:
+                    relationship = constraints[key] = {
+                        'name': fk.get('constraint_name'),
+                        'table': table_name,
+                        'class_name': format_name(table_name),
+                        'columns': [],
+                        'column_properties': [],
+                        'referenced_table': fk['referenced_table'],
+                        'referenced_class': format_name(fk['referenced_table']),
+                        'referenced_columns': [],
+                        'required': True,
+                        'description': fk.get('description', ''),
+                        'navigation': None,
+                        'inverse_navigation': None,
+                    }
+                relationship['columns'].append(fk['column'])
+                relationship['column_properties'].append(format_name(fk['column']))
+                relationship['referenced_columns'].append(fk['referenced_column'])
+                relationship['required'] = relationship['required'] and not nullable.get(fk['column'], False)
+            for relationship in constraints.values():
+                if len(relationship['columns']) > 1:
+                    relationship['description'] = f"Foreign key referencing {relationship['referenced_table']} ({', '.join(str(c) for c in relationship['referenced_columns'])})"
+                self.outgoing[table_name].append(relationship)
+                # A family entity maps several tables, so the referenced class gets
+                # no collection navigation for it.
+                if relationship['referenced_table'] in self.incoming and not table_info.get('family_tables'):
+                    self.incoming[relationship['referenced_table']].append(relationship)
+
+        self.members = {
+            table_name: {format_name(column['name']) for column in table_info['columns']} | {format_name(table_name)}
+            for table_name, table_info in tables.items()
+        }
+        for table_name in tables:
+            self.name_navigations(table_name)
+        for table_name in tables:
+            self.name_inverse_navigations(table_name)
+
+    def name_navigations(self, table_name):
+        relationships = self.outgoing[table_name]
+        targets = {}
+        for relationship in relationships:
+            targets[relationship['referenced_table']] = targets.get(relationship['referenced_table'], 0) + 1
+        taken = self.members[table_name]
+        for index, relationship in enumerate(relationships):
+            referenced_class = relationship['referenced_class']
+            if targets[relationship['referenced_table']] == 1 and relationship['referenced_table'] != table_name:
+                candidate = referenced_class
+            elif len(relationship['columns']) == 1:
+                # Several keys to the same table (or a self reference): name the
+                # navigation after the key column, e.g. BillingAddressId -> BillingAddress.
+                candidate = strip_key_suffix(relationship['column_properties'][0]) or referenced_class
+            else:
+                candidate = f"{referenced_class}{index + 1}"
+            relationship['navigation'] = unique_name(candidate, taken)
+
+    def name_inverse_navigations(self, table_name):
+        relationships = self.incoming[table_name]
+        sources = {}
+        for relationship in relationships:
+            sources[relationship['table']] = sources.get(relationship['table'], 0) + 1
+        taken = self.members[table_name]
+        for relationship in relationships:
+            candidate = f"{relationship['class_name']}s"
+            if sources[relationship['table']] > 1:
+                candidate = f"{relationship['navigation']}{candidate}"
+            relationship['inverse_navigation'] = unique_name(candidate, taken)
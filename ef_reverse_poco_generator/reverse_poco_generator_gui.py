@@ -3,15 +3,23 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import logging
 import os
+import re
+import threading
 
 from connection_history import ConnectionHistory
 from db_connector import connect
-from schema_reader import read_schema
+from schema_reader import get_schema_reader, read_schema, read_table_names
 from code_generator import CodeGenerator
+from output_writer import OUTPUT_LAYOUTS, write_output
+from schema_watcher import SchemaWatcher, Regenerator
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+TABLE_PAGE_SIZE = 200
+SEARCH_DEBOUNCE_MS = 250
+WATCH_CHECK_MS = 100
+
 class ReversePocoGeneratorGUI:
     def __init__(self, master):
         self.master = master
@@ -82,9 +90,84 @@ class ReversePocoGeneratorGUI:
         self.fluent_api_radio = ttk.Radiobutton(master, text="Fluent API", variable=self.config_style, value="fluent_api")
         self.fluent_api_radio.grid(row=12, column=1, sticky=tk.W, padx=5, pady=2)
 
+        # Framework
+        ttk.Label(master, text="Framework:").grid(row=13, column=0, sticky=tk.W, padx=5, pady=5)
+        self.framework = tk.StringVar(value="ef6")
+        self.ef6_radio = ttk.Radiobutton(master, text="Entity Framework 6", variable=self.framework, value="ef6")
+        self.ef6_radio.grid(row=13, column=1, sticky=tk.W, padx=5, pady=2)
+        self.efcore_radio = ttk.Radiobutton(master, text="EF Core", variable=self.framework, value="efcore")
+        self.efcore_radio.grid(row=14, column=1, sticky=tk.W, padx=5, pady=2)
+
+        # Output Layout
+        ttk.Label(master, text="Output Layout:").grid(row=15, column=0, sticky=tk.W, padx=5, pady=5)
+        self.output_layout = ttk.Combobox(master, values=OUTPUT_LAYOUTS, state="readonly")
+        self.output_layout.set("per_file")
+        self.output_layout.grid(row=15, column=1, padx=5, pady=5)
+
+        # Template Directory
+        ttk.Label(master, text="Template Directory:").grid(row=17, column=0, sticky=tk.W, padx=5, pady=5)
+        self.template_dir = ttk.Entry(master)
+        self.template_dir.grid(row=17, column=1, padx=5, pady=5)
+
+        # Watch Mode
+        self.watch_enabled = tk.BooleanVar(value=False)
+        self.watch_check = ttk.Checkbutton(master, text="Watch for schema changes", variable=self.watch_enabled, command=self.toggle_watch)
+        self.watch_check.grid(row=16, column=0, sticky=tk.W, padx=5, pady=5)
+        self.watch_interval = ttk.Entry(master)
+        self.watch_interval.insert(0, "2")
+        self.watch_interval.grid(row=16, column=1, padx=5, pady=5)
+        self.watcher = None
+
         # Generate Button
         self.generate_button = ttk.Button(master, text="Generate", command=self.generate_code)
-        self.generate_button.grid(row=13, column=0, columnspan=2, pady=10)
+        self.generate_button.grid(row=18, column=0, columnspan=2, pady=10)
+
+        # Table Selection
+        self.table_names = []
+        self.table_index = []
+        self.matching_tables = []
+        self.selected_tables = set()
+        self.shown_count = 0
+        self.search_job = None
+        tables_frame = ttk.LabelFrame(master, text="Tables")
+        tables_frame.grid(row=0, column=2, rowspan=19, sticky=tk.NSEW, padx=5, pady=5)
+        tables_frame.rowconfigure(1, weight=1)
+        tables_frame.columnconfigure(0, weight=1)
+        master.columnconfigure(2, weight=1)
+        self.table_search = tk.StringVar()
+        self.table_search.trace_add("write", self.schedule_table_search)
+        ttk.Entry(tables_frame, textvariable=self.table_search).grid(row=0, column=0, sticky=tk.EW, padx=5, pady=5)
+        self.table_search_regex = tk.BooleanVar(value=False)
+        ttk.Checkbutton(tables_frame, text="Regex", variable=self.table_search_regex, command=self.filter_tables).grid(row=0, column=1, padx=5, pady=5)
+        self.table_tree = ttk.Treeview(tables_frame, columns=("table",), show="headings", selectmode="extended")
+        self.table_tree.heading("table", text="Table")
+        self.table_tree.grid(row=1, column=0, sticky=tk.NSEW, padx=(5, 0))
+        self.table_tree.bind("<<TreeviewSelect>>", self.sync_table_selection)
+        self.table_scrollbar = ttk.Scrollbar(tables_frame, orient=tk.VERTICAL, command=self.table_tree.yview)
+        self.table_scrollbar.grid(row=1, column=1, sticky=tk.NS + tk.W)
+        self.table_tree.configure(yscrollcommand=self.on_table_scroll)
+        buttons_frame = ttk.Frame(tables_frame)
+        buttons_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW)
+        ttk.Button(buttons_frame, text="Load Tables", command=self.load_tables).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Select Matches", command=self.select_matching_tables).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Clear", command=self.clear_table_selection).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Preview", command=self.preview_table).pack(side=tk.LEFT, padx=5, pady=5)
+        self.table_status = ttk.Label(tables_frame, text="No tables loaded, all tables are generated")
+        self.table_status.grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
+
+        # Preview
+        self.previews = {}
+        self.preview_connection = None
+        preview_frame = ttk.LabelFrame(master, text="Preview")
+        preview_frame.grid(row=0, column=3, rowspan=19, sticky=tk.NSEW, padx=5, pady=5)
+        preview_frame.rowconfigure(0, weight=1)
+        preview_frame.columnconfigure(0, weight=1)
+        master.columnconfigure(3, weight=2)
+        self.preview_text = tk.Text(preview_frame, width=80, wrap=tk.NONE, state=tk.DISABLED)
+        self.preview_text.grid(row=0, column=0, sticky=tk.NSEW, padx=(5, 0), pady=5)
+        preview_scrollbar = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.preview_text.yview)
+        preview_scrollbar.grid(row=0, column=1, sticky=tk.NS, pady=5)
+        self.preview_text.configure(yscrollcommand=preview_scrollbar.set)
 
     def update_history_dropdown(self):
         history = self.history.get_history()
@@ -102,38 +185,185 @@ class ReversePocoGeneratorGUI:
             self.username.delete(0, tk.END)
             self.username.insert(0, selected_item['user'])
             self.password.delete(0, tk.END)
-            self.password.insert(0, selected_item['password'])
+            self.password.insert(0, self.history.get_password(selected_item))
             self.database.delete(0, tk.END)
             self.database.insert(0, selected_item['database'])
 
+    def get_connection_params(self):
+        db_type = self.db_type.get()
+        host = self.host.get()
+        port = self.port.get()
+        username = self.username.get()
+        password = self.password.get()
+        database = self.database.get()
+        if not all([db_type, host, port, username, password, database]):
+            raise ValueError("All connection fields must be filled")
+        return {
+            'db_type': db_type,
+            'host': host,
+            'port': int(port),
+            'user': username,
+            'password': password,
+            'database': database
+        }
+
+    def load_tables(self):
+        try:
+            db = connect(self.get_connection_params())
+            try:
+                self.table_names = read_table_names(db)
+            finally:
+                db.close()
+            self.table_index = [table_name.lower() for table_name in self.table_names]
+            self.selected_tables &= set(self.table_names)
+            self.previews = {}
+            logger.info(f"Loaded {len(self.table_names)} table names")
+            self.filter_tables()
+        except ValueError as e:
+            logger.error(f"Validation error: {str(e)}")
+            messagebox.showerror("Validation Error", str(e))
+        except Exception as e:
+            logger.exception("Failed to load tables:")
+            messagebox.showerror("Error", f"Failed to load tables: {str(e)}")
+
+    def schedule_table_search(self, *args):
+        # Filtering runs once typing pauses instead of on every keystroke.
+        if self.search_job is not None:
+            self.master.after_cancel(self.search_job)
+        self.search_job = self.master.after(SEARCH_DEBOUNCE_MS, self.filter_tables)
+
+    def filter_tables(self):
+        self.search_job = None
+        pattern = self.table_search.get()
+        if not pattern:
+            self.matching_tables = self.table_names
+        elif self.table_search_regex.get():
+            try:
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                return
+            self.matching_tables = [table_name for table_name in self.table_names if regex.search(table_name)]
+        else:
+            needle = pattern.lower()
+            self.matching_tables = [table_name for table_name, lowered in zip(self.table_names, self.table_index) if needle in lowered]
+        self.table_tree.delete(*self.table_tree.get_children())
+        self.shown_count = 0
+        self.show_more_tables()
+        self.update_table_status()
+
+    def show_more_tables(self):
+        # Only a page of rows exists in the tree at a time; the next page is
+        # inserted when the view is scrolled close to the bottom.
+        page = self.matching_tables[self.shown_count:self.shown_count + TABLE_PAGE_SIZE]
+        for table_name in page:
+            self.table_tree.insert("", tk.END, iid=table_name, values=(table_name,))
+        self.shown_count += len(page)
+        selected = [table_name for table_name in page if table_name in self.selected_tables]
+        if selected:
+            self.table_tree.selection_add(selected)
+
+    def on_table_scroll(self, first, last):
+        self.table_scrollbar.set(first, last)
+        if float(last) > 0.9 and self.shown_count < len(self.matching_tables):
+            self.show_more_tables()
+
+    def sync_table_selection(self, event):
+        shown = set(self.table_tree.get_children())
+        self.selected_tables = (self.selected_tables - shown) | set(self.table_tree.selection())
+        self.update_table_status()
+
+    def select_matching_tables(self):
+        self.selected_tables |= set(self.matching_tables)
+        self.table_tree.selection_add(self.table_tree.get_children())
+        self.update_table_status()
+
+    def clear_table_selection(self):
+        self.selected_tables = set()
+        self.table_tree.selection_remove(self.table_tree.selection())
+        self.update_table_status()
+
+    def update_table_status(self):
+        if self.selected_tables:
+            status = f"{len(self.selected_tables)} of {len(self.table_names)} tables selected"
+        else:
+            status = f"{len(self.matching_tables)} of {len(self.table_names)} tables shown, all tables are generated"
+        self.table_status.config(text=status)
+
+    def get_preview_connection(self, conn_params):
+        # The connection is kept open between previews of the same database.
+        key = tuple(sorted(conn_params.items()))
+        if self.preview_connection is None or self.preview_connection[0] != key:
+            self.close_preview_connection()
+            self.preview_connection = (key, connect(dict(conn_params)))
+        return self.preview_connection[1]
+
+    def close_preview_connection(self):
+        if self.preview_connection is not None:
+            try:
+                self.preview_connection[1].close()
+            except Exception as e:
+                logger.warning(f"Failed to close preview connection: {str(e)}")
+            self.preview_connection = None
+
+    def preview_table(self):
+        table_name = self.table_tree.focus() or next(iter(self.table_tree.selection()), None)
+        if not table_name:
+            messagebox.showwarning("Preview", "Select a table to preview")
+            return
+        try:
+            conn_params = self.get_connection_params()
+            namespace = self.namespace.get() or "Preview"
+            dbcontext_name = self.dbcontext_name.get() or "PreviewContext"
+            naming_convention = self.naming_convention.get()
+            configuration_style = self.config_style.get()
+            framework = self.framework.get()
+            template_paths = [self.template_dir.get()] if self.template_dir.get() else None
+            key = (tuple(sorted(conn_params.items())), table_name, namespace, dbcontext_name, naming_convention, configuration_style, framework,
+                   tuple(template_paths or ()))
+            preview = self.previews.get(key)
+            if preview is None:
+                # Only the one table is read, so the cost does not grow with the database.
+                db = self.get_preview_connection(conn_params)
+                schema = get_schema_reader(db, naming_convention).read_schema([table_name], procedures=False, external_references=True)
+                code_generator = CodeGenerator(schema, namespace, dbcontext_name, naming_convention, configuration_style, framework,
+                                               template_paths=template_paths, auto_reload=True)
+                preview = "\n".join(code_generator.generate_entities().values())
+                if configuration_style == 'fluent_api':
+                    preview += "\n" + code_generator.generate_dbcontext()
+                self.previews[key] = preview
+            self.show_preview(preview)
+        except ValueError as e:
+            logger.error(f"Validation error: {str(e)}")
+            messagebox.showerror("Validation Error", str(e))
+        except Exception as e:
+            logger.exception("Failed to render preview:")
+            self.close_preview_connection()
+            messagebox.showerror("Error", f"Failed to render preview: {str(e)}")
+
+    def show_preview(self, preview):
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.delete("1.0", tk.END)
+        self.preview_text.insert("1.0", preview)
+        self.preview_text.config(state=tk.DISABLED)
+
     def generate_code(self):
         try:
-            db_type = self.db_type.get()
-            host = self.host.get()
-            port = self.port.get()
-            username = self.username.get()
-            password = self.password.get()
-            database = self.database.get()
             namespace = self.namespace.get()
             dbcontext_name = self.dbcontext_name.get()
             naming_convention = self.naming_convention.get()
             configuration_style = self.config_style.get()
+            framework = self.framework.get()
+            template_paths = [self.template_dir.get()] if self.template_dir.get() else None
+            tables = sorted(self.selected_tables) or None
 
             # Validate input
-            if not all([db_type, host, port, username, password, database, namespace, dbcontext_name]):
+            conn_params = self.get_connection_params()
+            if not all([namespace, dbcontext_name]):
                 raise ValueError("All fields must be filled")
 
             # Connect to database
-            conn_params = {
-                'db_type': db_type,
-                'host': host,
-                'port': int(port),
-                'user': username,
-                'password': password,
-                'database': database
-            }
             logger.debug(f"Attempting to connect with parameters: {conn_params}")
-            db = connect(conn_params)
+            db = connect(dict(conn_params))
             logger.info("Database connection successful")
 
             # Add successful connection to history
@@ -145,42 +375,34 @@ class ReversePocoGeneratorGUI:
 
             # Read schema
             logger.debug("Attempting to read database schema")
-            schema = read_schema(db, naming_convention)
+            schema = read_schema(db, naming_convention, tables)
             logger.info("Schema read successfully")
 
             # Generate code
             logger.debug("Generating code")
-            code_generator = CodeGenerator(schema, namespace, dbcontext_name, naming_convention, configuration_style)
+            code_generator = CodeGenerator(schema, namespace, dbcontext_name, naming_convention, configuration_style, framework,
+                                           template_paths=template_paths, auto_reload=True)
             generated_code = code_generator.generate()
             logger.info("Code generated successfully")
 
-            # Create a directory to save the generated files
-            directory = filedialog.askdirectory(title="Select Directory to Save Generated Files")
-            if not directory:
+            # Choose where to save the generated files
+            output_layout = self.output_layout.get()
+            if output_layout == 'zip':
+                destination = filedialog.asksaveasfilename(title="Select Archive to Save Generated Files", defaultextension=".zip", filetypes=[("Zip archive", "*.zip")])
+            else:
+                destination = filedialog.askdirectory(title="Select Directory to Save Generated Files")
+            if not destination:
                 logger.warning("Code generation cancelled by user")
                 messagebox.showwarning("Cancelled", "Code generation was cancelled")
                 return
 
-            # Save each class to a separate file
-            for class_name, code in generated_code['entities'].items():
-                file_path = os.path.join(directory, f"{class_name}.cs")
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(code)
-                logger.info(f"Entity class {class_name} saved to {file_path}")
+            write_output(generated_code, destination, dbcontext_name, output_layout, groups=code_generator.entity_groups())
 
-            # Save DbContext to a separate file
-            dbcontext_file_path = os.path.join(directory, f"{dbcontext_name}.cs")
-            with open(dbcontext_file_path, 'w', encoding='utf-8') as f:
-                f.write(generated_code['dbcontext'])
-            logger.info(f"DbContext saved to {dbcontext_file_path}")
+            if self.watch_enabled.get():
+                regenerator = Regenerator(destination, namespace, dbcontext_name, naming_convention, configuration_style, output_layout, framework, template_paths)
+                self.start_watch(db, regenerator, naming_convention, schema, tables)
 
-            # Save stored procedures to a separate file
-            stored_procedures_file_path = os.path.join(directory, f"{dbcontext_name}StoredProcedures.cs")
-            with open(stored_procedures_file_path, 'w', encoding='utf-8') as f:
-                f.write(generated_code['stored_procedures'])
-            logger.info(f"Stored procedures saved to {stored_procedures_file_path}")
-
-            messagebox.showinfo("Success", f"Code generated successfully and saved to {directory}")
+            messagebox.showinfo("Success", f"Code generated successfully and saved to {destination}")
 
         except ValueError as e:
             logger.error(f"Validation error: {str(e)}")
@@ -190,4 +412,35 @@ class ReversePocoGeneratorGUI:
             messagebox.showerror("Connection Error", str(e))
         except Exception as e:
             logger.exception("An unexpected error occurred:")
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
\ No newline at end of file
+            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+
+    def start_watch(self, db, regenerator, naming_convention, schema, tables=None):
+        interval = float(self.watch_interval.get() or 2)
+        self.watcher = SchemaWatcher(db, regenerator, naming_convention, interval=interval, schema=schema, tables=tables)
+        logger.info(f"Watching schema every {interval}s")
+        self.master.after(int(interval * 1000), self.poll_watch)
+
+    def poll_watch(self):
+        # A poll may regenerate the whole output, so it runs on a worker thread
+        # and the Tk loop only checks for its result; Tk is not thread safe.
+        watcher = self.watcher
+        if watcher is None:
+            return
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(delay=watcher.poll()), daemon=True)
+        thread.start()
+        self.master.after(WATCH_CHECK_MS, self.finish_poll_watch, watcher, thread, result)
+
+    def finish_poll_watch(self, watcher, thread, result):
+        if thread.is_alive():
+            self.master.after(WATCH_CHECK_MS, self.finish_poll_watch, watcher, thread, result)
+            return
+        if self.watcher is not watcher:
+            # Watch mode was stopped or restarted while the poll was running.
+            return
+        self.master.after(int(result.get('delay', watcher.interval) * 1000), self.poll_watch)
+
+    def toggle_watch(self):
+        if not self.watch_enabled.get() and self.watcher is not None:
+            self.watcher = None
+            logger.info("Watch mode stopped")
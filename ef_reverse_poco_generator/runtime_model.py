@@ -0,0 +1,61 @@
+# runtime_model.py
+# Flattens the view model into what the EF Core compiled model templates emit:
+# one runtime entity type per entity class, instantiated once per table (several
+# times for a table family), with properties, keys and foreign keys resolved.
+from view_model import REFERENCE_TYPES
+
+# Single column keys of these types are generated by the database on insert,
+# which is the EF Core convention unless the key is also a foreign key.
+GENERATED_KEY_TYPES = {'int', 'long', 'short', 'Guid'}
+
+
+def variable_name(class_name):
+    # The suffix keeps the local clear of C# keywords, e.g. Event -> eventType.
+    return class_name[:1].lower() + class_name[1:] + 'Type'
+
+
+def entity_types(schema, view_model, relationships):
+    tables = schema['tables']
+    result = []
+    for table_name, table_info in tables.items():
+        table_view = view_model.table(table_name)
+        family_tables = table_info.get('family_tables')
+        foreign_key_columns = {column for fk in relationships.outgoing[table_name] for column in fk['columns']}
+        generated_key = (len(table_view['primary_key']) == 1 and not foreign_key_columns & set(table_info.get('primary_key', [])))
+        properties = []
+        for column in table_view['columns']:
+            # Value types are generated without '?' in the entity classes, so only
+            # reference type properties are nullable.
+            properties.append({
+                'property_name': column['property_name'],
+                'column_name': column['name'],
+                'csharp_type': column['csharp_type'],
+                'nullable': column['nullable'] and column['csharp_type'] in REFERENCE_TYPES and not column['primary_key'],
+                'primary_key': column['primary_key'],
+                'value_generated': generated_key and column['primary_key'] and column['csharp_type'] in GENERATED_KEY_TYPES,
+            })
+        foreign_keys = []
+        for fk in relationships.outgoing[table_name]:
+            # References to tables that were not read have no entity type to point to.
+            if fk['referenced_table'] not in tables:
+                continue
+            foreign_keys.append(dict(
+                fk,
+                number=len(foreign_keys) + 1,
+                referenced_properties=[view_model.format_name(column) for column in fk['referenced_columns']],
+                principal_variable=variable_name(fk['referenced_class']),
+            ))
+        class_name = table_view['class_name']
+        result.append({
+            'class_name': class_name,
+            'table_name': table_name,
+            'family_tables': family_tables,
+            'instances': [
+                {'variable': variable_name(view_model.format_name(mapped_table)), 'table_name': mapped_table}
+                for mapped_table in family_tables or [table_name]
+            ],
+            'properties': properties,
+            'primary_key': table_view['primary_key'],
+            'foreign_keys': foreign_keys,
+        })
+    return result
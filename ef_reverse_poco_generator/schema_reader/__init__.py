@@ -7,20 +7,29 @@ from .sqlite import SQLiteSchemaReader
 
 logger = logging.getLogger(__name__)
 
-def read_schema(db, naming_convention='original'):
+def get_schema_reader(db, naming_convention='original', **options):
     db_type = type(db).__name__
     logger.info(f"Reading schema for database type: {db_type}")
     logger.debug(f"DB object attributes: {dir(db)}")
     
     if db_type in ['MySQLConnection', 'CMySQLConnection']:
-        reader = MySQLSchemaReader(db, naming_convention)
+        reader = MySQLSchemaReader(db, naming_convention, **options)
     elif db_type == 'connection' and hasattr(db, 'info'):  # PostgreSQL
-        reader = PostgreSQLSchemaReader(db, naming_convention)
+        reader = PostgreSQLSchemaReader(db, naming_convention, **options)
     elif db_type == 'Connection' and hasattr(db, 'getinfo'):  # SQL Server
-        reader = SQLServerSchemaReader(db, naming_convention)
+        reader = SQLServerSchemaReader(db, naming_convention, **options)
     elif db_type == 'Connection' and hasattr(db, 'cursor'):  # SQLite
-        reader = SQLiteSchemaReader(db, naming_convention)
+        reader = SQLiteSchemaReader(db, naming_convention, **options)
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
     
-    return reader.read_schema()
\ No newline at end of file
+    return reader
+
+def read_schema(db, naming_convention='original', tables=None, **options):
+    return get_schema_reader(db, naming_convention, **options).read_schema(tables)
+
+def read_table_names(db):
+    return get_schema_reader(db).read_table_names()
+
+def read_fingerprint(db):
+    return get_schema_reader(db).read_fingerprint()
\ No newline at end of file
@@ -1,10 +1,62 @@
 # schema_reader/base.py
+import logging
 from abc import ABC, abstractmethod
 
+logger = logging.getLogger(__name__)
+
 class SchemaReader(ABC):
-    def __init__(self, db, naming_convention='original'):
+    fetch_batch_size = 1000
+    placeholder = '%s'
+    # Larger selections are filtered client-side to stay below driver and
+    # server parameter limits (2100 on SQL Server).
+    max_filter_parameters = 1000
+
+    def __init__(self, db, naming_convention='original', timeout=None, cancellation=None):
         self.db = db
         self.naming_convention = naming_convention
+        self.table_filter = None
+        # Seconds a single catalog query may run, enforced by the server where
+        # the dialect supports it.
+        self.timeout = timeout
+        self.cancellation = cancellation
+
+    def check_cancelled(self):
+        if self.cancellation is not None:
+            self.cancellation.raise_if_cancelled()
+
+    def cursor(self, *args, **kwargs):
+        self.check_cancelled()
+        return self.db.cursor(*args, **kwargs)
+
+    def iter_rows(self, cursor):
+        # Consume results in batches so huge catalogs never exist as one raw row
+        # list next to the model being built from them.
+        while True:
+            self.check_cancelled()
+            rows = cursor.fetchmany(self.fetch_batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def execute(self, cursor, query, params=()):
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+
+    def table_filter_clause(self, column):
+        # SQL condition restricting a catalog query to the selected tables, or an
+        # empty clause when every table is read.
+        if self.table_filter is None or len(self.table_filter) > self.max_filter_parameters:
+            return '', ()
+        if not self.table_filter:
+            return 'AND 1 = 0', ()
+        placeholders = ', '.join([self.placeholder] * len(self.table_filter))
+        return f"AND {column} IN ({placeholders})", tuple(self.table_filter)
+
+    def read_table_names(self):
+        # Names only, for pickers that list the catalog before anything is read.
+        return sorted(self.read_tables())
 
     @abstractmethod
     def read_tables(self):
@@ -26,29 +78,97 @@ class SchemaReader(ABC):
     def read_procedures(self):
         pass
 
-    def read_schema(self):
+    def read_procedure_results(self):
+        # Columns of the first result set of each procedure, for dialects that
+        # can describe them: {procedure_name: [{'name', 'type', 'nullable'}]}.
+        return {}
+
+    @abstractmethod
+    def read_fingerprint(self):
+        # A cheap catalog probe that changes whenever DDL is applied; used by
+        # watch mode to decide when the full schema has to be read again.
+        pass
+
+    def apply_timeout(self):
+        pass
+
+    def clear_timeout(self):
+        pass
+
+    def interrupt(self):
+        # Called from the cancelling thread to abort the statement in flight.
+        pass
+
+    def discard_results(self):
+        # A failed or cancelled read leaves no partial state on the connection.
+        try:
+            self.db.rollback()
+        except Exception as e:
+            logger.debug(f"Rollback after failed schema read failed: {str(e)}")
+
+    def read_schema(self, tables=None, procedures=True, external_references=False):
+        self.table_filter = sorted(set(tables)) if tables is not None else None
+        if self.cancellation is not None:
+            self.cancellation.register(self.interrupt)
+        try:
+            self.check_cancelled()
+            if self.timeout:
+                self.apply_timeout()
+            return self.assemble_schema(procedures, external_references)
+        except Exception:
+            self.discard_results()
+            # Driver errors caused by an interrupt surface as a cancellation.
+            self.check_cancelled()
+            raise
+        finally:
+            self.table_filter = None
+            if self.cancellation is not None:
+                self.cancellation.unregister(self.interrupt)
+            if self.timeout:
+                try:
+                    self.clear_timeout()
+                except Exception as e:
+                    logger.warning(f"Failed to clear the statement timeout: {str(e)}")
+
+    def assemble_schema(self, procedures=True, external_references=False):
         schema = {'tables': {}, 'procedures': {}}
-        
+        selected = set(self.table_filter) if self.table_filter is not None else None
+
         tables = self.read_tables()
         for table_name, table_info in tables.items():
+            if selected is not None and table_name not in selected:
+                continue
             schema['tables'][table_name] = {
                 'columns': [],
                 'foreign_keys': [],
                 'description': table_info.get('description', '')
             }
+            if table_info.get('schema'):
+                schema['tables'][table_name]['schema'] = table_info['schema']
 
         columns = self.read_columns()
         for table_name, table_columns in columns.items():
-            schema['tables'][table_name]['columns'] = table_columns
+            if table_name in schema['tables']:
+                schema['tables'][table_name]['columns'] = table_columns
 
         primary_keys = self.read_primary_keys()
         for table_name, pk_columns in primary_keys.items():
-            schema['tables'][table_name]['primary_key'] = pk_columns
+            if table_name in schema['tables']:
+                schema['tables'][table_name]['primary_key'] = pk_columns
 
         foreign_keys = self.read_foreign_keys()
         for table_name, fks in foreign_keys.items():
-            schema['tables'][table_name]['foreign_keys'] = fks
+            if table_name in schema['tables']:
+                if selected is not None and not external_references:
+                    # Relationships to tables outside the selection would reference
+                    # classes that are not generated.
+                    fks = [fk for fk in fks if fk['referenced_table'] in selected]
+                schema['tables'][table_name]['foreign_keys'] = fks
 
-        schema['procedures'] = self.read_procedures()
+        if procedures:
+            schema['procedures'] = self.read_procedures()
+            for procedure_name, result_columns in self.read_procedure_results().items():
+                if procedure_name in schema['procedures'] and result_columns:
+                    schema['procedures'][procedure_name]['result_columns'] = result_columns
 
-        return schema
\ No newline at end of file
+        return schema
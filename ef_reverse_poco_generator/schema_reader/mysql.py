@@ -1,55 +1,128 @@
 # schema_reader/mysql.py
+import time
+
 from .base import SchemaReader
 
 class MySQLSchemaReader(SchemaReader):
-    def __init__(self, db, naming_convention='original'):
-        super().__init__(db, naming_convention)
+    # Every INFORMATION_SCHEMA query opens the metadata of each table in the
+    # schema, so tables, columns and primary keys come from a single statement
+    # and procedures from another one joined with their parameters.
+    def __init__(self, db, naming_convention='original', timeout=None, cancellation=None, connect=None, checksum_interval=60.0):
+        super().__init__(db, naming_convention, timeout, cancellation)
+        self.table_details = None
+        # Opens a second connection to the same server: KILL QUERY has to come
+        # from outside the session running the statement.
+        self.connect = connect
+        # Seconds between the column and key checksums of read_fingerprint.
+        self.checksum_interval = checksum_interval
+        self.fingerprint_probe = None
+        self.checksums = None
+        self.checksummed_at = None
 
-    def read_tables(self):
-        cursor = self.db.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT 
-                TABLE_NAME, 
-                TABLE_COMMENT
-            FROM 
-                INFORMATION_SCHEMA.TABLES
-            WHERE 
-                TABLE_SCHEMA = DATABASE()
-        """)
-        tables = {row['TABLE_NAME']: {'description': row['TABLE_COMMENT']} for row in cursor.fetchall()}
+    def read_schema(self, tables=None, procedures=True, external_references=False):
+        self.table_details = None
+        return super().read_schema(tables, procedures, external_references)
+
+    def apply_timeout(self):
+        # Only applies to SELECT statements, which is all the reader runs.
+        cursor = self.db.cursor()
+        cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (int(self.timeout * 1000),))
         cursor.close()
-        return tables
 
-    def read_primary_keys(self):
-        cursor = self.db.cursor(dictionary=True)
+    def clear_timeout(self):
+        cursor = self.db.cursor()
+        cursor.execute("SET SESSION MAX_EXECUTION_TIME = DEFAULT")
+        cursor.close()
+
+    def interrupt(self):
+        if self.connect is None:
+            # Only drops the client socket; the statement keeps running on the
+            # server until MAX_EXECUTION_TIME and the connection cannot be reused.
+            self.db.shutdown()
+            return
+        connection = self.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"KILL QUERY {int(self.db.connection_id)}")
+            cursor.close()
+        finally:
+            connection.close()
+
+    def read_table_details(self):
+        if self.table_details is None:
+            cursor = self.cursor()
+            table_condition, params = self.table_filter_clause('c.TABLE_NAME')
+            self.execute(cursor, f"""
+                SELECT 
+                    c.TABLE_NAME,
+                    t.TABLE_COMMENT,
+                    c.COLUMN_NAME,
+                    c.DATA_TYPE,
+                    c.IS_NULLABLE,
+                    c.COLUMN_COMMENT,
+                    s.SEQ_IN_INDEX
+                FROM 
+                    INFORMATION_SCHEMA.COLUMNS c
+                JOIN 
+                    INFORMATION_SCHEMA.TABLES t ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+                LEFT JOIN 
+                    INFORMATION_SCHEMA.STATISTICS s ON s.TABLE_SCHEMA = c.TABLE_SCHEMA AND s.TABLE_NAME = c.TABLE_NAME
+                        AND s.COLUMN_NAME = c.COLUMN_NAME AND s.INDEX_NAME = 'PRIMARY'
+                WHERE 
+                    c.TABLE_SCHEMA = DATABASE()
+                    {table_condition}
+                ORDER BY 
+                    c.TABLE_NAME, c.ORDINAL_POSITION
+            """, params)
+            details = {}
+            for row in self.iter_rows(cursor):
+                table = details.get(row[0])
+                if table is None:
+                    table = details[row[0]] = {'description': row[1], 'columns': [], 'primary_key': []}
+                table['columns'].append({
+                    'name': row[2],
+                    'type': row[3],
+                    'nullable': row[4] == 'YES',
+                    'primary_key': row[6] is not None,
+                    'description': row[5]
+                })
+                if row[6] is not None:
+                    table['primary_key'].append((row[6], row[2]))
+            cursor.close()
+            for table in details.values():
+                table['primary_key'] = [column_name for _, column_name in sorted(table['primary_key'])]
+            self.table_details = details
+        return self.table_details
+
+    def read_table_names(self):
+        cursor = self.cursor()
         cursor.execute("""
             SELECT 
-                TABLE_NAME, 
-                COLUMN_NAME,
-                ORDINAL_POSITION
+                TABLE_NAME
             FROM 
-                INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+                INFORMATION_SCHEMA.TABLES
             WHERE 
                 TABLE_SCHEMA = DATABASE()
-                AND CONSTRAINT_NAME = 'PRIMARY'
             ORDER BY 
-                TABLE_NAME, ORDINAL_POSITION
+                TABLE_NAME
         """)
-        primary_keys = {}
-        for row in cursor.fetchall():
-            if row['TABLE_NAME'] not in primary_keys:
-                primary_keys[row['TABLE_NAME']] = []
-            primary_keys[row['TABLE_NAME']].append(row['COLUMN_NAME'])
+        table_names = [row[0] for row in self.iter_rows(cursor)]
         cursor.close()
-        return primary_keys
-    
+        return table_names
+
+    def read_tables(self):
+        return {table_name: {'description': table['description']} for table_name, table in self.read_table_details().items()}
+
+    def read_columns(self):
+        return {table_name: table['columns'] for table_name, table in self.read_table_details().items()}
+
     def read_primary_keys(self):
-        # Primary keys are already identified in read_columns for MySQL
-        return {}
+        return {table_name: table['primary_key'] for table_name, table in self.read_table_details().items() if table['primary_key']}
 
     def read_foreign_keys(self):
-        cursor = self.db.cursor(dictionary=True)
-        cursor.execute("""
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('TABLE_NAME')
+        self.execute(cursor, f"""
             SELECT 
                 TABLE_NAME, 
                 COLUMN_NAME, 
@@ -61,90 +134,87 @@ class MySQLSchemaReader(SchemaReader):
             WHERE 
                 REFERENCED_TABLE_SCHEMA = DATABASE() 
                 AND REFERENCED_TABLE_NAME IS NOT NULL
-        """)
+                {table_condition}
+            ORDER BY 
+                TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION
+        """, params)
         foreign_keys = {}
-        for row in cursor.fetchall():
-            if row['TABLE_NAME'] not in foreign_keys:
-                foreign_keys[row['TABLE_NAME']] = []
-            foreign_keys[row['TABLE_NAME']].append({
-                'column': row['COLUMN_NAME'],
-                'referenced_table': row['REFERENCED_TABLE_NAME'],
-                'referenced_column': row['REFERENCED_COLUMN_NAME'],
-                'description': f"Foreign key constraint {row['CONSTRAINT_NAME']} referencing {row['REFERENCED_TABLE_NAME']}.{row['REFERENCED_COLUMN_NAME']}"
+        for row in self.iter_rows(cursor):
+            if row[0] not in foreign_keys:
+                foreign_keys[row[0]] = []
+            foreign_keys[row[0]].append({
+                'column': row[1],
+                'referenced_table': row[2],
+                'referenced_column': row[3],
+                'constraint_name': row[4],
+                'description': f"Foreign key constraint {row[4]} referencing {row[2]}.{row[3]}"
             })
         cursor.close()
         return foreign_keys
 
 
-    def read_procedures(self):
-        cursor = self.db.cursor(dictionary=True)
+    def read_fingerprint(self):
+        # Table creation and routine alteration times are the cheap probe, run on
+        # every poll. In-place and INSTANT ALTER TABLE keep CREATE_TIME, so columns
+        # and keys are also summed into order independent checksums. Those scan
+        # COLUMNS and KEY_COLUMN_USAGE, which opens the metadata of every table
+        # (every .frm file on 5.7), so they are only recomputed when the probe
+        # changes or checksum_interval seconds have passed.
+        cursor = self.cursor()
         cursor.execute("""
             SELECT 
-                ROUTINE_NAME, 
-                ROUTINE_DEFINITION,
-                ROUTINE_COMMENT
-            FROM 
-                INFORMATION_SCHEMA.ROUTINES
-            WHERE 
-                ROUTINE_SCHEMA = DATABASE() 
-                AND ROUTINE_TYPE = 'PROCEDURE'
+                (SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE()),
+                (SELECT MAX(CREATE_TIME) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE()),
+                (SELECT MAX(LAST_ALTERED) FROM INFORMATION_SCHEMA.ROUTINES WHERE ROUTINE_SCHEMA = DATABASE())
         """)
-        procedures = {row['ROUTINE_NAME']: {
-            'definition': row['ROUTINE_DEFINITION'],
-            'description': row['ROUTINE_COMMENT'],
-            'parameters': self.read_procedure_parameters(row['ROUTINE_NAME'])
-        } for row in cursor.fetchall()}
+        # fetchall reads the result to its end, so the cursor can run the checksums.
+        row = cursor.fetchall()[0]
+        probe = (row[0], str(row[1]), str(row[2]))
+        now = time.monotonic()
+        if probe != self.fingerprint_probe or self.checksums is None or now - self.checksummed_at >= self.checksum_interval:
+            cursor.execute("""
+                SELECT 
+                    (SELECT COALESCE(SUM(CRC32(CONCAT_WS(':', TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, ORDINAL_POSITION))), 0)
+                     FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE()),
+                    (SELECT COALESCE(SUM(CRC32(CONCAT_WS(':', TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME))), 0)
+                     FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = DATABASE())
+            """)
+            row = cursor.fetchone()
+            self.fingerprint_probe = probe
+            self.checksums = (int(row[0]), int(row[1]))
+            self.checksummed_at = now
         cursor.close()
-        return procedures
+        return probe + self.checksums
 
-    def read_procedure_parameters(self, procedure_name):
-        cursor = self.db.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT 
-                PARAMETER_NAME,
-                DATA_TYPE,
-                PARAMETER_MODE
-            FROM 
-                INFORMATION_SCHEMA.PARAMETERS
-            WHERE 
-                SPECIFIC_SCHEMA = DATABASE()
-                AND SPECIFIC_NAME = %s
-            ORDER BY 
-                ORDINAL_POSITION
-        """, (procedure_name,))
-        parameters = [{'name': row['PARAMETER_NAME'], 'type': row['DATA_TYPE'], 'mode': row['PARAMETER_MODE']}
-                      for row in cursor.fetchall()]
-        cursor.close()
-        return parameters
-    
-    def read_columns(self):
-        cursor = self.db.cursor(dictionary=True)
+    # MySQL keeps no description of procedure result sets, so procedures are
+    # generated without result classes (see read_procedure_results).
+    def read_procedures(self):
+        cursor = self.cursor()
         cursor.execute("""
             SELECT 
-                TABLE_NAME,
-                COLUMN_NAME,
-                DATA_TYPE,
-                IS_NULLABLE,
-                COLUMN_KEY,
-                COLUMN_COMMENT
+                r.ROUTINE_NAME, 
+                r.ROUTINE_DEFINITION,
+                r.ROUTINE_COMMENT,
+                p.PARAMETER_NAME,
+                p.DATA_TYPE,
+                p.PARAMETER_MODE
             FROM 
-                INFORMATION_SCHEMA.COLUMNS
+                INFORMATION_SCHEMA.ROUTINES r
+            LEFT JOIN 
+                INFORMATION_SCHEMA.PARAMETERS p ON p.SPECIFIC_SCHEMA = r.ROUTINE_SCHEMA AND p.SPECIFIC_NAME = r.SPECIFIC_NAME
+                    AND p.ROUTINE_TYPE = 'PROCEDURE'
             WHERE 
-                TABLE_SCHEMA = DATABASE()
+                r.ROUTINE_SCHEMA = DATABASE() 
+                AND r.ROUTINE_TYPE = 'PROCEDURE'
             ORDER BY 
-                TABLE_NAME, ORDINAL_POSITION
+                r.ROUTINE_NAME, p.ORDINAL_POSITION
         """)
-        columns = {}
-        for row in cursor.fetchall():
-            table_name = row['TABLE_NAME']
-            if table_name not in columns:
-                columns[table_name] = []
-            columns[table_name].append({
-                'name': row['COLUMN_NAME'],
-                'type': row['DATA_TYPE'],
-                'nullable': row['IS_NULLABLE'] == 'YES',
-                'primary_key': row['COLUMN_KEY'] == 'PRI',
-                'description': row['COLUMN_COMMENT']
-            })
+        procedures = {}
+        for row in self.iter_rows(cursor):
+            procedure = procedures.get(row[0])
+            if procedure is None:
+                procedure = procedures[row[0]] = {'definition': row[1], 'description': row[2], 'parameters': []}
+            if row[3] is not None:
+                procedure['parameters'].append({'name': row[3], 'type': row[4], 'mode': row[5]})
         cursor.close()
-        return columns
\ No newline at end of file
+        return procedures
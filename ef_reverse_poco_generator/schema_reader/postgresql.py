@@ -2,44 +2,99 @@
 from .base import SchemaReader
 
 class PostgreSQLSchemaReader(SchemaReader):
-    def read_tables(self):
+    # All catalog reads go straight to pg_catalog by OID. The information_schema
+    # views are slow on large catalogs, and joining them on constraint_name alone
+    # mis-pairs composite and same-named constraints.
+    relation_kinds = "('r', 'p', 'v', 'f')"
+
+    def __init__(self, db, naming_convention='original', include_partitions=False, timeout=None, cancellation=None):
+        super().__init__(db, naming_convention, timeout, cancellation)
+        # Child partitions repeat the columns of their partitioned parent, which
+        # is read instead unless they are asked for.
+        self.include_partitions = include_partitions
+
+    def partition_condition(self):
+        return '' if self.include_partitions else 'AND NOT c.relispartition'
+
+    def apply_timeout(self):
         cursor = self.db.cursor()
-        cursor.execute("""
+        cursor.execute("SET statement_timeout = %s", (int(self.timeout * 1000),))
+        cursor.close()
+
+    def clear_timeout(self):
+        cursor = self.db.cursor()
+        cursor.execute("RESET statement_timeout")
+        cursor.close()
+
+    def interrupt(self):
+        self.db.cancel()
+
+    def read_tables(self):
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('c.relname')
+        self.execute(cursor, f"""
             SELECT 
-                table_name,
-                obj_description(('"' || table_schema || '"."' || table_name || '"')::regclass, 'pg_class') as table_description
+                c.relname,
+                d.description
             FROM 
-                information_schema.tables
+                pg_class c
+            JOIN 
+                pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN 
+                pg_description d ON d.objoid = c.oid AND d.classoid = 'pg_class'::regclass AND d.objsubid = 0
             WHERE 
-                table_schema = 'public'
-        """)
-        tables = {row[0]: {'description': row[1] or ''} for row in cursor.fetchall()}
+                n.nspname = 'public'
+                AND c.relkind IN {self.relation_kinds}
+                {self.partition_condition()}
+                {table_condition}
+        """, params)
+        tables = {row[0]: {'description': row[1] or ''} for row in self.iter_rows(cursor)}
         cursor.close()
         return tables
 
     def read_columns(self):
-        cursor = self.db.cursor()
-        cursor.execute("""
+        # A named cursor keeps the result set on the server and streams it in batches.
+        cursor = self.cursor(name='ef_poco_columns', withhold=self.db.autocommit)
+        cursor.itersize = self.fetch_batch_size
+        table_condition, params = self.table_filter_clause('c.relname')
+        self.execute(cursor, f"""
             SELECT 
-                table_name,
-                column_name,
-                data_type,
-                is_nullable,
-                column_default,
-                col_description(('"' || table_schema || '"."' || table_name || '"')::regclass, ordinal_position) as column_description
+                c.relname,
+                a.attname,
+                format_type(CASE WHEN t.typtype = 'd' THEN t.typbasetype ELSE a.atttypid END, NULL),
+                NOT a.attnotnull,
+                pg_get_expr(ad.adbin, ad.adrelid),
+                d.description
             FROM 
-                information_schema.columns
+                pg_attribute a
+            JOIN 
+                pg_class c ON c.oid = a.attrelid
+            JOIN 
+                pg_namespace n ON n.oid = c.relnamespace
+            JOIN 
+                pg_type t ON t.oid = a.atttypid
+            LEFT JOIN 
+                pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+            LEFT JOIN 
+                pg_description d ON d.objoid = a.attrelid AND d.classoid = 'pg_class'::regclass AND d.objsubid = a.attnum
             WHERE 
-                table_schema = 'public'
-        """)
+                n.nspname = 'public'
+                AND c.relkind IN {self.relation_kinds}
+                {self.partition_condition()}
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+                {table_condition}
+            ORDER BY 
+                c.relname, a.attnum
+        """, params)
         columns = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             if row[0] not in columns:
                 columns[row[0]] = []
             columns[row[0]].append({
                 'name': row[1],
                 'type': row[2],
-                'nullable': row[3] == 'YES',
+                'nullable': row[3],
                 'default': row[4],
                 'description': row[5] or ''
             })
@@ -47,26 +102,32 @@ class PostgreSQLSchemaReader(SchemaReader):
         return columns
 
     def read_primary_keys(self):
-        cursor = self.db.cursor()
-        cursor.execute("""
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('c.relname')
+        self.execute(cursor, f"""
             SELECT 
-                tc.table_name, 
-                kcu.column_name,
-                kcu.ordinal_position
+                c.relname,
+                a.attname
             FROM 
-                information_schema.table_constraints tc
+                pg_constraint con
+            JOIN 
+                pg_class c ON c.oid = con.conrelid
             JOIN 
-                information_schema.key_column_usage kcu
-            ON 
-                tc.constraint_name = kcu.constraint_name
+                pg_namespace n ON n.oid = c.relnamespace
+            CROSS JOIN LATERAL 
+                unnest(con.conkey) WITH ORDINALITY AS k(attnum, ordinal)
+            JOIN 
+                pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
             WHERE 
-                tc.constraint_type = 'PRIMARY KEY'
-                AND tc.table_schema = 'public'
+                con.contype = 'p'
+                AND n.nspname = 'public'
+                {self.partition_condition()}
+                {table_condition}
             ORDER BY 
-                tc.table_name, kcu.ordinal_position
-        """)
+                c.relname, k.ordinal
+        """, params)
         primary_keys = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             if row[0] not in primary_keys:
                 primary_keys[row[0]] = []
             primary_keys[row[0]].append(row[1])
@@ -74,43 +135,84 @@ class PostgreSQLSchemaReader(SchemaReader):
         return primary_keys
     
     def read_foreign_keys(self):
-        cursor = self.db.cursor()
-        cursor.execute("""
+        # conkey and confkey are unnested together, so every column is paired with
+        # the referenced column at the same position of the same constraint.
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('c.relname')
+        # A key referencing a partitioned table is cloned for each of its partitions
+        # (conparentid points at the original); without partitions both the clones
+        # and keys referencing a partition directly would point at unread tables.
+        referenced_condition = '' if self.include_partitions else 'AND con.conparentid = 0 AND NOT rc.relispartition'
+        self.execute(cursor, f"""
             SELECT
-                tc.table_name, 
-                kcu.column_name, 
-                ccu.table_name AS foreign_table_name,
-                ccu.column_name AS foreign_column_name,
-                tc.constraint_name
+                c.relname,
+                a.attname,
+                rc.relname,
+                ra.attname,
+                con.conname
             FROM 
-                information_schema.table_constraints AS tc 
+                pg_constraint con
+            JOIN 
+                pg_class c ON c.oid = con.conrelid
+            JOIN 
+                pg_namespace n ON n.oid = c.relnamespace
+            JOIN 
+                pg_class rc ON rc.oid = con.confrelid
+            CROSS JOIN LATERAL 
+                unnest(con.conkey, con.confkey) WITH ORDINALITY AS k(attnum, referenced_attnum, ordinal)
             JOIN 
-                information_schema.key_column_usage AS kcu
-            ON 
-                tc.constraint_name = kcu.constraint_name
+                pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
             JOIN 
-                information_schema.constraint_column_usage AS ccu
-            ON 
-                ccu.constraint_name = tc.constraint_name
+                pg_attribute ra ON ra.attrelid = con.confrelid AND ra.attnum = k.referenced_attnum
             WHERE 
-                tc.constraint_type = 'FOREIGN KEY'
-                AND tc.table_schema = 'public'
-        """)
+                con.contype = 'f'
+                AND n.nspname = 'public'
+                {self.partition_condition()}
+                {referenced_condition}
+                {table_condition}
+            ORDER BY 
+                c.relname, con.conname, k.ordinal
+        """, params)
         foreign_keys = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             if row[0] not in foreign_keys:
                 foreign_keys[row[0]] = []
             foreign_keys[row[0]].append({
                 'column': row[1],
                 'referenced_table': row[2],
                 'referenced_column': row[3],
+                'constraint_name': row[4],
                 'description': f"Foreign key constraint {row[4]} referencing {row[2]}.{row[3]}"
             })
         cursor.close()
         return foreign_keys
 
+    def read_fingerprint(self):
+        # A catalog row changed by DDL gets a new xmin, but only the rows that
+        # describe what changed are rewritten: column renames, type and NOT NULL
+        # changes and dropped columns only touch pg_attribute, comments only
+        # pg_description. Every catalog the generated code depends on is probed.
+        cursor = self.cursor()
+        cursor.execute("""
+            SELECT 
+                (SELECT count(*) FROM pg_class WHERE relnamespace = ns.oid),
+                (SELECT max(xmin::text::bigint) FROM pg_class WHERE relnamespace = ns.oid),
+                (SELECT max(a.xmin::text::bigint) FROM pg_attribute a JOIN pg_class c ON c.oid = a.attrelid WHERE c.relnamespace = ns.oid),
+                (SELECT max(xmin::text::bigint) FROM pg_constraint WHERE connamespace = ns.oid),
+                (SELECT max(xmin::text::bigint) FROM pg_proc WHERE pronamespace = ns.oid),
+                (SELECT max(d.xmin::text::bigint) FROM pg_description d JOIN pg_class c ON c.oid = d.objoid
+                    WHERE d.classoid = 'pg_class'::regclass AND c.relnamespace = ns.oid)
+            FROM 
+                pg_namespace ns
+            WHERE 
+                ns.nspname = 'public'
+        """)
+        row = cursor.fetchone()
+        cursor.close()
+        return tuple(row) if row else None
+
     def read_procedures(self):
-        cursor = self.db.cursor()
+        cursor = self.cursor()
         cursor.execute("""
             SELECT 
                 p.proname AS procedure_name,
@@ -119,13 +221,13 @@ class PostgreSQLSchemaReader(SchemaReader):
             FROM 
                 pg_proc p
             LEFT JOIN 
-                pg_description d ON p.oid = d.objoid
+                pg_description d ON d.objoid = p.oid AND d.classoid = 'pg_proc'::regclass AND d.objsubid = 0
             WHERE 
                 p.pronamespace = (SELECT oid FROM pg_namespace WHERE nspname = 'public')
                 AND p.prokind = 'p'
         """)
         procedures = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             procedure_name = row[0]
             procedures[procedure_name] = {
                 'definition': row[1],
@@ -135,8 +237,40 @@ class PostgreSQLSchemaReader(SchemaReader):
         cursor.close()
         return procedures
 
+    def read_procedure_results(self):
+        # A procedure returns its OUT and INOUT arguments as one row. Functions,
+        # including RETURNS TABLE ones, are not read as procedures, so their
+        # result columns are not either. All procedures are read in one query.
+        cursor = self.cursor()
+        cursor.execute("""
+            SELECT 
+                p.proname,
+                a.name,
+                format_type(a.type, NULL),
+                a.ordinal
+            FROM 
+                pg_proc p
+            CROSS JOIN LATERAL 
+                unnest(p.proallargtypes, p.proargmodes, p.proargnames) WITH ORDINALITY AS a(type, mode, name, ordinal)
+            WHERE 
+                p.pronamespace = (SELECT oid FROM pg_namespace WHERE nspname = 'public')
+                AND p.prokind = 'p'
+                AND a.mode IN ('o', 'b')
+            ORDER BY 
+                p.proname, a.ordinal
+        """)
+        procedure_results = {}
+        for row in self.iter_rows(cursor):
+            procedure_results.setdefault(row[0], []).append({
+                'name': row[1] or f"column{row[3]}",
+                'type': row[2],
+                'nullable': True
+            })
+        cursor.close()
+        return procedure_results
+
     def read_procedure_parameters(self, procedure_name):
-        cursor = self.db.cursor()
+        cursor = self.cursor()
         cursor.execute("""
             SELECT 
                 p.proargnames AS parameter_names,
@@ -164,7 +298,7 @@ class PostgreSQLSchemaReader(SchemaReader):
             type_oid = parameter_types[i]
             
             # Get the type name from the type OID
-            cursor = self.db.cursor()
+            cursor = self.cursor()
             cursor.execute("SELECT typname FROM pg_type WHERE oid = %s", (type_oid,))
             type_name = cursor.fetchone()[0]
             cursor.close()
@@ -1,58 +1,306 @@
 # schema_reader/sqlite.py
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import pathname2url
 from .base import SchemaReader
 
+logger = logging.getLogger(__name__)
+
+def open_sqlite(database, read_only=False, immutable=False, mmap_size=None):
+    # Connections may be handed to a worker thread, e.g. by the GUI watch poll,
+    # and are never used by two threads at once.
+    if read_only or immutable:
+        # mode=ro never takes write locks; immutable=1 additionally skips locking
+        # and change detection entirely, for files nobody is writing to.
+        options = 'mode=ro&immutable=1' if immutable else 'mode=ro'
+        connection = sqlite3.connect(f"file:{pathname2url(os.path.abspath(database))}?{options}", uri=True, check_same_thread=False)
+    else:
+        connection = sqlite3.connect(database, check_same_thread=False)
+    if mmap_size:
+        connection.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    return connection
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+# Common SQLite spellings mapped to the names the type mapping understands.
+# SQLite stores every REAL as an 8-byte float, and TIMESTAMP holds a date, not a
+# row version as on SQL Server.
+SQLITE_TYPE_ALIASES = {
+    'integer': 'bigint',
+    'real': 'double',
+    'float': 'double',
+    'boolean': 'bit',
+    'bool': 'bit',
+    'blob': 'varbinary',
+    'clob': 'text',
+    'double precision': 'double',
+    'timestamp': 'datetime',
+}
+KNOWN_TYPES = {
+    'int', 'bigint', 'smallint', 'tinyint', 'varchar', 'nvarchar', 'char', 'text', 'datetime', 'date', 'time',
+    'bit', 'decimal', 'double', 'varbinary', 'binary',
+}
+
+def column_affinity(declared_type):
+    # Affinity rules from https://www.sqlite.org/datatype3.html, in order.
+    declared_type = declared_type.upper()
+    if 'INT' in declared_type:
+        return 'INTEGER'
+    if 'CHAR' in declared_type or 'CLOB' in declared_type or 'TEXT' in declared_type:
+        return 'TEXT'
+    if 'BLOB' in declared_type or not declared_type:
+        return 'BLOB'
+    if 'REAL' in declared_type or 'FLOA' in declared_type or 'DOUB' in declared_type:
+        return 'REAL'
+    return 'NUMERIC'
+
+def declared_type_name(declared_type):
+    # VARCHAR(255) -> varchar, UNSIGNED BIG INT -> unsigned big int
+    return re.sub(r'\s+', ' ', re.sub(r'\(.*?\)', '', declared_type)).strip().lower()
+
+def resolve_declared_type(declared_type):
+    # Returns the type for a declaration that is unambiguous on its own, or None
+    # when only the stored values can tell (untyped and NUMERIC affinity columns).
+    name = declared_type_name(declared_type)
+    name = SQLITE_TYPE_ALIASES.get(name, name)
+    if name in KNOWN_TYPES:
+        return name
+    affinity = column_affinity(name)
+    if affinity == 'INTEGER':
+        return 'bigint'
+    if affinity == 'TEXT':
+        return 'text'
+    if affinity == 'REAL':
+        return 'double'
+    if affinity == 'BLOB' and name:
+        return 'varbinary'
+    return None
+
+def resolve_sampled_type(declared_type, storage_classes):
+    storage_classes = set(storage_classes) - {'null', ''}
+    numeric = column_affinity(declared_type_name(declared_type)) == 'NUMERIC'
+    if storage_classes == {'integer'}:
+        return 'bigint'
+    if storage_classes and storage_classes <= {'integer', 'real'}:
+        return 'decimal' if numeric else 'double'
+    if storage_classes == {'text'}:
+        return 'text'
+    if storage_classes == {'blob'}:
+        return 'varbinary'
+    if not storage_classes and numeric:
+        return 'decimal'
+    # Mixed storage classes or no values at all: keep the declaration.
+    return declared_type
+
 class SQLiteSchemaReader(SchemaReader):
+    placeholder = '?'
+    # Virtual machine instructions between two progress handler calls.
+    progress_interval = 10000
+
+    def __init__(self, db, naming_convention='original', workers=1, immutable=False, mmap_size=None, timeout=None, cancellation=None,
+                 infer_types=False, sample_rows=1000):
+        super().__init__(db, naming_convention, timeout, cancellation)
+        self.workers = workers
+        self.immutable = immutable
+        self.mmap_size = mmap_size
+        # With infer_types, declared types are resolved through the affinity
+        # rules and ambiguous columns are typed from the first sample_rows rows.
+        self.infer_types = infer_types
+        self.sample_rows = sample_rows
+        self.table_details = None
+        self.deadline = None
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def read_schema(self, tables=None, procedures=True, external_references=False):
+        # SQLite has no statement timeout, so the timeout bounds the whole read.
+        self.table_details = None
+        self.deadline = time.monotonic() + self.timeout if self.timeout else None
+        self.watch_connection(self.db)
+        try:
+            return super().read_schema(tables, procedures, external_references)
+        except sqlite3.OperationalError as e:
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                raise TimeoutError(f"Schema read exceeded {self.timeout} seconds") from e
+            raise
+        finally:
+            self.db.set_progress_handler(None, 0)
+            self.deadline = None
+
+    def watch_connection(self, connection):
+        # A non-zero return from the progress handler aborts the running statement.
+        if self.deadline is not None or self.cancellation is not None:
+            connection.set_progress_handler(self.should_abort, self.progress_interval)
+
+    def should_abort(self):
+        if self.cancellation is not None and self.cancellation.cancelled:
+            return 1
+        return 1 if self.deadline is not None and time.monotonic() > self.deadline else 0
+
+    def interrupt(self):
+        self.db.interrupt()
+        with self.lock:
+            for connection in self.connections:
+                connection.interrupt()
+
     def read_tables(self):
-        cursor = self.db.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = {row[0]: {'description': ''} for row in cursor.fetchall()}  # SQLite doesn't support table comments natively
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('name')
+        self.execute(cursor, f"SELECT name FROM sqlite_master WHERE type='table' {table_condition}", params)
+        tables = {row[0]: {'description': ''} for row in self.iter_rows(cursor)}  # SQLite doesn't support table comments natively
         cursor.close()
         return tables
 
+    def read_table_details(self):
+        # Runs the per-table pragmas once and shares the rows between
+        # read_columns, read_primary_keys and read_foreign_keys.
+        if self.table_details is None:
+            table_names = list(self.read_tables().keys())
+            database_file = self.database_file()
+            if self.workers > 1 and len(table_names) > 1 and database_file:
+                chunks = [table_names[i::self.workers] for i in range(self.workers)]
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    results = executor.map(lambda chunk: self.read_details_from_file(database_file, chunk), chunks)
+                details = {}
+                for result in results:
+                    details.update(result)
+                self.table_details = {table_name: details[table_name] for table_name in table_names}
+            else:
+                self.table_details = self.read_details(self.db, table_names)
+        return self.table_details
+
+    def database_file(self):
+        cursor = self.cursor()
+        cursor.execute("PRAGMA database_list")
+        database_file = next((row[2] for row in self.iter_rows(cursor) if row[1] == 'main'), '')
+        cursor.close()
+        return database_file
+
+    def read_details_from_file(self, database_file, table_names):
+        # Each worker thread gets its own read-only connection; sqlite3 releases
+        # the GIL while stepping statements, so pragma reads overlap.
+        connection = open_sqlite(database_file, read_only=True, immutable=self.immutable, mmap_size=self.mmap_size)
+        self.watch_connection(connection)
+        with self.lock:
+            self.connections.append(connection)
+        try:
+            return self.read_details(connection, table_names)
+        finally:
+            with self.lock:
+                self.connections.remove(connection)
+            connection.close()
+
+    def read_details(self, connection, table_names):
+        cursor = connection.cursor()
+        details = {}
+        for table_name in table_names:
+            self.check_cancelled()
+            cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+            columns = list(self.iter_rows(cursor))
+            cursor.execute(f"PRAGMA foreign_key_list({quote_identifier(table_name)})")
+            foreign_keys = list(self.iter_rows(cursor))
+            types = self.infer_column_types(cursor, table_name, columns) if self.infer_types else {}
+            details[table_name] = (columns, foreign_keys, types)
+        cursor.close()
+        return details
+
+    def infer_column_types(self, cursor, table_name, columns):
+        types = {}
+        sampled = []
+        for column in columns:
+            resolved = resolve_declared_type(column[2])
+            if resolved is None:
+                sampled.append(column)
+            else:
+                types[column[1]] = resolved
+        if sampled:
+            # One bounded query per table: the storage classes found in the first
+            # rows, never a full scan.
+            selected = ', '.join(quote_identifier(column[1]) for column in sampled)
+            aggregates = ', '.join(f"group_concat(DISTINCT typeof({quote_identifier(column[1])}))" for column in sampled)
+            cursor.execute(f"SELECT {aggregates} FROM (SELECT {selected} FROM {quote_identifier(table_name)} LIMIT ?)", (self.sample_rows,))
+            row = cursor.fetchone()
+            for column, storage_classes in zip(sampled, row):
+                types[column[1]] = resolve_sampled_type(column[2], (storage_classes or '').split(','))
+        return types
+
     def read_columns(self):
-        cursor = self.db.cursor()
         columns = {}
-        for table_name in self.read_tables().keys():
-            cursor.execute(f"PRAGMA table_info({table_name})")
+        for table_name, (table_columns, _, types) in self.read_table_details().items():
             columns[table_name] = []
-            for column in cursor.fetchall():
-                columns[table_name].append({
+            for column in table_columns:
+                column_info = {
                     'name': column[1],
                     'type': column[2],
                     'nullable': not column[3],
                     'primary_key': column[5] == 1,
                     'description': ''  # SQLite doesn't support column comments natively
-                })
-        cursor.close()
+                }
+                if self.infer_types:
+                    column_info['declared_type'] = column[2]
+                    column_info['type'] = types[column[1]]
+                columns[table_name].append(column_info)
         return columns
 
     def read_primary_keys(self):
-        cursor = self.db.cursor()
         primary_keys = {}
-        for table_name in self.read_tables().keys():
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            pk_columns = [column[1] for column in cursor.fetchall() if column[5] != 0]  # column[5] is the pk flag
+        for table_name, (table_columns, _, _) in self.read_table_details().items():
+            pk_columns = [column[1] for column in table_columns if column[5] != 0]  # column[5] is the pk flag
             if pk_columns:
                 primary_keys[table_name] = pk_columns
-        cursor.close()
         return primary_keys
 
+    def referenced_key(self, table_name):
+        # Primary key columns in key order (column[5] is the position in the key).
+        table_details = self.read_table_details()
+        if table_name in table_details:
+            columns = table_details[table_name][0]
+        else:
+            cursor = self.cursor()
+            cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+            columns = list(self.iter_rows(cursor))
+            cursor.close()
+        return [column[1] for column in sorted(columns, key=lambda column: column[5]) if column[5]]
+
     def read_foreign_keys(self):
-        cursor = self.db.cursor()
         foreign_keys = {}
-        for table_name in self.read_tables().keys():
-            cursor.execute(f"PRAGMA foreign_key_list({table_name})")
+        referenced_keys = {}
+        for table_name, (_, table_foreign_keys, _) in self.read_table_details().items():
             foreign_keys[table_name] = []
-            for fk in cursor.fetchall():
+            for fk in table_foreign_keys:
+                referenced_column = fk[4]
+                if referenced_column is None:
+                    # REFERENCES parent without columns targets the primary key of parent;
+                    # fk[1] is the position of the column within the constraint.
+                    if fk[2] not in referenced_keys:
+                        referenced_keys[fk[2]] = self.referenced_key(fk[2])
+                    key = referenced_keys[fk[2]]
+                    if fk[1] >= len(key):
+                        logger.warning(f"Skipping foreign key of {table_name}.{fk[3]}: {fk[2]} has no matching primary key column")
+                        continue
+                    referenced_column = key[fk[1]]
                 foreign_keys[table_name].append({
                     'column': fk[3],
                     'referenced_table': fk[2],
-                    'referenced_column': fk[4],
-                    'description': f"Foreign key constraint referencing {fk[2]}.{fk[4]}"
+                    'referenced_column': referenced_column,
+                    'constraint_name': f"FK_{table_name}_{fk[0]}",  # fk[0] is shared by the columns of a composite key
+                    'description': f"Foreign key constraint referencing {fk[2]}.{referenced_column}"
                 })
-        cursor.close()
         return foreign_keys
 
     def read_procedures(self):
         # SQLite doesn't support stored procedures
-        return {}
\ No newline at end of file
+        return {}
+
+    def read_fingerprint(self):
+        cursor = self.cursor()
+        cursor.execute("PRAGMA schema_version")
+        fingerprint = cursor.fetchone()[0]
+        cursor.close()
+        return fingerprint
@@ -1,25 +1,267 @@
 # schema_reader/sqlserver.py
+import math
 from .base import SchemaReader
 
+# One round trip for the whole catalog: every result set is keyed by object_id
+# and column_id, names are resolved once on the client. Every set joins the same
+# objects as the table and procedure sets so each id resolves: table types and
+# multi-statement TVFs have primary keys too, and CLR procedures have parameters
+# but no sys.sql_modules row.
+CATALOG_BATCH = """
+    SET NOCOUNT ON;
+
+    SELECT 
+        t.object_id,
+        t.name AS table_name,
+        SCHEMA_NAME(t.schema_id) AS schema_name,
+        CAST(p.value AS NVARCHAR(MAX)) AS table_description
+    FROM 
+        sys.tables t
+    LEFT JOIN 
+        sys.extended_properties p ON p.major_id = t.object_id AND p.minor_id = 0 AND p.name = 'MS_Description';
+
+    SELECT 
+        c.object_id,
+        c.column_id,
+        c.name AS column_name,
+        tp.name AS data_type,
+        c.is_nullable,
+        c.is_identity,
+        CAST(ep.value AS NVARCHAR(MAX)) AS column_description
+    FROM 
+        sys.columns c
+    INNER JOIN 
+        sys.tables t ON t.object_id = c.object_id
+    INNER JOIN 
+        sys.types tp ON c.user_type_id = tp.user_type_id
+    LEFT JOIN 
+        sys.extended_properties ep ON ep.major_id = c.object_id AND ep.minor_id = c.column_id AND ep.name = 'MS_Description'
+    ORDER BY 
+        c.object_id, c.column_id;
+
+    SELECT 
+        ic.object_id,
+        ic.column_id
+    FROM 
+        sys.indexes i
+    INNER JOIN 
+        sys.tables t ON t.object_id = i.object_id
+    INNER JOIN 
+        sys.index_columns ic ON i.object_id = ic.object_id AND i.index_id = ic.index_id
+    WHERE 
+        i.is_primary_key = 1
+    ORDER BY 
+        ic.object_id, ic.key_ordinal;
+
+    SELECT 
+        fkc.parent_object_id,
+        fkc.parent_column_id,
+        fkc.referenced_object_id,
+        fkc.referenced_column_id,
+        fk.name AS constraint_name
+    FROM 
+        sys.foreign_keys fk
+    INNER JOIN 
+        sys.foreign_key_columns fkc ON fk.object_id = fkc.constraint_object_id
+    ORDER BY 
+        fk.name, fkc.constraint_column_id;
+
+    SELECT 
+        p.object_id,
+        p.name AS procedure_name,
+        m.definition AS procedure_definition,
+        CAST(ep.value AS NVARCHAR(MAX)) AS procedure_description
+    FROM 
+        sys.procedures p
+    INNER JOIN 
+        sys.sql_modules m ON p.object_id = m.object_id
+    LEFT JOIN 
+        sys.extended_properties ep ON p.object_id = ep.major_id AND ep.minor_id = 0 AND ep.name = 'MS_Description';
+
+    SELECT 
+        p.object_id,
+        p.name AS parameter_name,
+        t.name AS parameter_type,
+        p.is_output
+    FROM 
+        sys.parameters p
+    INNER JOIN 
+        sys.procedures sp ON p.object_id = sp.object_id
+    INNER JOIN 
+        sys.sql_modules m ON sp.object_id = m.object_id
+    INNER JOIN 
+        sys.types t ON p.user_type_id = t.user_type_id
+    ORDER BY 
+        p.object_id, p.parameter_id;
+
+    SELECT 
+        p.object_id,
+        r.name AS column_name,
+        TYPE_NAME(r.system_type_id) AS data_type,
+        r.is_nullable
+    FROM 
+        sys.procedures p
+    INNER JOIN 
+        sys.sql_modules m ON p.object_id = m.object_id
+    CROSS APPLY 
+        sys.dm_exec_describe_first_result_set_for_object(p.object_id, 0) r
+    WHERE 
+        r.is_hidden = 0
+        AND r.error_number IS NULL
+        AND r.name IS NOT NULL
+    ORDER BY 
+        p.object_id, r.column_ordinal;
+"""
+
 class SQLServerSchemaReader(SchemaReader):
+    placeholder = '?'
+
+    def __init__(self, db, naming_convention='original', single_batch=False, timeout=None, cancellation=None):
+        super().__init__(db, naming_convention, timeout, cancellation)
+        self.single_batch = single_batch
+        self.catalog = None
+        self.active_cursor = None
+        self.previous_timeout = 0
+
+    def cursor(self, *args, **kwargs):
+        # ODBC cancels per statement handle. Statements run one at a time on the
+        # connection, so only the latest cursor is kept for interrupt; a list
+        # would grow on every watch poll of a long-lived reader.
+        self.active_cursor = super().cursor(*args, **kwargs)
+        return self.active_cursor
+
+    def apply_timeout(self):
+        self.previous_timeout = self.db.timeout
+        self.db.timeout = max(1, math.ceil(self.timeout))
+
+    def clear_timeout(self):
+        self.db.timeout = self.previous_timeout
+
+    def interrupt(self):
+        cursor = self.active_cursor
+        if cursor is not None:
+            try:
+                cursor.cancel()
+            except Exception:
+                pass
+
+    def assemble_schema(self, procedures=True, external_references=False):
+        # A table selection is cheaper to read with the filtered per-query path.
+        self.catalog = self.read_catalog() if self.single_batch and self.table_filter is None else None
+        try:
+            return super().assemble_schema(procedures, external_references)
+        finally:
+            self.catalog = None
+            self.active_cursor = None
+
+    def read_catalog(self):
+        cursor = self.cursor()
+        cursor.execute(CATALOG_BATCH)
+
+        tables = {}
+        table_names = {}
+        for row in self.iter_rows(cursor):
+            table_names[row.object_id] = row.table_name
+            tables[row.table_name] = {'description': row.table_description or '', 'schema': row.schema_name}
+
+        cursor.nextset()
+        columns = {}
+        column_names = {}
+        for row in self.iter_rows(cursor):
+            table_name = table_names[row.object_id]
+            column_names[(row.object_id, row.column_id)] = row.column_name
+            columns.setdefault(table_name, []).append({
+                'name': row.column_name,
+                'type': row.data_type,
+                'nullable': row.is_nullable,
+                'identity': row.is_identity,
+                'description': row.column_description or ''
+            })
+
+        cursor.nextset()
+        primary_keys = {}
+        for row in self.iter_rows(cursor):
+            primary_keys.setdefault(table_names[row.object_id], []).append(column_names[(row.object_id, row.column_id)])
+
+        cursor.nextset()
+        foreign_keys = {}
+        for row in self.iter_rows(cursor):
+            referenced_table_name = table_names[row.referenced_object_id]
+            referenced_column_name = column_names[(row.referenced_object_id, row.referenced_column_id)]
+            foreign_keys.setdefault(table_names[row.parent_object_id], []).append({
+                'column': column_names[(row.parent_object_id, row.parent_column_id)],
+                'referenced_table': referenced_table_name,
+                'referenced_column': referenced_column_name,
+                'constraint_name': row.constraint_name,
+                'description': f"Foreign key constraint {row.constraint_name} referencing {referenced_table_name}.{referenced_column_name}"
+            })
+
+        cursor.nextset()
+        procedures = {}
+        procedure_names = {}
+        for row in self.iter_rows(cursor):
+            procedure_names[row.object_id] = row.procedure_name
+            procedures[row.procedure_name] = {
+                'definition': row.procedure_definition,
+                'description': row.procedure_description or '',
+                'parameters': []
+            }
+
+        cursor.nextset()
+        for row in self.iter_rows(cursor):
+            procedures[procedure_names[row.object_id]]['parameters'].append({
+                'name': row.parameter_name,
+                'type': row.parameter_type,
+                'mode': 'OUT' if row.is_output else 'IN'
+            })
+
+        cursor.nextset()
+        procedure_results = {}
+        for row in self.iter_rows(cursor):
+            procedure_results.setdefault(procedure_names[row.object_id], []).append({
+                'name': row.column_name,
+                'type': row.data_type,
+                'nullable': row.is_nullable
+            })
+        cursor.close()
+
+        return {
+            'tables': tables,
+            'columns': columns,
+            'primary_keys': primary_keys,
+            'foreign_keys': foreign_keys,
+            'procedures': procedures,
+            'procedure_results': procedure_results
+        }
+
     def read_tables(self):
-        cursor = self.db.cursor()
-        cursor.execute("""
+        if self.catalog is not None:
+            return self.catalog['tables']
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('t.name')
+        self.execute(cursor, f"""
             SELECT 
                 t.name AS table_name,
+                SCHEMA_NAME(t.schema_id) AS schema_name,
                 CAST(p.value AS NVARCHAR(MAX)) AS table_description
             FROM 
                 sys.tables t
             LEFT JOIN 
                 sys.extended_properties p ON p.major_id = t.object_id AND p.minor_id = 0 AND p.name = 'MS_Description'
-        """)
-        tables = {row.table_name: {'description': row.table_description or ''} for row in cursor.fetchall()}
+            WHERE 
+                1 = 1
+                {table_condition}
+        """, params)
+        tables = {row.table_name: {'description': row.table_description or '', 'schema': row.schema_name} for row in self.iter_rows(cursor)}
         cursor.close()
         return tables
 
     def read_columns(self):
-        cursor = self.db.cursor()
-        cursor.execute("""
+        if self.catalog is not None:
+            return self.catalog['columns']
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('t.name')
+        self.execute(cursor, f"""
             SELECT 
                 t.name AS table_name,
                 c.name AS column_name,
@@ -35,9 +277,12 @@ class SQLServerSchemaReader(SchemaReader):
                 sys.types tp ON c.user_type_id = tp.user_type_id
             LEFT JOIN 
                 sys.extended_properties ep ON ep.major_id = c.object_id AND ep.minor_id = c.column_id AND ep.name = 'MS_Description'
-        """)
+            WHERE 
+                1 = 1
+                {table_condition}
+        """, params)
         columns = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             if row.table_name not in columns:
                 columns[row.table_name] = []
             columns[row.table_name].append({
@@ -51,8 +296,11 @@ class SQLServerSchemaReader(SchemaReader):
         return columns
 
     def read_primary_keys(self):
-        cursor = self.db.cursor()
-        cursor.execute("""
+        if self.catalog is not None:
+            return self.catalog['primary_keys']
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('t.name')
+        self.execute(cursor, f"""
             SELECT 
                 t.name AS table_name,
                 c.name AS column_name,
@@ -67,11 +315,12 @@ class SQLServerSchemaReader(SchemaReader):
                 sys.columns c ON ic.object_id = c.object_id AND ic.column_id = c.column_id
             WHERE 
                 i.is_primary_key = 1
+                {table_condition}
             ORDER BY
                 t.name, ic.key_ordinal
-        """)
+        """, params)
         primary_keys = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             if row.table_name not in primary_keys:
                 primary_keys[row.table_name] = []
             primary_keys[row.table_name].append(row.column_name)
@@ -79,8 +328,11 @@ class SQLServerSchemaReader(SchemaReader):
         return primary_keys 
 
     def read_foreign_keys(self):
-        cursor = self.db.cursor()
-        cursor.execute("""
+        if self.catalog is not None:
+            return self.catalog['foreign_keys']
+        cursor = self.cursor()
+        table_condition, params = self.table_filter_clause('t.name')
+        self.execute(cursor, f"""
             SELECT 
                 t.name AS table_name,
                 c.name AS column_name,
@@ -99,22 +351,45 @@ class SQLServerSchemaReader(SchemaReader):
                 sys.tables rt ON fk.referenced_object_id = rt.object_id
             INNER JOIN 
                 sys.columns rc ON fkc.referenced_object_id = rc.object_id AND fkc.referenced_column_id = rc.column_id
-        """)
+            WHERE 
+                1 = 1
+                {table_condition}
+            ORDER BY 
+                t.name, fk.name, fkc.constraint_column_id
+        """, params)
         foreign_keys = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             if row.table_name not in foreign_keys:
                 foreign_keys[row.table_name] = []
             foreign_keys[row.table_name].append({
                 'column': row.column_name,
                 'referenced_table': row.referenced_table_name,
                 'referenced_column': row.referenced_column_name,
+                'constraint_name': row.constraint_name,
                 'description': f"Foreign key constraint {row.constraint_name} referencing {row.referenced_table_name}.{row.referenced_column_name}"
             })
         cursor.close()
         return foreign_keys
 
+    def read_fingerprint(self):
+        cursor = self.cursor()
+        cursor.execute("""
+            SELECT 
+                COUNT(*) AS object_count,
+                MAX(modify_date) AS last_modified
+            FROM 
+                sys.objects
+            WHERE 
+                is_ms_shipped = 0
+        """)
+        row = cursor.fetchone()
+        cursor.close()
+        return (row.object_count, str(row.last_modified))
+
     def read_procedures(self):
-        cursor = self.db.cursor()
+        if self.catalog is not None:
+            return self.catalog['procedures']
+        cursor = self.cursor()
         cursor.execute("""
             SELECT 
                 p.name AS procedure_name,
@@ -128,18 +403,57 @@ class SQLServerSchemaReader(SchemaReader):
                 sys.extended_properties ep ON p.object_id = ep.major_id AND ep.minor_id = 0 AND ep.name = 'MS_Description'
         """)
         procedures = {}
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             procedure_name = row.procedure_name
             procedures[procedure_name] = {
                 'definition': row.procedure_definition,
-                'description': row.procedure_description or '',
-                'parameters': self.read_procedure_parameters(procedure_name)
+                'description': row.procedure_description or ''
             }
         cursor.close()
+        # Parameters are read once the procedure result set is drained, the
+        # connection cannot run a second statement while rows are pending.
+        for procedure_name, procedure_info in procedures.items():
+            procedure_info['parameters'] = self.read_procedure_parameters(procedure_name)
         return procedures
 
+    def read_procedure_results(self):
+        # One set-based query describes every procedure on the server instead
+        # of a sp_describe_first_result_set call per procedure. Procedures that
+        # cannot be described (temp tables, dynamic SQL) return an error row.
+        if self.catalog is not None:
+            return self.catalog['procedure_results']
+        cursor = self.cursor()
+        cursor.execute("""
+            SELECT 
+                p.name AS procedure_name,
+                r.name AS column_name,
+                TYPE_NAME(r.system_type_id) AS data_type,
+                r.is_nullable
+            FROM 
+                sys.procedures p
+            INNER JOIN 
+                sys.sql_modules m ON p.object_id = m.object_id
+            CROSS APPLY 
+                sys.dm_exec_describe_first_result_set_for_object(p.object_id, 0) r
+            WHERE 
+                r.is_hidden = 0
+                AND r.error_number IS NULL
+                AND r.name IS NOT NULL
+            ORDER BY 
+                p.name, r.column_ordinal
+        """)
+        procedure_results = {}
+        for row in self.iter_rows(cursor):
+            procedure_results.setdefault(row.procedure_name, []).append({
+                'name': row.column_name,
+                'type': row.data_type,
+                'nullable': row.is_nullable
+            })
+        cursor.close()
+        return procedure_results
+
     def read_procedure_parameters(self, procedure_name):
-        cursor = self.db.cursor()
+        cursor = self.cursor()
         cursor.execute("""
             SELECT 
                 p.name AS parameter_name,
@@ -158,7 +472,7 @@ class SQLServerSchemaReader(SchemaReader):
         """, (procedure_name,))
         
         parameters = []
-        for row in cursor.fetchall():
+        for row in self.iter_rows(cursor):
             parameters.append({
                 'name': row.parameter_name,
                 'type': row.parameter_type,
@@ -0,0 +1,128 @@
+# schema_watcher.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from schema_reader import get_schema_reader
+from code_generator import CodeGenerator
+from output_writer import DEFAULT_MAX_BUNDLE_BYTES, write_output
+
+logger = logging.getLogger(__name__)
+
+
+def table_digest(table_info):
+    return hashlib.sha1(json.dumps(table_info, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def diff_schemas(old_schema, new_schema):
+    # Returns (changed, removed) table names between two schema snapshots.
+    old_tables = old_schema['tables'] if old_schema else {}
+    new_tables = new_schema['tables']
+    changed = {
+        table_name for table_name, table_info in new_tables.items()
+        if table_name not in old_tables or table_digest(old_tables[table_name]) != table_digest(table_info)
+    }
+    removed = set(old_tables) - set(new_tables)
+    # Inverse navigations live on the referenced tables, so those are affected too.
+    for table_name in changed | removed:
+        for tables in (old_tables, new_tables):
+            for fk in tables.get(table_name, {}).get('foreign_keys', []):
+                if fk['referenced_table'] in new_tables:
+                    changed.add(fk['referenced_table'])
+    return changed, removed
+
+
+class SchemaWatcher:
+    def __init__(self, db, on_change, naming_convention='original', interval=2.0, debounce=1.0, max_backoff=60.0, schema=None, reader_options=None,
+                 tables=None):
+        self.reader = get_schema_reader(db, naming_convention, **(reader_options or {}))
+        self.tables = tables
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self.max_backoff = max_backoff
+        self.schema = schema
+        self.fingerprint = None
+        self.pending_fingerprint = None
+        self.pending_since = None
+        self.failures = 0
+
+    def poll(self):
+        # Runs a single polling step and returns the number of seconds to wait
+        # before the next one, so it can be driven by a loop or a Tk timer.
+        try:
+            fingerprint = self.reader.read_fingerprint()
+            if self.fingerprint is None and self.schema is not None:
+                self.fingerprint = fingerprint
+            elif fingerprint != self.fingerprint:
+                now = time.monotonic()
+                if fingerprint != self.pending_fingerprint:
+                    # Wait until the catalog has been quiet for the debounce period,
+                    # so a migration script running many statements triggers one run.
+                    self.pending_fingerprint = fingerprint
+                    self.pending_since = now
+                    if self.fingerprint is not None:
+                        logger.info("Schema change detected, waiting for it to settle")
+                        return min(self.interval, self.debounce)
+                if self.fingerprint is None or now - self.pending_since >= self.debounce:
+                    self.regenerate(fingerprint)
+                else:
+                    return min(self.interval, self.debounce)
+            else:
+                self.pending_fingerprint = None
+        except Exception as e:
+            self.failures += 1
+            delay = min(self.interval * 2 ** self.failures, self.max_backoff)
+            logger.warning(f"Schema watch poll failed ({str(e)}), retrying in {delay:.1f}s")
+            return delay
+
+        self.failures = 0
+        return self.interval
+
+    def regenerate(self, fingerprint):
+        schema = self.reader.read_schema(self.tables)
+        changed, removed = diff_schemas(self.schema, schema)
+        logger.info(f"Schema changed: {len(changed)} tables changed, {len(removed)} tables removed")
+        self.on_change(schema, changed, removed)
+        self.schema = schema
+        self.fingerprint = fingerprint
+        self.pending_fingerprint = None
+        self.pending_since = None
+
+    def run(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        logger.info(f"Watching schema every {self.interval}s")
+        while not stop_event.is_set():
+            stop_event.wait(self.poll())
+
+
+class Regenerator:
+    def __init__(self, destination, namespace, dbcontext_name, naming_convention, configuration_style, layout='per_file', framework='ef6',
+                 template_paths=None, max_bundle_bytes=DEFAULT_MAX_BUNDLE_BYTES):
+        self.destination = destination
+        self.namespace = namespace
+        self.dbcontext_name = dbcontext_name
+        self.naming_convention = naming_convention
+        self.configuration_style = configuration_style
+        self.layout = layout
+        self.framework = framework
+        self.template_paths = template_paths
+        self.max_bundle_bytes = max_bundle_bytes
+
+    def __call__(self, schema, changed, removed):
+        code_generator = CodeGenerator(schema, self.namespace, self.dbcontext_name, self.naming_convention, self.configuration_style, self.framework,
+                                       template_paths=self.template_paths, auto_reload=True)
+        if self.layout != 'per_file':
+            # Bundled layouts mix tables within files, so they are always rewritten whole.
+            generated_code = code_generator.generate()
+        else:
+            generated_code = code_generator.generate(changed)
+            for table_name in removed:
+                file_path = os.path.join(self.destination, f"{code_generator.format_name(table_name)}.cs")
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                    logger.info(f"Removed {file_path}")
+        write_output(generated_code, self.destination, self.dbcontext_name, self.layout, self.max_bundle_bytes, code_generator.entity_groups())
@@ -0,0 +1,252 @@
+# server.py
+import json
+import logging
+import os
+import re
+import socket
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+
+from db_connector import connect
+from schema_reader import get_schema_reader
+from code_generator import CodeGenerator
+from fragment_cache import FragmentCache
+from output_writer import DEFAULT_MAX_BUNDLE_BYTES, plan_files, write_output
+from table_families import collapse_families
+from view_model import SchemaViewModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '[::1]'}
+
+
+class WarmConnection:
+    # Database connections are not shared between threads (sqlite3 refuses it),
+    # so every connection gets one worker thread that runs all of its queries.
+    def __init__(self, conn_params):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.db = self.executor.submit(connect, dict(conn_params)).result()
+
+    def run(self, work):
+        return self.executor.submit(work, self.db).result()
+
+    def close(self):
+        try:
+            self.executor.submit(self.db.close).result()
+        except Exception as e:
+            logger.warning(f"Failed to close connection: {str(e)}")
+        self.executor.shutdown(wait=False)
+
+
+class GenerationService:
+    # State kept warm between requests: open connections, schema snapshots keyed
+    # by their catalog fingerprint and rendered fragments. Compiled templates are
+    # cached by template_loader for the lifetime of the process.
+    def __init__(self):
+        self.connections = {}
+        self.snapshots = {}
+        self.fragment_cache = FragmentCache()
+        self.lock = threading.Lock()
+
+    def connection(self, conn_params):
+        key = tuple(sorted(conn_params.items()))
+        with self.lock:
+            connection = self.connections.get(key)
+        if connection is None:
+            # Connecting may take long and must not hold up requests for other
+            # databases; a connection opened concurrently for the same key is kept.
+            created = WarmConnection(conn_params)
+            with self.lock:
+                connection = self.connections.setdefault(key, created)
+            if connection is not created:
+                created.close()
+        return key, connection
+
+    def drop_connection(self, key):
+        with self.lock:
+            connection = self.connections.pop(key, None)
+            self.snapshots = {snapshot_key: snapshot for snapshot_key, snapshot in self.snapshots.items() if snapshot_key[0] != key}
+        if connection is not None:
+            connection.close()
+
+    def snapshot(self, conn_params, naming_convention, reader_options):
+        key, connection = self.connection(conn_params)
+        snapshot_key = (key, naming_convention, tuple(sorted(reader_options.items())))
+
+        def read(db):
+            # The fingerprint probe is cheap; the full catalog is only read
+            # again when it has changed since the cached snapshot.
+            reader = get_schema_reader(db, naming_convention, **reader_options)
+            fingerprint = reader.read_fingerprint()
+            snapshot = self.snapshots.get(snapshot_key)
+            if snapshot is None or snapshot['fingerprint'] != fingerprint:
+                logger.info("Reading schema snapshot")
+                schema = reader.read_schema()
+                snapshot = {
+                    'fingerprint': fingerprint,
+                    'schema': schema,
+                    'view_model': SchemaViewModel(schema, naming_convention).prepare(),
+                }
+                with self.lock:
+                    self.snapshots[snapshot_key] = snapshot
+            return snapshot
+
+        try:
+            return connection.run(read)
+        except Exception:
+            # The connection may be broken; the next request reconnects.
+            self.drop_connection(key)
+            raise
+
+    def generate(self, request):
+        conn_params = request.get('connection')
+        if not conn_params or 'db_type' not in conn_params:
+            raise ValueError("'connection' with a 'db_type' is required")
+        namespace = request.get('namespace')
+        dbcontext_name = request.get('dbcontext_name')
+        if not namespace or not dbcontext_name:
+            raise ValueError("'namespace' and 'dbcontext_name' are required")
+        naming_convention = request.get('naming_convention', 'camelcase')
+        layout = request.get('layout', 'per_file')
+
+        snapshot = self.snapshot(conn_params, naming_convention, request.get('reader_options', {}))
+        schema, view_model = snapshot['schema'], snapshot['view_model']
+        if request.get('collapse_families'):
+            schema = collapse_families(schema, request.get('family_pattern'))
+            view_model = None
+        code_generator = CodeGenerator(
+            schema,
+            namespace,
+            dbcontext_name,
+            naming_convention,
+            request.get('configuration_style', 'data_annotations'),
+            request.get('framework', 'ef6'),
+            view_model=view_model,
+            template_paths=request.get('template_paths'),
+            auto_reload=True,
+            fragment_cache=self.fragment_cache,
+            compiled_model=request.get('compiled_model', False)
+        )
+        generated_code = code_generator.generate(request.get('tables'))
+        max_bundle_bytes = request.get('max_bundle_bytes', DEFAULT_MAX_BUNDLE_BYTES)
+        response = {'fingerprint': str(snapshot['fingerprint'])}
+        if request.get('output'):
+            response['written'] = write_output(generated_code, request['output'], dbcontext_name, layout, max_bundle_bytes,
+                                               code_generator.entity_groups())
+        else:
+            response['files'] = dict(plan_files(generated_code, dbcontext_name, layout, max_bundle_bytes, code_generator.entity_groups()))
+        return response
+
+    def stats(self):
+        return {
+            'connections': len(self.connections),
+            'snapshots': len(self.snapshots),
+            'fragments': self.fragment_cache.stats(),
+        }
+
+    def invalidate(self):
+        with self.lock:
+            self.snapshots = {}
+        self.fragment_cache.clear()
+
+    def close(self):
+        for key in list(self.connections):
+            self.drop_connection(key)
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self.send_json(200, self.server.service.stats())
+        else:
+            self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+
+    def rejection(self):
+        # Requests write files and open database connections, so browsers must not
+        # be able to send them: a cross-site form or fetch carries an Origin header
+        # and cannot use a JSON content type without a preflight, which is never
+        # answered, and a foreign Host header means DNS rebinding.
+        if self.headers.get('Origin') is not None:
+            return "Requests from browsers are not accepted"
+        if self.headers.get_content_type() != 'application/json':
+            return "Content-Type must be application/json"
+        host = re.sub(r':\d+$', '', (self.headers.get('Host') or '').lower())
+        if not isinstance(self.server, UnixHTTPServer) and host not in LOCAL_HOSTS | {self.server.server_address[0]}:
+            return f"Host {host} is not accepted"
+        return None
+
+    def do_POST(self):
+        rejection = self.rejection()
+        if rejection is not None:
+            logger.warning(f"Rejected request: {rejection}")
+            self.send_json(403, {'error': rejection})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if self.path == '/generate':
+                self.send_json(200, self.server.service.generate(request))
+            elif self.path == '/invalidate':
+                self.server.service.invalidate()
+                self.send_json(200, {'status': 'ok'})
+            else:
+                self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+        except (ValueError, KeyError) as e:
+            logger.error(f"Bad request: {str(e)}")
+            self.send_json(400, {'error': str(e)})
+        except Exception as e:
+            logger.exception("Request failed:")
+            self.send_json(500, {'error': str(e)})
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket peers have no address.
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    address_family = socket.AF_UNIX
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def create_server(host='127.0.0.1', port=DEFAULT_PORT, socket_path=None, service=None):
+    if socket_path:
+        server = UnixHTTPServer(socket_path, GenerationRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), GenerationRequestHandler)
+    server.service = service or GenerationService()
+    return server
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, socket_path=None):
+    server = create_server(host, port, socket_path)
+    logger.info(f"Generation server listening on {socket_path or f'http://{host}:{server.server_port}'}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,79 @@
+# table_families.py
+import hashlib
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Trailing numeric parts such as _2024_01, _0042 or 7 mark a table as one
+# partition or shard of a family; the rest of the name names the family.
+DEFAULT_FAMILY_PATTERN = r'[_-]?\d+(?:[_-]\d+)*$'
+MIN_FAMILY_SIZE = 2
+
+
+def table_signature(table_info):
+    # Only what reaches the generated code: defaults, descriptions and
+    # constraint names differ between shards without changing the entity.
+    columns = [(column['name'], column['type'], bool(column['nullable'])) for column in table_info['columns']]
+    foreign_keys = sorted((fk['column'], fk['referenced_table'], fk['referenced_column']) for fk in table_info.get('foreign_keys', []))
+    signature = (columns, list(table_info.get('primary_key', [])), foreign_keys)
+    return hashlib.sha1(repr(signature).encode('utf-8')).hexdigest()
+
+
+def find_families(schema, pattern=None, min_size=MIN_FAMILY_SIZE):
+    # Groups tables by family name and column signature. Tables referenced by
+    # other tables stay separate, their class is the target of navigations.
+    pattern = re.compile(pattern or DEFAULT_FAMILY_PATTERN)
+    tables = schema['tables']
+    referenced = {fk['referenced_table'] for table_info in tables.values() for fk in table_info.get('foreign_keys', [])}
+    candidates = {}
+    for table_name, table_info in tables.items():
+        family_name = pattern.sub('', table_name)
+        if not family_name or family_name == table_name or table_name in referenced:
+            continue
+        candidates.setdefault((family_name, table_signature(table_info)), []).append(table_name)
+
+    groups = {}
+    for (family_name, digest), members in candidates.items():
+        if len(members) >= min_size:
+            groups.setdefault(family_name, []).append((digest, members))
+
+    families = {}
+    for family_name, shapes in groups.items():
+        if len(shapes) > 1:
+            logger.warning(f"Tables of family {family_name} differ in their columns, keeping them separate")
+            continue
+        digest, members = shapes[0]
+        if family_name in tables:
+            if family_name in referenced or table_signature(tables[family_name]) != digest:
+                logger.warning(f"Family {family_name} collides with an existing table, keeping its tables separate")
+                continue
+            # e.g. the parent of partitions read with include_partitions.
+            members = [family_name] + members
+        families[family_name] = members
+    return families
+
+
+def collapse_families(schema, pattern=None, min_size=MIN_FAMILY_SIZE):
+    # Returns a schema in which every family is a single table named after the
+    # family, taken from its first member, with all members in 'family_tables'.
+    families = find_families(schema, pattern, min_size)
+    if not families:
+        return schema
+    family_of = {table_name: family_name for family_name, members in families.items() for table_name in members}
+    tables = {}
+    for table_name, table_info in schema['tables'].items():
+        family_name = family_of.get(table_name)
+        if family_name is None:
+            tables[table_name] = table_info
+        elif family_name not in tables:
+            members = families[family_name]
+            first = schema['tables'][members[0]]
+            family_info = dict(first, family_tables=members)
+            family_info['foreign_keys'] = [
+                dict(fk, constraint_name=fk['constraint_name'].replace(members[0], family_name)) if fk.get('constraint_name') else fk
+                for fk in first.get('foreign_keys', [])
+            ]
+            tables[family_name] = family_info
+    logger.info(f"Collapsed {len(family_of)} tables into {len(families)} families")
+    return dict(schema, tables=tables)
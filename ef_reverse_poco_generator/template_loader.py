@@ -0,0 +1,45 @@
+# template_loader.py
+import os
+import re
+import logging
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+DEFAULT_BYTECODE_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'ef_reverse_poco_generator', 'templates'
+)
+
+_environments = {}
+
+def format_comment(comment):
+    return re.sub(r'\s+', ' ', comment).strip()
+
+def get_environment(template_paths=None, auto_reload=False, bytecode_cache_dir=DEFAULT_BYTECODE_CACHE_DIR):
+    # Environments are shared per search path for the whole session, so compiled
+    # templates are kept in memory between runs. Compiled bytecode is also
+    # persisted on disk for the next process. With auto_reload, a template is
+    # recompiled only when its file's modification time changes.
+    key = (tuple(template_paths or ()), auto_reload, bytecode_cache_dir)
+    environment = _environments.get(key)
+    if environment is None:
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            try:
+                os.makedirs(bytecode_cache_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+            except OSError as e:
+                logger.warning(f"Template bytecode cache disabled: {str(e)}")
+        # User directories come first so their files override the built-in templates.
+        search_path = list(template_paths or []) + [BUILTIN_TEMPLATE_DIR]
+        environment = Environment(
+            loader=FileSystemLoader(search_path),
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
+            cache_size=-1
+        )
+        environment.filters['format_comment'] = format_comment
+        _environments[key] = environment
+    return environment
@@ -0,0 +1,129 @@
+# view_model.py
+import re
+
+from relationship_graph import RelationshipGraph
+
+TYPE_MAPPING = {
+    'int': 'int',
+    'bigint': 'long',
+    'varchar': 'string',
+    'char': 'string',
+    'text': 'string',
+    'datetime': 'DateTime',
+    'date': 'DateTime',
+    'time': 'TimeSpan',
+    'bit': 'bool',
+    'decimal': 'decimal',
+    'float': 'float',
+    'double': 'double',
+    'tinyint': 'byte',
+    'smallint': 'short',
+    'nvarchar': 'string',
+    'varbinary': 'byte[]',
+    'binary': 'byte[]',
+    'image': 'byte[]',
+    'money': 'decimal',
+    'real': 'float',
+    'smalldatetime': 'DateTime',
+    'timestamp': 'byte[]',
+    'uniqueidentifier': 'Guid'
+}
+
+# Only these CLR types can be null without '?'.
+REFERENCE_TYPES = {'string', 'byte[]', 'object'}
+
+CSHARP_KEYWORDS = {
+    'abstract', 'as', 'base', 'bool', 'break', 'byte', 'case', 'catch', 'char', 'checked', 'class', 'const', 'continue',
+    'decimal', 'default', 'delegate', 'do', 'double', 'else', 'enum', 'event', 'explicit', 'extern', 'false', 'finally',
+    'fixed', 'float', 'for', 'foreach', 'goto', 'if', 'implicit', 'in', 'int', 'interface', 'internal', 'is', 'lock',
+    'long', 'namespace', 'new', 'null', 'object', 'operator', 'out', 'override', 'params', 'private', 'protected',
+    'public', 'readonly', 'ref', 'return', 'sbyte', 'sealed', 'short', 'sizeof', 'stackalloc', 'static', 'string',
+    'struct', 'switch', 'this', 'throw', 'true', 'try', 'typeof', 'uint', 'ulong', 'unchecked', 'unsafe', 'ushort',
+    'using', 'virtual', 'void', 'volatile', 'while'
+}
+
+class SchemaViewModel:
+    # Naming and type resolution for one schema and naming convention. It does
+    # not depend on the configuration style or framework, so several generation
+    # targets can share a single instance.
+    def __init__(self, schema, naming_convention):
+        self.schema = schema
+        self.naming_convention = naming_convention
+        self.names = {}
+        self.types = {}
+        self.tables = {}
+        self.relationships = RelationshipGraph(schema, self.format_name)
+
+    def format_name(self, name):
+        formatted = self.names.get(name)
+        if formatted is None:
+            if self.naming_convention == 'camelcase':
+                formatted = ''.join(word.capitalize() for word in name.split('_'))
+            else:
+                formatted = name
+            self.names[name] = formatted
+        return formatted
+
+    def csharp_type(self, sql_type):
+        csharp_type = self.types.get(sql_type)
+        if csharp_type is None:
+            csharp_type = self.types[sql_type] = TYPE_MAPPING.get(sql_type.lower(), 'object')
+        return csharp_type
+
+    def table(self, table_name):
+        view = self.tables.get(table_name)
+        if view is None:
+            table_info = self.schema['tables'][table_name]
+            primary_key_columns = table_info.get('primary_key', [])
+            columns = []
+            for column in table_info['columns']:
+                column_info = {
+                    'name': column['name'],
+                    'property_name': self.format_name(column['name']),
+                    'csharp_type': self.csharp_type(column['type']),
+                    'nullable': column['nullable'],
+                    'primary_key': column['name'] in primary_key_columns,
+                    'description': column.get('description', '')
+                }
+                if column_info['primary_key']:
+                    column_info['key_order'] = primary_key_columns.index(column['name']) + 1 if len(primary_key_columns) > 1 else None
+                columns.append(column_info)
+            view = self.tables[table_name] = {
+                'class_name': self.format_name(table_name),
+                'columns': columns,
+                'primary_key': [self.format_name(column_name) for column_name in primary_key_columns],
+            }
+        return view
+
+    def result_properties(self, class_name, result_columns):
+        # Result columns can have any name, e.g. "Order Total" or "class". Each one
+        # gets a unique, valid property name and, when that differs from the column
+        # name, the column name to map it with [Column].
+        properties = []
+        taken = {class_name}
+        for column in result_columns:
+            property_name = re.sub(r'\W', '_', column['name'])
+            if not property_name or property_name[0].isdigit():
+                property_name = '_' + property_name
+            unique_name = property_name
+            number = 1
+            while unique_name in taken:
+                number += 1
+                unique_name = f"{property_name}{number}"
+            taken.add(unique_name)
+            csharp_type = self.csharp_type(column['type'])
+            if column['nullable'] and csharp_type not in REFERENCE_TYPES:
+                csharp_type += '?'
+            properties.append({
+                'property_name': '@' + unique_name if unique_name in CSHARP_KEYWORDS else unique_name,
+                'csharp_type': csharp_type,
+                'mapped_column': column['name'].replace('\\', '\\\\').replace('"', '\\"') if unique_name != column['name'] else None,
+            })
+        return properties
+
+    def prepare(self):
+        # Resolves every table up front, e.g. before the view model is shared
+        # between rendering threads.
+        for table_name in self.schema['tables']:
+            self.table(table_name)
+        return self
@@ -21,6 +21,9 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/howjerry/ef_reverse_poco_generator",
     packages=find_packages(),
+    package_data={
+        "ef_reverse_poco_generator": ["templates/*.j2"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -38,6 +41,9 @@ setup(
         "pyodbc",
         "jinja2",
     ],
+    extras_require={
+        "keyring": ["keyring"],
+    },
     entry_points={
         "console_scripts": [
             "ef-reverse-poco=ef_reverse_poco_generator.main:main",
@@ -0,0 +1,47 @@
+# tests/conftest.py
+# The package modules import each other by plain name, as when the
+# application runs from its own directory.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ef_reverse_poco_generator'))
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+
+@pytest.fixture
+def golden():
+    # Compares generated files with the checked-in copies under tests/golden;
+    # run with UPDATE_GOLDEN=1 to rewrite them after an intended output change.
+    def check(directory, files):
+        expected_dir = os.path.join(GOLDEN_DIR, directory)
+        if os.environ.get('UPDATE_GOLDEN'):
+            os.makedirs(expected_dir, exist_ok=True)
+            for file_name in os.listdir(expected_dir):
+                os.remove(os.path.join(expected_dir, file_name))
+            for file_name, content in files.items():
+                with open(os.path.join(expected_dir, file_name), 'w', encoding='utf-8', newline='') as f:
+                    f.write(content)
+        assert sorted(os.listdir(expected_dir)) == sorted(files)
+        for file_name, content in files.items():
+            with open(os.path.join(expected_dir, file_name), 'r', encoding='utf-8', newline='') as f:
+                assert content == f.read(), f"{directory}/{file_name} differs from the golden file"
+
+    return check
+
+
+@pytest.fixture
+def postgresql():
+    # A connection to the scratch database named by EF_POCO_TEST_POSTGRESQL_DSN,
+    # e.g. "dbname=scratch user=postgres host=localhost"; tests create their
+    # tables in public.
+    dsn = os.environ.get('EF_POCO_TEST_POSTGRESQL_DSN')
+    if not dsn:
+        pytest.skip("EF_POCO_TEST_POSTGRESQL_DSN is not set")
+    psycopg2 = pytest.importorskip('psycopg2')
+    db = psycopg2.connect(dsn)
+    db.autocommit = True
+    yield db
+    db.close()
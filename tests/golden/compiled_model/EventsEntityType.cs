@@ -0,0 +1,94 @@
+// <auto-generated />
+using System;
+using System.Collections.Generic;
+using System.Reflection;
+using Microsoft.EntityFrameworkCore;
+using Microsoft.EntityFrameworkCore.Metadata;
+
+namespace Shop.Data
+{
+    internal partial class EventsEntityType
+    {
+        public static RuntimeEntityType Create(RuntimeModel model, string name)
+        {
+            var runtimeEntityType = model.AddEntityType(
+                name,
+                typeof(Events),
+                sharedClrType: true);
+
+            runtimeEntityType.AddProperty(
+                "Id",
+                typeof(Guid),
+                propertyInfo: typeof(Events).GetProperty("Id", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(Events).GetField("<Id>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                valueGenerated: ValueGenerated.OnAdd,
+                afterSaveBehavior: PropertySaveBehavior.Throw)
+                .AddAnnotation("Relational:ColumnName", "id");
+
+            runtimeEntityType.AddProperty(
+                "OrderId",
+                typeof(int),
+                propertyInfo: typeof(Events).GetProperty("OrderId", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(Events).GetField("<OrderId>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly))
+                .AddAnnotation("Relational:ColumnName", "order_id");
+
+            runtimeEntityType.AddProperty(
+                "OrderRegion",
+                typeof(string),
+                propertyInfo: typeof(Events).GetProperty("OrderRegion", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(Events).GetField("<OrderRegion>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                nullable: true)
+                .AddAnnotation("Relational:ColumnName", "order_region");
+
+            runtimeEntityType.AddProperty(
+                "Payload",
+                typeof(byte[]),
+                propertyInfo: typeof(Events).GetProperty("Payload", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(Events).GetField("<Payload>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                nullable: true)
+                .AddAnnotation("Relational:ColumnName", "payload");
+
+            var key = runtimeEntityType.AddKey(
+                new[] { runtimeEntityType.FindProperty("Id") });
+            runtimeEntityType.SetPrimaryKey(key);
+
+            return runtimeEntityType;
+        }
+
+        public static RuntimeForeignKey CreateForeignKey1(RuntimeEntityType declaringEntityType, RuntimeEntityType principalEntityType)
+        {
+            // Keys referenced by a unique constraint rather than the primary key become alternate keys.
+            var principalProperties = new[] { principalEntityType.FindProperty("Id"), principalEntityType.FindProperty("Region") };
+            var runtimeForeignKey = declaringEntityType.AddForeignKey(
+                new[] { declaringEntityType.FindProperty("OrderId"), declaringEntityType.FindProperty("OrderRegion") },
+                principalEntityType.FindKey(principalProperties) ?? principalEntityType.AddKey(principalProperties),
+                principalEntityType,
+                deleteBehavior: DeleteBehavior.ClientSetNull);
+            runtimeForeignKey.AddAnnotation("Relational:Name", "fk_events_01_order");
+
+            declaringEntityType.AddNavigation(
+                "OrderHeader",
+                runtimeForeignKey,
+                onDependent: true,
+                typeof(OrderHeader),
+                propertyInfo: typeof(Events).GetProperty("OrderHeader", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(Events).GetField("<OrderHeader>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly));
+
+            return runtimeForeignKey;
+        }
+
+        public static void CreateAnnotations(RuntimeEntityType runtimeEntityType, string tableName)
+        {
+            runtimeEntityType.AddAnnotation("Relational:FunctionName", null);
+            runtimeEntityType.AddAnnotation("Relational:Schema", null);
+            runtimeEntityType.AddAnnotation("Relational:SqlQuery", null);
+            runtimeEntityType.AddAnnotation("Relational:TableName", tableName);
+            runtimeEntityType.AddAnnotation("Relational:ViewName", null);
+            runtimeEntityType.AddAnnotation("Relational:ViewSchema", null);
+
+            Customize(runtimeEntityType);
+        }
+
+        static partial void Customize(RuntimeEntityType runtimeEntityType);
+    }
+}
\ No newline at end of file
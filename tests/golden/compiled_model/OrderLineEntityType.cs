@@ -0,0 +1,100 @@
+// <auto-generated />
+using System;
+using System.Collections.Generic;
+using System.Reflection;
+using Microsoft.EntityFrameworkCore;
+using Microsoft.EntityFrameworkCore.Metadata;
+
+namespace Shop.Data
+{
+    internal partial class OrderLineEntityType
+    {
+        public static RuntimeEntityType Create(RuntimeModel model)
+        {
+            var runtimeEntityType = model.AddEntityType(
+                "Shop.Data.OrderLine",
+                typeof(OrderLine));
+
+            runtimeEntityType.AddProperty(
+                "Id",
+                typeof(long),
+                propertyInfo: typeof(OrderLine).GetProperty("Id", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(OrderLine).GetField("<Id>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                valueGenerated: ValueGenerated.OnAdd,
+                afterSaveBehavior: PropertySaveBehavior.Throw)
+                .AddAnnotation("Relational:ColumnName", "id");
+
+            runtimeEntityType.AddProperty(
+                "OrderId",
+                typeof(int),
+                propertyInfo: typeof(OrderLine).GetProperty("OrderId", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(OrderLine).GetField("<OrderId>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly))
+                .AddAnnotation("Relational:ColumnName", "order_id");
+
+            runtimeEntityType.AddProperty(
+                "OrderRegion",
+                typeof(string),
+                propertyInfo: typeof(OrderLine).GetProperty("OrderRegion", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(OrderLine).GetField("<OrderRegion>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly))
+                .AddAnnotation("Relational:ColumnName", "order_region");
+
+            runtimeEntityType.AddProperty(
+                "Quantity",
+                typeof(decimal),
+                propertyInfo: typeof(OrderLine).GetProperty("Quantity", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(OrderLine).GetField("<Quantity>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly))
+                .AddAnnotation("Relational:ColumnName", "quantity");
+
+            var key = runtimeEntityType.AddKey(
+                new[] { runtimeEntityType.FindProperty("Id") });
+            runtimeEntityType.SetPrimaryKey(key);
+
+            return runtimeEntityType;
+        }
+
+        public static RuntimeForeignKey CreateForeignKey1(RuntimeEntityType declaringEntityType, RuntimeEntityType principalEntityType)
+        {
+            // Keys referenced by a unique constraint rather than the primary key become alternate keys.
+            var principalProperties = new[] { principalEntityType.FindProperty("Id"), principalEntityType.FindProperty("Region") };
+            var runtimeForeignKey = declaringEntityType.AddForeignKey(
+                new[] { declaringEntityType.FindProperty("OrderId"), declaringEntityType.FindProperty("OrderRegion") },
+                principalEntityType.FindKey(principalProperties) ?? principalEntityType.AddKey(principalProperties),
+                principalEntityType,
+                deleteBehavior: DeleteBehavior.Cascade,
+                required: true);
+            runtimeForeignKey.AddAnnotation("Relational:Name", "fk_order_line_header");
+
+            declaringEntityType.AddNavigation(
+                "OrderHeader",
+                runtimeForeignKey,
+                onDependent: true,
+                typeof(OrderHeader),
+                propertyInfo: typeof(OrderLine).GetProperty("OrderHeader", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(OrderLine).GetField("<OrderHeader>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly));
+
+            principalEntityType.AddNavigation(
+                "OrderLines",
+                runtimeForeignKey,
+                onDependent: false,
+                typeof(ICollection<OrderLine>),
+                propertyInfo: typeof(OrderHeader).GetProperty("OrderLines", BindingFlags.Public | BindingFlags.Instance | BindingFlags.DeclaredOnly),
+                fieldInfo: typeof(OrderHeader).GetField("<OrderLines>k__BackingField", BindingFlags.NonPublic | BindingFlags.Instance | BindingFlags.DeclaredOnly));
+
+            return runtimeForeignKey;
+        }
+
+        public static void CreateAnnotations(RuntimeEntityType runtimeEntityType)
+        {
+            runtimeEntityType.AddAnnotation("Relational:FunctionName", null);
+            runtimeEntityType.AddAnnotation("Relational:Schema", null);
+            runtimeEntityType.AddAnnotation("Relational:SqlQuery", null);
+            runtimeEntityType.AddAnnotation("Relational:TableName", "order_line");
+            runtimeEntityType.AddAnnotation("Relational:ViewName", null);
+            runtimeEntityType.AddAnnotation("Relational:ViewSchema", null);
+
+            Customize(runtimeEntityType);
+        }
+
+        static partial void Customize(RuntimeEntityType runtimeEntityType);
+    }
+}
\ No newline at end of file
@@ -0,0 +1,40 @@
+// <auto-generated />
+using Microsoft.EntityFrameworkCore.Infrastructure;
+using Microsoft.EntityFrameworkCore.Metadata;
+
+namespace Shop.Data
+{
+    [DbContext(typeof(ShopContext))]
+    public partial class ShopContextModel : RuntimeModel
+    {
+        static ShopContextModel()
+        {
+            var model = new ShopContextModel();
+            model.Initialize();
+            model.Customize();
+            _instance = model;
+        }
+
+        private static ShopContextModel _instance;
+        public static IModel Instance => _instance;
+
+        private void Initialize()
+        {
+            var orderHeaderType = OrderHeaderEntityType.Create(this);
+            var orderLineType = OrderLineEntityType.Create(this);
+            var events202401Type = EventsEntityType.Create(this, "events_2024_01");
+            var events202402Type = EventsEntityType.Create(this, "events_2024_02");
+
+            OrderLineEntityType.CreateForeignKey1(orderLineType, orderHeaderType);
+            EventsEntityType.CreateForeignKey1(events202401Type, orderHeaderType);
+            EventsEntityType.CreateForeignKey1(events202402Type, orderHeaderType);
+
+            OrderHeaderEntityType.CreateAnnotations(orderHeaderType);
+            OrderLineEntityType.CreateAnnotations(orderLineType);
+            EventsEntityType.CreateAnnotations(events202401Type, "events_2024_01");
+            EventsEntityType.CreateAnnotations(events202402Type, "events_2024_02");
+        }
+
+        partial void Customize();
+    }
+}
\ No newline at end of file
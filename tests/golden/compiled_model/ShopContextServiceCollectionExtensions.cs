@@ -0,0 +1,29 @@
+using System;
+using Microsoft.EntityFrameworkCore;
+using Microsoft.Extensions.DependencyInjection;
+
+namespace Shop.Data
+{
+    public static class ShopContextServiceCollectionExtensions
+    {
+        // Pooled contexts are reset and reused instead of being created per scope,
+        // and the compiled model replaces OnModelCreating at startup.
+        public static IServiceCollection AddShopContextPool(this IServiceCollection services, Action<DbContextOptionsBuilder> configure, int poolSize = 1024)
+        {
+            return services.AddDbContextPool<ShopContext>(options =>
+            {
+                configure(options);
+                options.UseModel(ShopContextModel.Instance);
+            }, poolSize);
+        }
+
+        public static IServiceCollection AddShopContextPooledFactory(this IServiceCollection services, Action<DbContextOptionsBuilder> configure, int poolSize = 1024)
+        {
+            return services.AddPooledDbContextFactory<ShopContext>(options =>
+            {
+                configure(options);
+                options.UseModel(ShopContextModel.Instance);
+            }, poolSize);
+        }
+    }
+}
\ No newline at end of file
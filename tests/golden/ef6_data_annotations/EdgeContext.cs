@@ -0,0 +1,27 @@
+
+using System;
+using System.Data.Entity;
+
+namespace Edge.Models
+{
+    public class EdgeContext : DbContext
+    {
+        public EdgeContext(string nameOrConnectionString)
+            : base(nameOrConnectionString)
+        {
+        }
+
+        
+        public virtual DbSet<Employee> Employees { get; set; }
+        
+        public virtual DbSet<EmptyTable> EmptyTables { get; set; }
+        
+        public virtual DbSet<Note> Notes { get; set; }
+        
+
+        protected override void OnModelCreating(DbModelBuilder modelBuilder)
+        {
+            
+        }
+    }
+}
\ No newline at end of file
@@ -0,0 +1,59 @@
+
+using System;
+using System.Collections.Generic;
+using System.ComponentModel.DataAnnotations.Schema;
+using System.Data.Entity;
+using System.Data.SqlClient;
+using System.Threading.Tasks;
+
+namespace Edge.Models
+{
+    public partial class EdgeContext
+    {
+        
+        
+        public virtual async Task<List<GetReportResult>> GetReportAsync(DateTime since)
+        {
+            var parameters = new []
+            {
+                
+                new SqlParameter("since", since)
+                
+            };
+
+            return await Database.SqlQuery<GetReportResult>("EXEC get_report @since", parameters).ToListAsync();
+        }
+
+        
+        
+        public virtual async Task<int> PurgeAsync()
+        {
+            var parameters = new []
+            {
+                
+            };
+
+            return await Database.ExecuteSqlCommandAsync("EXEC purge ", parameters);
+        }
+
+        
+    }
+
+    // Rows are mapped by property name; EF6 ignores [Column], so properties renamed from
+    // a column that is not a valid property name are left empty (alias the column in the procedure).
+    public class GetReportResult
+    {
+        public int EmployeeId { get; set; }
+        public decimal? Hours { get; set; }
+        public string Comment { get; set; }
+        public int? @class { get; set; }
+        [Column("Order Total")]
+        public decimal Order_Total { get; set; }
+        [Column("Order_Total")]
+        public decimal Order_Total2 { get; set; }
+        [Column("1st \"quoted\" \\ name")]
+        public DateTime? _1st__quoted____name { get; set; }
+        [Column("GetReportResult")]
+        public bool? GetReportResult2 { get; set; }
+    }
+}
\ No newline at end of file
@@ -0,0 +1,79 @@
+
+using System;
+using System.Collections.Generic;
+
+using System.ComponentModel.DataAnnotations;
+using System.ComponentModel.DataAnnotations.Schema;
+
+
+namespace Edge.Models
+{
+    
+    [Table("employee")]
+    public class Employee
+    {
+        
+        
+        
+        [Key]
+        
+        [Required]
+        [Column("id")]
+        
+        public int Id { get; set; }
+
+        
+        
+        /// <summary>
+        /// Reports to "the boss"
+        /// </summary>
+        
+        
+        
+        
+        
+        [Column("manager_id")]
+        
+        public int ManagerId { get; set; }
+
+        
+        
+        /// <summary>
+        /// O'Brien \ C:\temp
+        /// </summary>
+        
+        
+        
+        
+        
+        [Column("nick_name")]
+        
+        public string NickName { get; set; }
+
+        
+        
+        
+        
+        
+        [Required]
+        [Column("hired_on")]
+        
+        public DateTime HiredOn { get; set; }
+
+        
+        
+        
+        
+        [ForeignKey("ManagerId")]
+        [InverseProperty("Employees")]
+        
+        public virtual Employee Manager { get; set; }
+
+        
+        
+        [InverseProperty("Manager")]
+        public virtual ICollection<Employee> Employees { get; set; } = new HashSet<Employee>();
+
+        
+    }
+}
\ No newline at end of file
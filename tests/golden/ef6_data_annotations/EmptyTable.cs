@@ -0,0 +1,23 @@
+
+using System;
+using System.Collections.Generic;
+
+using System.ComponentModel.DataAnnotations;
+using System.ComponentModel.DataAnnotations.Schema;
+
+
+namespace Edge.Models
+{
+    
+    /// <summary>
+    /// Nothing "here"
+    /// </summary>
+    
+    [Table("empty_table")]
+    public class EmptyTable
+    {
+        
+        
+        
+    }
+}
\ No newline at end of file
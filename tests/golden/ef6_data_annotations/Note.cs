@@ -0,0 +1,37 @@
+
+using System;
+using System.Collections.Generic;
+
+using System.ComponentModel.DataAnnotations;
+using System.ComponentModel.DataAnnotations.Schema;
+
+
+namespace Edge.Models
+{
+    
+    /// <summary>
+    /// It's a heap
+    /// </summary>
+    
+    [Table("note")]
+    public class Note
+    {
+        
+        
+        /// <summary>
+        /// Line one Line "two"
+        /// </summary>
+        
+        
+        
+        
+        [Required]
+        [Column("body")]
+        
+        public string Body { get; set; }
+
+        
+        
+        
+    }
+}
\ No newline at end of file
@@ -0,0 +1,105 @@
+
+using System;
+using Microsoft.EntityFrameworkCore;
+
+namespace Edge.Models
+{
+    public partial class EdgeContext : DbContext
+    {
+        public EdgeContext(DbContextOptions<EdgeContext> options)
+            : base(options)
+        {
+        }
+
+        
+        public virtual DbSet<Employee> Employees { get; set; }
+        
+        public virtual DbSet<EmptyTable> EmptyTables { get; set; }
+        
+        public virtual DbSet<Note> Notes { get; set; }
+        
+
+        protected override void OnModelCreating(ModelBuilder modelBuilder)
+        {
+            
+            
+            
+            modelBuilder.Entity<Employee>(entity =>
+            {
+                
+                entity.HasKey(e => e.Id);
+                
+                
+                entity.ToTable("employee");
+                
+
+                entity.Property(e => e.Id)
+                    .HasColumnName("id")
+                    .IsRequired();
+                
+
+                entity.Property(e => e.ManagerId)
+                    .HasColumnName("manager_id");
+                
+
+                entity.Property(e => e.NickName)
+                    .HasColumnName("nick_name");
+                
+
+                entity.Property(e => e.HiredOn)
+                    .HasColumnName("hired_on")
+                    .IsRequired();
+                
+                
+
+                entity.HasOne(d => d.Manager)
+                    .WithMany(p => p.Employees)
+                    .HasForeignKey(d => d.ManagerId)
+                    .HasConstraintName("fk_employee_manager")
+                    .IsRequired(false);
+                
+                
+            });
+
+            
+            
+            
+            
+            modelBuilder.Entity<EmptyTable>(entity =>
+            {
+                
+                entity.HasNoKey();
+                
+                
+                entity.ToTable("empty_table");
+                
+                
+                
+            });
+
+            
+            
+            
+            
+            modelBuilder.Entity<Note>(entity =>
+            {
+                
+                entity.HasNoKey();
+                
+                
+                entity.ToTable("note");
+                
+
+                entity.Property(e => e.Body)
+                    .HasColumnName("body")
+                    .IsRequired();
+                
+                
+                
+            });
+
+            
+            
+        }
+    }
+}
\ No newline at end of file
@@ -0,0 +1,53 @@
+
+using System;
+using System.Collections.Generic;
+
+
+namespace Edge.Models
+{
+    
+    
+    public class Employee
+    {
+        
+        
+        
+        public int Id { get; set; }
+
+        
+        
+        /// <summary>
+        /// Reports to "the boss"
+        /// </summary>
+        
+        
+        public int ManagerId { get; set; }
+
+        
+        
+        /// <summary>
+        /// O'Brien \ C:\temp
+        /// </summary>
+        
+        
+        public string NickName { get; set; }
+
+        
+        
+        
+        public DateTime HiredOn { get; set; }
+
+        
+        
+        
+        
+        public virtual Employee Manager { get; set; }
+
+        
+        
+        
+        public virtual ICollection<Employee> Employees { get; set; } = new HashSet<Employee>();
+
+        
+    }
+}
\ No newline at end of file
@@ -0,0 +1,20 @@
+
+using System;
+using System.Collections.Generic;
+
+
+namespace Edge.Models
+{
+    
+    /// <summary>
+    /// Nothing "here"
+    /// </summary>
+    
+    
+    public class EmptyTable
+    {
+        
+        
+        
+    }
+}
\ No newline at end of file
@@ -0,0 +1,29 @@
+
+using System;
+using System.Collections.Generic;
+
+
+namespace Edge.Models
+{
+    
+    /// <summary>
+    /// It's a heap
+    /// </summary>
+    
+    
+    public class Note
+    {
+        
+        
+        /// <summary>
+        /// Line one Line "two"
+        /// </summary>
+        
+        
+        public string Body { get; set; }
+
+        
+        
+        
+    }
+}
\ No newline at end of file
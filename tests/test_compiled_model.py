@@ -0,0 +1,89 @@
+# tests/test_compiled_model.py
+import sqlite3
+
+import pytest
+
+from code_generator import CodeGenerator
+from schema_reader import read_schema
+from table_families import collapse_families
+
+
+def column(name, type_name, nullable=False):
+    return {'name': name, 'type': type_name, 'nullable': nullable, 'description': ''}
+
+
+def compiled_model_schema():
+    # An order header with a composite key referenced by its lines through a two
+    # column constraint, and monthly event tables that collapse into one shared
+    # type entity referencing the header.
+    schema = {
+        'tables': {
+            'order_header': {
+                'columns': [column('id', 'int'), column('region', 'varchar'), column('note', 'nvarchar', True)],
+                'primary_key': ['id', 'region'],
+                'foreign_keys': [],
+                'description': '',
+            },
+            'order_line': {
+                'columns': [column('id', 'bigint'), column('order_id', 'int'), column('order_region', 'varchar'),
+                            column('quantity', 'decimal', True)],
+                'primary_key': ['id'],
+                'foreign_keys': [
+                    {'constraint_name': 'fk_order_line_header', 'column': 'order_id', 'referenced_table': 'order_header',
+                     'referenced_column': 'id', 'description': ''},
+                    {'constraint_name': 'fk_order_line_header', 'column': 'order_region', 'referenced_table': 'order_header',
+                     'referenced_column': 'region', 'description': ''},
+                ],
+                'description': '',
+            },
+        },
+        'procedures': {},
+    }
+    for month in ('01', '02'):
+        schema['tables'][f"events_2024_{month}"] = {
+            'columns': [column('id', 'uniqueidentifier'), column('order_id', 'int', True), column('order_region', 'varchar', True),
+                        column('payload', 'varbinary', True)],
+            'primary_key': ['id'],
+            'foreign_keys': [
+                {'constraint_name': f"fk_events_{month}_order", 'column': 'order_id', 'referenced_table': 'order_header',
+                 'referenced_column': 'id', 'description': ''},
+                {'constraint_name': f"fk_events_{month}_order", 'column': 'order_region', 'referenced_table': 'order_header',
+                 'referenced_column': 'region', 'description': ''},
+            ],
+            'description': '',
+        }
+    return collapse_families(schema)
+
+
+@pytest.mark.parametrize('renderer', ['jinja', 'fast'])
+def test_compiled_model_matches_golden(golden, renderer):
+    schema = compiled_model_schema()
+    assert schema['tables']['events']['family_tables'] == ['events_2024_01', 'events_2024_02']
+    code_generator = CodeGenerator(schema, 'Shop.Data', 'ShopContext', 'camelcase', 'fluent_api', 'efcore', renderer=renderer,
+                                   compiled_model=True)
+    golden('compiled_model', code_generator.generate()['compiled_model'])
+
+
+@pytest.mark.parametrize('naming_convention', ['original', 'camelcase'])
+def test_compiled_model_resolves_sqlite_references_to_the_primary_key(naming_convention):
+    # REFERENCES parent without a column list names no referenced column.
+    db = sqlite3.connect(':memory:')
+    db.executescript("""
+        CREATE TABLE parent (region TEXT, id INTEGER, PRIMARY KEY (id, region));
+        CREATE TABLE child (
+            id INTEGER PRIMARY KEY,
+            parent_id INTEGER,
+            parent_region TEXT,
+            FOREIGN KEY (parent_id, parent_region) REFERENCES parent
+        );
+    """)
+    schema = read_schema(db, naming_convention)
+    assert [(fk['column'], fk['referenced_column']) for fk in schema['tables']['child']['foreign_keys']] == [
+        ('parent_id', 'id'), ('parent_region', 'region')]
+
+    code_generator = CodeGenerator(schema, 'Shop.Data', 'ShopContext', naming_convention, 'fluent_api', 'efcore', compiled_model=True)
+    child_type = code_generator.generate()['compiled_model']['childEntityType.cs' if naming_convention == 'original' else 'ChildEntityType.cs']
+    id_property, region_property = ('id', 'region') if naming_convention == 'original' else ('Id', 'Region')
+    assert (f'new[] {{ principalEntityType.FindProperty("{id_property}"), principalEntityType.FindProperty("{region_property}") }}'
+            in child_type)
+    assert 'None' not in child_type
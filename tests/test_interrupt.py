@@ -0,0 +1,69 @@
+# tests/test_interrupt.py
+from schema_reader.mysql import MySQLSchemaReader
+from schema_reader.sqlserver import SQLServerSchemaReader
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, query, params=()):
+        self.log.append(query)
+
+    def fetchmany(self, size):
+        return []
+
+    def fetchone(self):
+        return (0, None, None)
+
+    def cancel(self):
+        self.log.append('cancel')
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    connection_id = 42
+
+    def __init__(self):
+        self.log = []
+        self.closed = False
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self.log)
+
+    def shutdown(self):
+        self.log.append('shutdown')
+
+    def close(self):
+        self.closed = True
+
+
+def test_mysql_interrupt_kills_the_query_from_a_second_connection():
+    db = FakeConnection()
+    side_connections = []
+
+    def connect():
+        side_connections.append(FakeConnection())
+        return side_connections[-1]
+
+    MySQLSchemaReader(db, connect=connect).interrupt()
+    assert db.log == []
+    assert side_connections[0].log == ['KILL QUERY 42']
+    assert side_connections[0].closed
+
+
+def test_mysql_interrupt_without_a_second_connection_drops_the_socket():
+    db = FakeConnection()
+    MySQLSchemaReader(db).interrupt()
+    assert db.log == ['shutdown']
+
+
+def test_sqlserver_reader_does_not_accumulate_cursors():
+    db = FakeConnection()
+    reader = SQLServerSchemaReader(db)
+    for _ in range(100):
+        reader.read_tables()
+    reader.interrupt()
+    assert db.log.count('cancel') == 1
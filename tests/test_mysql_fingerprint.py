@@ -0,0 +1,82 @@
+# tests/test_mysql_fingerprint.py
+# The column and key checksums read every table's metadata, so idle polls only
+# run the cheap probe until checksum_interval has passed.
+import pytest
+
+import schema_reader.mysql
+from schema_reader.mysql import MySQLSchemaReader
+
+
+class CatalogCursor:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.rows = []
+
+    def execute(self, query, params=()):
+        if 'CRC32' in query:
+            self.catalog.checksum_queries += 1
+            self.rows = [(self.catalog.columns_checksum, 7)]
+        else:
+            self.rows = [(3, '2026-10-01 12:00:00', self.catalog.routines_altered)]
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def close(self):
+        pass
+
+
+class CatalogConnection:
+    def __init__(self):
+        self.columns_checksum = 100
+        self.routines_altered = None
+        self.checksum_queries = 0
+
+    def cursor(self, *args, **kwargs):
+        return CatalogCursor(self)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {'now': 1000.0}
+    monkeypatch.setattr(schema_reader.mysql.time, 'monotonic', lambda: clock['now'])
+    return clock
+
+
+def test_checksums_run_once_per_interval(clock):
+    catalog = CatalogConnection()
+    reader = MySQLSchemaReader(catalog, checksum_interval=60)
+    fingerprint = reader.read_fingerprint()
+    for _ in range(10):
+        clock['now'] += 2
+        assert reader.read_fingerprint() == fingerprint
+    assert catalog.checksum_queries == 1
+
+    # An INSTANT ALTER TABLE only shows up in the checksums.
+    catalog.columns_checksum = 101
+    clock['now'] += 2
+    assert reader.read_fingerprint() == fingerprint
+    clock['now'] += 40
+    assert reader.read_fingerprint() != fingerprint
+    assert catalog.checksum_queries == 2
+
+
+def test_checksums_rerun_when_the_probe_changes(clock):
+    catalog = CatalogConnection()
+    reader = MySQLSchemaReader(catalog, checksum_interval=60)
+    reader.read_fingerprint()
+    catalog.routines_altered = '2026-10-02 08:00:00'
+    catalog.columns_checksum = 101
+    assert reader.read_fingerprint()[-2:] == (101, 7)
+    assert catalog.checksum_queries == 2
+
+
+def test_zero_interval_checksums_every_poll(clock):
+    catalog = CatalogConnection()
+    reader = MySQLSchemaReader(catalog, checksum_interval=0)
+    for _ in range(3):
+        reader.read_fingerprint()
+    assert catalog.checksum_queries == 3
@@ -0,0 +1,73 @@
+# tests/test_output_writer.py
+import os
+import zipfile
+
+from output_writer import write_output
+
+
+def entity(class_name, using='System'):
+    return f"using {using};\n\nnamespace App.Data\n{{\n    public class {class_name}\n    {{\n    }}\n}}"
+
+
+def generated_code():
+    return {
+        'entities': {
+            'Customer': entity('Customer'),
+            'Invoice': entity('Invoice', 'System.Collections.Generic'),
+            'AuditLog': entity('AuditLog'),
+        },
+        'dbcontext': 'public partial class AppContext {}',
+        'stored_procedures': 'public partial class AppContext { /* procedures */ }',
+    }
+
+
+def read_files(directory):
+    contents = {}
+    for file_name in os.listdir(directory):
+        with open(os.path.join(directory, file_name), 'r', encoding='utf-8') as f:
+            contents[file_name] = f.read()
+    return contents
+
+
+def test_per_file_layout(tmp_path):
+    written = write_output(generated_code(), str(tmp_path), 'AppContext', 'per_file')
+    assert written == ['Customer.cs', 'Invoice.cs', 'AuditLog.cs', 'AppContext.cs', 'AppContextStoredProcedures.cs']
+    files = read_files(tmp_path)
+    assert sorted(files) == sorted(written)
+    assert files['Invoice.cs'] == entity('Invoice', 'System.Collections.Generic')
+    assert files['AppContext.cs'] == 'public partial class AppContext {}'
+
+
+def test_bundle_layout(tmp_path):
+    # The entities are 75 to 94 bytes, so two fit in a 200 byte bundle.
+    written = write_output(generated_code(), str(tmp_path), 'AppContext', 'bundle', max_bundle_bytes=200)
+    assert written == ['AppContextEntities1.cs', 'AppContextEntities2.cs', 'AppContext.cs', 'AppContextStoredProcedures.cs']
+    files = read_files(tmp_path)
+    assert sorted(files) == sorted(written)
+    first = files['AppContextEntities1.cs']
+    assert first.startswith('using System;\nusing System.Collections.Generic;\n\nnamespace App.Data')
+    assert 'class Customer' in first and 'class Invoice' in first and 'class AuditLog' not in first
+    assert first.count('using System;') == 1
+    assert 'class AuditLog' in files['AppContextEntities2.cs']
+
+
+def test_per_schema_layout(tmp_path):
+    # Entities without a group, or whose group would take the DbContext file name, get an Entities suffix.
+    groups = {'Customer': 'sales', 'Invoice': 'sales', 'AuditLog': 'AppContext'}
+    written = write_output(generated_code(), str(tmp_path), 'AppContext', 'per_schema', groups=groups)
+    assert written == ['sales.cs', 'AppContextEntities.cs', 'AppContext.cs', 'AppContextStoredProcedures.cs']
+    files = read_files(tmp_path)
+    assert sorted(files) == sorted(written)
+    assert 'class Customer' in files['sales.cs'] and 'class Invoice' in files['sales.cs']
+    assert 'class AuditLog' in files['AppContextEntities.cs']
+    assert files['AppContext.cs'] == 'public partial class AppContext {}'
+
+
+def test_zip_layout(tmp_path):
+    archive_path = str(tmp_path / 'out' / 'generated.zip')
+    written = write_output(generated_code(), archive_path, 'AppContext', 'zip')
+    assert written == ['Customer.cs', 'Invoice.cs', 'AuditLog.cs', 'AppContext.cs', 'AppContextStoredProcedures.cs']
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.namelist() == written
+        assert archive.read('Customer.cs').decode('utf-8') == entity('Customer')
+        assert archive.read('AppContextStoredProcedures.cs').decode('utf-8') == 'public partial class AppContext { /* procedures */ }'
@@ -0,0 +1,27 @@
+# tests/test_postgresql_fingerprint.py
+import pytest
+
+from schema_reader.postgresql import PostgreSQLSchemaReader
+
+
+@pytest.fixture
+def db(postgresql):
+    cursor = postgresql.cursor()
+    cursor.execute("CREATE TABLE ef_poco_fingerprint (id int, name varchar(10), total int)")
+    yield postgresql
+    cursor.execute("DROP TABLE ef_poco_fingerprint")
+
+
+@pytest.mark.parametrize('ddl', [
+    "ALTER TABLE ef_poco_fingerprint RENAME COLUMN name TO title",
+    "ALTER TABLE ef_poco_fingerprint ALTER COLUMN total SET NOT NULL",
+    "ALTER TABLE ef_poco_fingerprint ALTER COLUMN name TYPE varchar(20)",
+    "ALTER TABLE ef_poco_fingerprint DROP COLUMN total",
+    "COMMENT ON COLUMN ef_poco_fingerprint.name IS 'Display name'",
+])
+def test_fingerprint_changes_with_column_ddl(db, ddl):
+    reader = PostgreSQLSchemaReader(db)
+    before = reader.read_fingerprint()
+    assert reader.read_fingerprint() == before
+    db.cursor().execute(ddl)
+    assert reader.read_fingerprint() != before
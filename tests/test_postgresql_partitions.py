@@ -0,0 +1,46 @@
+# tests/test_postgresql_partitions.py
+import pytest
+
+from schema_reader.postgresql import PostgreSQLSchemaReader
+
+
+@pytest.fixture
+def db(postgresql):
+    cursor = postgresql.cursor()
+    cursor.execute("""
+        CREATE TABLE ef_poco_account (id int, region int, PRIMARY KEY (id, region)) PARTITION BY LIST (region);
+        CREATE TABLE ef_poco_account_eu PARTITION OF ef_poco_account FOR VALUES IN (1);
+        CREATE TABLE ef_poco_account_us PARTITION OF ef_poco_account FOR VALUES IN (2);
+        CREATE TABLE ef_poco_invoice (
+            id int PRIMARY KEY,
+            account_id int,
+            account_region int,
+            CONSTRAINT fk_invoice_account FOREIGN KEY (account_id, account_region) REFERENCES ef_poco_account (id, region)
+        );
+        CREATE TABLE ef_poco_refund (
+            id int PRIMARY KEY,
+            account_id int,
+            account_region int,
+            CONSTRAINT fk_refund_account_eu FOREIGN KEY (account_id, account_region) REFERENCES ef_poco_account_eu (id, region)
+        );
+    """)
+    yield postgresql
+    cursor.execute("DROP TABLE ef_poco_refund, ef_poco_invoice, ef_poco_account")
+
+
+def referenced_tables(reader, table_name):
+    return {(foreign_key['constraint_name'], foreign_key['referenced_table']) for foreign_key in reader.read_foreign_keys().get(table_name, [])}
+
+
+def test_foreign_keys_skip_partitions_when_they_are_excluded(db):
+    reader = PostgreSQLSchemaReader(db)
+    reader.table_filter = ['ef_poco_invoice', 'ef_poco_refund']
+    assert referenced_tables(reader, 'ef_poco_invoice') == {('fk_invoice_account', 'ef_poco_account')}
+    assert referenced_tables(reader, 'ef_poco_refund') == set()
+
+
+def test_foreign_keys_include_partitions_when_asked(db):
+    reader = PostgreSQLSchemaReader(db, include_partitions=True)
+    reader.table_filter = ['ef_poco_invoice', 'ef_poco_refund']
+    assert {table for _, table in referenced_tables(reader, 'ef_poco_invoice')} == {'ef_poco_account', 'ef_poco_account_eu', 'ef_poco_account_us'}
+    assert referenced_tables(reader, 'ef_poco_refund') == {('fk_refund_account_eu', 'ef_poco_account_eu')}
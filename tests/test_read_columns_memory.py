@@ -0,0 +1,81 @@
+# tests/test_read_columns_memory.py
+# Peak memory of read_columns must stay close to the size of the model it
+# returns: rows are consumed in fetchmany batches and never held as one list.
+import gc
+import sqlite3
+import tracemalloc
+from collections import namedtuple
+
+from schema_reader.sqlite import SQLiteSchemaReader
+from schema_reader.sqlserver import SQLServerSchemaReader
+
+# Peak allocation while reading, relative to what the returned model retains.
+MAX_PEAK_RATIO = 1.25
+
+ColumnRow = namedtuple('ColumnRow', 'table_name column_name data_type is_nullable is_identity column_description')
+
+
+class GeneratedCursor:
+    # Produces catalog rows on demand, like a driver streaming a large result.
+    def __init__(self, table_count, column_count):
+        self.rows = (
+            ColumnRow(f"table_{table}", f"column_{column}", 'nvarchar', column % 2 == 0, column == 0, None)
+            for table in range(table_count)
+            for column in range(column_count)
+        )
+
+    def execute(self, query, params=()):
+        pass
+
+    def fetchmany(self, size):
+        return [row for _, row in zip(range(size), self.rows)]
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def close(self):
+        pass
+
+
+class GeneratedConnection:
+    def __init__(self, table_count, column_count):
+        self.table_count = table_count
+        self.column_count = column_count
+
+    def cursor(self):
+        return GeneratedCursor(self.table_count, self.column_count)
+
+
+def measure(read):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = read()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained - before, peak - before
+
+
+def test_sqlserver_read_columns_streams_rows():
+    reader = SQLServerSchemaReader(GeneratedConnection(500, 100))
+    columns, retained, peak = measure(reader.read_columns)
+    assert sum(len(table_columns) for table_columns in columns.values()) == 50000
+    assert peak <= retained * MAX_PEAK_RATIO
+
+
+def test_sqlite_read_columns_is_bounded(tmp_path):
+    database = tmp_path / 'catalog.db'
+    connection = sqlite3.connect(database)
+    for table in range(200):
+        column_list = ', '.join(f"column_{column} NVARCHAR(50)" for column in range(1, 40))
+        connection.execute(f"CREATE TABLE table_{table} (id INTEGER PRIMARY KEY, {column_list})")
+    connection.commit()
+
+    reader = SQLiteSchemaReader(connection)
+    columns, retained, peak = measure(reader.read_columns)
+    connection.close()
+    assert sum(len(table_columns) for table_columns in columns.values()) == 8000
+    assert peak <= retained * MAX_PEAK_RATIO
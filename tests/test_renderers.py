@@ -0,0 +1,119 @@
+# tests/test_renderers.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from code_generator import CodeGenerator
+from fragment_cache import FragmentCache
+from output_writer import plan_files
+from renderers import build_schema, compare, render_all
+from table_families import collapse_families
+
+
+def edge_case_schema():
+    # Quotes and backslashes in descriptions, descriptions that are None or
+    # missing, a self-referencing key, a table without columns and a procedure
+    # whose result columns are nullable or not valid property names.
+    return {
+        'tables': {
+            'employee': {
+                'columns': [
+                    {'name': 'id', 'type': 'int', 'nullable': False, 'description': None},
+                    {'name': 'manager_id', 'type': 'int', 'nullable': True, 'description': 'Reports to "the boss"'},
+                    {'name': 'nick_name', 'type': 'nvarchar', 'nullable': True, 'description': "O'Brien \\ C:\\temp"},
+                    {'name': 'hired_on', 'type': 'date', 'nullable': False},
+                ],
+                'foreign_keys': [{'constraint_name': 'fk_employee_manager', 'column': 'manager_id', 'referenced_table': 'employee',
+                                  'referenced_column': 'id', 'description': None}],
+                'primary_key': ['id'],
+                'description': None,
+            },
+            'empty_table': {'columns': [], 'foreign_keys': [], 'description': 'Nothing "here"'},
+            'note': {
+                'columns': [{'name': 'body', 'type': 'text', 'nullable': False, 'description': 'Line one\nLine "two"'}],
+                'foreign_keys': [],
+                'description': "It's a heap",
+            },
+        },
+        'procedures': {
+            'get_report': {
+                'definition': '',
+                'description': None,
+                'parameters': [{'name': 'since', 'type': 'datetime', 'mode': 'IN'}],
+                'result_columns': [
+                    {'name': 'EmployeeId', 'type': 'int', 'nullable': False},
+                    {'name': 'Hours', 'type': 'decimal', 'nullable': True},
+                    {'name': 'Comment', 'type': 'nvarchar', 'nullable': True},
+                    {'name': 'class', 'type': 'int', 'nullable': True},
+                    {'name': 'Order Total', 'type': 'money', 'nullable': False},
+                    {'name': 'Order_Total', 'type': 'money', 'nullable': False},
+                    {'name': '1st "quoted" \\ name', 'type': 'datetime', 'nullable': True},
+                    {'name': 'GetReportResult', 'type': 'bit', 'nullable': True},
+                ],
+            },
+            'purge': {'definition': '', 'parameters': []},
+        },
+    }
+
+
+@pytest.mark.parametrize('families', [False, True])
+def test_fast_renderer_matches_templates_on_synthetic_schema(families):
+    schema = build_schema(40, 8)
+    if families:
+        schema = collapse_families(schema)
+    assert compare(render_all(schema, 'jinja'), render_all(schema, 'fast')) == []
+
+
+def test_fast_renderer_matches_templates_on_edge_cases():
+    assert compare(render_all(edge_case_schema(), 'jinja'), render_all(edge_case_schema(), 'fast')) == []
+
+
+@pytest.mark.parametrize('framework, configuration_style', [('ef6', 'data_annotations'), ('efcore', 'fluent_api')])
+def test_rendered_files_match_golden(golden, framework, configuration_style):
+    for renderer in ('jinja', 'fast'):
+        code_generator = CodeGenerator(edge_case_schema(), 'Edge.Models', 'EdgeContext', 'camelcase', configuration_style, framework,
+                                       renderer=renderer)
+        golden(f"{framework}_{configuration_style}", dict(plan_files(code_generator.generate(), 'EdgeContext')))
+
+
+def test_result_properties_are_valid_and_mapped_to_their_columns():
+    code_generator = CodeGenerator(edge_case_schema(), 'Edge.Models', 'EdgeContext', 'camelcase', 'data_annotations')
+    properties = code_generator.view_model.result_properties('GetReportResult', edge_case_schema()['procedures']['get_report']['result_columns'])
+    assert [(p['csharp_type'], p['property_name'], p['mapped_column']) for p in properties] == [
+        ('int', 'EmployeeId', None),
+        ('decimal?', 'Hours', None),
+        ('string', 'Comment', None),
+        ('int?', '@class', None),
+        ('decimal', 'Order_Total', 'Order Total'),
+        ('decimal', 'Order_Total2', 'Order_Total'),
+        ('DateTime?', '_1st__quoted____name', '1st \\"quoted\\" \\\\ name'),
+        ('bool?', 'GetReportResult2', 'GetReportResult'),
+    ]
+
+
+def test_fast_renderer_memoizes_property_fragments():
+    # The synthetic tables share many of their columns, which are rendered once.
+    schema = build_schema(20, 8)
+    fragment_cache = FragmentCache()
+    fast = CodeGenerator(schema, 'Edge.Models', 'EdgeContext', 'camelcase', 'data_annotations', fragment_cache=fragment_cache).generate()
+    fast_stats = fragment_cache.stats()
+    assert fast_stats['hits'] > 0
+
+    # A cache shared with the Jinja renderer keeps the fragments of both apart.
+    jinja = CodeGenerator(schema, 'Edge.Models', 'EdgeContext', 'camelcase', 'data_annotations', fragment_cache=fragment_cache,
+                          renderer='jinja').generate()
+    assert fragment_cache.stats()['misses'] == 2 * fast_stats['misses']
+    assert jinja['entities'] == fast['entities']
+
+
+@pytest.mark.parametrize('framework, mapped', [('ef6', False), ('efcore', True)])
+@pytest.mark.parametrize('renderer', ['jinja', 'fast'])
+def test_result_class_states_how_renamed_columns_are_mapped(framework, mapped, renderer):
+    # EF6 SqlQuery<T> only matches property names, EF Core SqlQueryRaw<T> honours [Column].
+    stored_procedures = CodeGenerator(edge_case_schema(), 'Edge.Models', 'EdgeContext', 'camelcase', 'data_annotations', framework,
+                                      renderer=renderer).generate()['stored_procedures']
+    assert '[Column("Order Total")]\n        public decimal Order_Total { get; set; }' in stored_procedures
+    assert ('EF6 ignores [Column]' not in stored_procedures) == mapped
@@ -0,0 +1,143 @@
+# tests/test_server.py
+import http.client
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from server import create_server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path):
+        super().__init__('localhost')
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def run_server(**kwargs):
+    server = create_server(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def stop_server(server):
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+
+def request(connection, method, path, body=None, headers=None):
+    headers = {'Content-Type': 'application/json', **(headers or {})}
+    connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response.status, payload
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / 'app.db')
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE customer (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+    connection.commit()
+    connection.close()
+    return path
+
+
+@pytest.fixture
+def server():
+    server = run_server(port=0)
+    yield server
+    stop_server(server)
+
+
+def connect_to(server):
+    return http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+
+
+def generate_request(database):
+    return {
+        'connection': {'db_type': 'sqlite', 'database': database},
+        'namespace': 'App.Data',
+        'dbcontext_name': 'AppContext',
+    }
+
+
+def test_generate_returns_files(server, database):
+    status, payload = request(connect_to(server), 'POST', '/generate', generate_request(database))
+    assert status == 200
+    assert set(payload['files']) == {'Customer.cs', 'AppContext.cs', 'AppContextStoredProcedures.cs'}
+    assert 'public class Customer' in payload['files']['Customer.cs']
+
+
+def test_schema_change_is_picked_up_through_the_fingerprint(server, database):
+    _, first = request(connect_to(server), 'POST', '/generate', generate_request(database))
+    _, unchanged = request(connect_to(server), 'POST', '/generate', generate_request(database))
+    assert unchanged['fingerprint'] == first['fingerprint']
+
+    connection = sqlite3.connect(database)
+    connection.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customer (id))")
+    connection.commit()
+    connection.close()
+
+    _, changed = request(connect_to(server), 'POST', '/generate', generate_request(database))
+    assert changed['fingerprint'] != first['fingerprint']
+    assert 'Orders.cs' in changed['files']
+    assert 'ICollection<Orders>' in changed['files']['Customer.cs']
+
+
+def test_invalidate_drops_snapshots(server, database):
+    request(connect_to(server), 'POST', '/generate', generate_request(database))
+    _, stats = request(connect_to(server), 'GET', '/stats')
+    assert stats['snapshots'] == 1
+
+    status, _ = request(connect_to(server), 'POST', '/invalidate', {})
+    assert status == 200
+    _, stats = request(connect_to(server), 'GET', '/stats')
+    assert stats['snapshots'] == 0
+    assert stats['connections'] == 1
+
+
+def test_unix_socket(tmp_path, database):
+    socket_path = str(tmp_path / 'generation.sock')
+    server = run_server(socket_path=socket_path)
+    try:
+        status, payload = request(UnixHTTPConnection(socket_path), 'POST', '/generate', generate_request(database))
+    finally:
+        stop_server(server)
+    assert status == 200
+    assert 'Customer.cs' in payload['files']
+
+
+@pytest.mark.parametrize('headers', [
+    {'Content-Type': 'text/plain'},
+    {'Content-Type': 'application/x-www-form-urlencoded'},
+    {'Origin': 'https://example.com'},
+    {'Host': 'attacker.example:8765'},
+])
+def test_browser_requests_are_rejected(server, database, tmp_path, headers):
+    body = dict(generate_request(database), output=str(tmp_path / 'out'))
+    status, payload = request(connect_to(server), 'POST', '/generate', body, headers)
+    assert status == 403
+    assert not (tmp_path / 'out').exists()
+    _, stats = request(connect_to(server), 'GET', '/stats')
+    assert stats['connections'] == 0
+
+
+def test_server_imports_without_database_drivers():
+    # Blocked modules raise ImportError, as on a machine without the drivers or libodbc.
+    package_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ef_reverse_poco_generator')
+    code = ("import sys; sys.modules.update(dict.fromkeys(['pyodbc', 'psycopg2', 'mysql', 'mysql.connector'])); "
+            "import server")
+    subprocess.run([sys.executable, '-c', code], cwd=package_dir, check=True)
@@ -0,0 +1,128 @@
+# tests/test_sqlite_types.py
+import sqlite3
+
+import pytest
+
+from schema_reader.sqlite import SQLiteSchemaReader, column_affinity, open_sqlite, resolve_declared_type, resolve_sampled_type
+
+
+@pytest.mark.parametrize('declared_type, affinity', [
+    ('INTEGER', 'INTEGER'),
+    ('UNSIGNED BIG INT', 'INTEGER'),
+    ('VARCHAR(255)', 'TEXT'),
+    ('NATIVE CHARACTER(70)', 'TEXT'),
+    ('CLOB', 'TEXT'),
+    ('BLOB', 'BLOB'),
+    ('', 'BLOB'),
+    ('DOUBLE PRECISION', 'REAL'),
+    ('FLOAT', 'REAL'),
+    ('NUMERIC', 'NUMERIC'),
+    ('DECIMAL(10,5)', 'NUMERIC'),
+    ('DATETIME', 'NUMERIC'),
+    # INT is checked first, so a "floating point" spelling still has integer affinity.
+    ('FLOATING POINT', 'INTEGER'),
+])
+def test_column_affinity(declared_type, affinity):
+    assert column_affinity(declared_type) == affinity
+
+
+@pytest.mark.parametrize('declared_type, resolved', [
+    ('VARCHAR(255)', 'varchar'),
+    ('nvarchar(40)', 'nvarchar'),
+    ('INTEGER', 'bigint'),
+    ('MEDIUMINT', 'bigint'),
+    ('BOOLEAN', 'bit'),
+    ('REAL', 'double'),
+    ('TIMESTAMP', 'datetime'),
+    ('DECIMAL(10, 2)', 'decimal'),
+    ('CHARACTER VARYING(20)', 'text'),
+    ('BLOB', 'varbinary'),
+    ('MEDIUMBLOB', 'varbinary'),
+    # Only the stored values can tell these apart.
+    ('', None),
+    ('NUMERIC', None),
+    ('MONEYISH', None),
+])
+def test_resolve_declared_type(declared_type, resolved):
+    assert resolve_declared_type(declared_type) == resolved
+
+
+@pytest.mark.parametrize('declared_type, storage_classes, resolved', [
+    ('', ['integer'], 'bigint'),
+    ('', ['integer', 'real'], 'double'),
+    ('NUMERIC', ['integer', 'real'], 'decimal'),
+    ('NUMERIC', ['null', ''], 'decimal'),
+    ('', ['text', 'null'], 'text'),
+    ('', ['blob'], 'varbinary'),
+    ('', ['integer', 'text'], ''),
+    ('', [''], ''),
+])
+def test_resolve_sampled_type(declared_type, storage_classes, resolved):
+    assert resolve_sampled_type(declared_type, storage_classes) == resolved
+
+
+@pytest.fixture
+def database(tmp_path):
+    # Spaces, '?' and '#' would end the path of an unescaped file: URI early.
+    path = str(tmp_path / 'app data?#1.db')
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE reading (
+            id INTEGER PRIMARY KEY,
+            label VARCHAR(255) NOT NULL,
+            amount NUMERIC,
+            untyped,
+            untyped_mixed,
+            untyped_empty
+        );
+    """)
+    connection.executemany("INSERT INTO reading (label, amount, untyped, untyped_mixed) VALUES (?, ?, ?, ?)",
+                           [('a', 1, 10, 1), ('b', 2.5, 20, 2)])
+    # Past the sampled rows: a text value that would otherwise make untyped_mixed ambiguous.
+    connection.execute("INSERT INTO reading (label, amount, untyped, untyped_mixed) VALUES ('c', 3, 30, 'three')")
+    connection.commit()
+    connection.close()
+    return path
+
+
+def test_infer_types_resolves_affinity_and_samples_stored_values(database):
+    db = open_sqlite(database, read_only=True)
+    reader = SQLiteSchemaReader(db, infer_types=True, sample_rows=2)
+    columns = {column['name']: column for column in reader.read_columns()['reading']}
+    assert {name: column['type'] for name, column in columns.items()} == {
+        'id': 'bigint',
+        'label': 'varchar',
+        'amount': 'decimal',
+        'untyped': 'bigint',
+        'untyped_mixed': 'bigint',
+        'untyped_empty': '',
+    }
+    assert columns['label']['declared_type'] == 'VARCHAR(255)'
+    assert columns['amount']['declared_type'] == 'NUMERIC'
+
+    mixed = SQLiteSchemaReader(db, infer_types=True, sample_rows=10)
+    assert {column['name']: column['type'] for column in mixed.read_columns()['reading']}['untyped_mixed'] == ''
+    db.close()
+
+
+def test_declared_types_are_kept_without_inference(database):
+    db = open_sqlite(database)
+    columns = SQLiteSchemaReader(db).read_columns()['reading']
+    assert [column['type'] for column in columns] == ['INTEGER', 'VARCHAR(255)', 'NUMERIC', '', '', '']
+    assert 'declared_type' not in columns[0]
+    db.close()
+
+
+@pytest.mark.parametrize('options', [{'read_only': True}, {'immutable': True}])
+def test_read_only_connections_refuse_writes(database, options):
+    db = open_sqlite(database, **options)
+    assert db.execute("SELECT count(*) FROM reading").fetchone() == (3,)
+    with pytest.raises(sqlite3.OperationalError, match='readonly'):
+        db.execute("INSERT INTO reading (label) VALUES ('d')")
+    db.close()
+
+
+def test_mmap_size_is_applied(database):
+    db = open_sqlite(database, read_only=True, mmap_size=1 << 20)
+    assert db.execute("PRAGMA mmap_size").fetchone() == (1 << 20,)
+    db.close()
@@ -0,0 +1,56 @@
+# tests/test_table_filter.py
+# Every catalog query restricted to selected tables must bind one parameter per
+# placeholder, otherwise the server receives a literal %s or ? and fails.
+import pytest
+
+from schema_reader.mysql import MySQLSchemaReader
+from schema_reader.postgresql import PostgreSQLSchemaReader
+from schema_reader.sqlserver import SQLServerSchemaReader
+
+SELECTED_TABLES = ['customer', 'orders']
+
+
+class RecordingCursor:
+    def __init__(self, executed):
+        self.executed = executed
+        self.itersize = None
+
+    def execute(self, query, params=()):
+        self.executed.append((query, tuple(params)))
+
+    def fetchmany(self, size):
+        return []
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    autocommit = False
+
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self.executed)
+
+
+@pytest.mark.parametrize('reader_class', [MySQLSchemaReader, PostgreSQLSchemaReader, SQLServerSchemaReader])
+@pytest.mark.parametrize('method', ['read_tables', 'read_columns', 'read_primary_keys', 'read_foreign_keys'])
+def test_filtered_queries_bind_every_placeholder(reader_class, method):
+    connection = RecordingConnection()
+    reader = reader_class(connection)
+    reader.table_filter = SELECTED_TABLES
+    getattr(reader, method)()
+
+    filtered = [(query, params) for query, params in connection.executed if ' IN (' in query]
+    assert filtered, f"{reader_class.__name__}.{method} does not filter by table"
+    for query, params in filtered:
+        assert query.count(reader.placeholder) == len(params)
+        assert params == tuple(SELECTED_TABLES)